@@ -0,0 +1,220 @@
+"""Benchmarks of the hot paths of sun2000_modbus, printing the results as JSON
+
+Run from the repository root, e.g. PYTHONPATH=. python helpers/benchmark/main.py --latency 0.002 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import timeit
+
+import pymodbus
+from pymodbus.pdu.register_message import ReadHoldingRegistersResponse
+
+import sun2000_modbus
+from sun2000_modbus import datatypes, inverter, plan, simulator
+from sun2000_modbus.datatypes import DataType
+from sun2000_modbus.registers import InverterEquipmentRegister, BatteryEquipmentRegister, MeterEquipmentRegister
+
+REGISTER_ENUMS = (InverterEquipmentRegister, BatteryEquipmentRegister, MeterEquipmentRegister)
+
+# Raw value and quantity used for each data type
+SAMPLES = {
+    DataType.STRING: (b'SUN2000-10KTL-M1' + b'\0' * 14, 15),
+    DataType.UINT16_BE: (b'\x04\xd2', 1),
+    DataType.UINT32_BE: (b'\x07\x5b\xcd\x15', 2),
+    DataType.INT16_BE: (b'\xfb\x2e', 1),
+    DataType.INT32_BE: (b'\xf8\xa4\x32\xeb', 2),
+    DataType.BITFIELD16: (b'\x00\x06', 1),
+    DataType.BITFIELD32: (b'\x00\x00\x00\x03', 2),
+    DataType.MULTIDATA: (b'\x01\x02' * 8, 8),
+}
+
+# Registers read by the read_formatted benchmark, one per kind of postprocessing
+FORMATTED_REGISTERS = (
+    InverterEquipmentRegister.Model,
+    InverterEquipmentRegister.PV1Voltage,
+    InverterEquipmentRegister.ActivePower,
+    InverterEquipmentRegister.DeviceStatus,
+    InverterEquipmentRegister.State1,
+)
+
+# Statements timed by the import benchmark, each in a fresh interpreter
+IMPORTS = {
+    'registers': 'import sun2000_modbus.registers',
+    'inverter_register_table': 'from sun2000_modbus.registers import InverterEquipmentRegister',
+    'all_register_tables': 'from sun2000_modbus.registers import InverterEquipmentRegister, BatteryEquipmentRegister, MeterEquipmentRegister',
+    'inverter': 'import sun2000_modbus.inverter',
+}
+
+
+class LoopbackClient:
+    """Stand-in for ModbusTcpClient answering without any I/O, isolating the library's own overhead
+
+    Responses are taken from a SimulatedInverter once and replayed afterwards.
+    """
+
+    def __init__(self, simulated_inverter):
+        self.simulated_inverter = simulated_inverter
+        self.responses = {}
+
+    def is_socket_open(self):
+        return True
+
+    def read_holding_registers(self, address, count, device_id):
+        if (address, count) not in self.responses:
+            self.responses[(address, count)] = ReadHoldingRegistersResponse(registers=self.simulated_inverter.read(address, count), dev_id=device_id)
+        return self.responses[(address, count)]
+
+
+def measure(function, min_time):
+    """Return the time per call of function in nanoseconds"""
+    timer = timeit.Timer(function)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / elapsed))
+    return min(timer.repeat(repeat=3, number=number)) / number * 1e9
+
+
+def bench_datatypes(min_time):
+    results = {}
+    for data_type, (raw, _) in SAMPLES.items():
+        decoded = datatypes.decode(raw, data_type)
+        result = {'decode_ns': measure(lambda: datatypes.decode(raw, data_type), min_time)}
+        try:
+            datatypes.encode(decoded, data_type)
+        except ValueError:
+            pass
+        else:
+            result['encode_ns'] = measure(lambda: datatypes.encode(decoded, data_type), min_time)
+        results[data_type.name] = result
+    return results
+
+
+def bench_read_formatted(min_time):
+    sun2000 = inverter.Sun2000(host='127.0.0.1')
+    sun2000.inverter = LoopbackClient(simulator.SimulatedInverter())
+    results = {}
+    for register in FORMATTED_REGISTERS:
+        read = measure(lambda: sun2000.read(register), min_time)
+        read_formatted = measure(lambda: sun2000.read_formatted(register), min_time)
+        results[register.name] = {'read_ns': read, 'read_formatted_ns': read_formatted, 'overhead_ns': read_formatted - read}
+    return results
+
+
+def bench_plans(min_time):
+    results = {}
+    for register_enum in REGISTER_ENUMS:
+        registers = list(register_enum)
+        read_plan = plan.get_plan(registers)
+        raw_blocks = [bytes(block.quantity * 2) for block in read_plan]
+        results[register_enum.__name__] = {
+            'registers': read_plan.register_count,
+            'requests': read_plan.request_count,
+            'requests_without_plan': read_plan.register_count,
+            'wasted_registers': read_plan.wasted_registers,
+            'plan_ns': measure(lambda: plan.plan_blocks(registers), min_time),
+            'decode_ns': measure(lambda: [read_plan.decode_values(index, raw) for index, raw in enumerate(raw_blocks)], min_time),
+        }
+    return results
+
+
+def bench_imports(repeat):
+    """Time each of IMPORTS in repeat fresh interpreters, returning the fastest run in milliseconds"""
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get('PYTHONPATH')])))
+    results = {}
+    for name, statement in IMPORTS.items():
+        code = f'import time\nstarted = time.perf_counter()\n{statement}\nprint(time.perf_counter() - started)'
+        timings = [float(subprocess.run([sys.executable, '-c', code], capture_output=True, check=True, text=True, env=environment).stdout) for _ in range(repeat)]
+        results[f'{name}_ms'] = min(timings) * 1e3
+    return results
+
+
+def bench_polling(latency, duration):
+    """Poll every register enum against a local simulator with the given latency per request, with both clients"""
+    loop = asyncio.new_event_loop()
+    server = simulator.Simulator([simulator.SimulatedInverter(latency=latency)], port=0)
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+    try:
+        results = {}
+        for register_enum in REGISTER_ENUMS:
+            read_plan = plan.get_plan(list(register_enum))
+            results[register_enum.__name__] = {
+                'sync_polls_per_second': _poll_sync(server.port, read_plan, duration),
+                'async_polls_per_second': asyncio.run(_poll_async(server.port, read_plan, duration)),
+            }
+        return results
+    finally:
+        asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+
+def _poll_sync(port, read_plan, duration):
+    sun2000 = inverter.Sun2000(host='127.0.0.1', port=port, wait=0)
+    sun2000.connect()
+    try:
+        polls = 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < duration:
+            sun2000.read_snapshot(read_plan)
+            polls += 1
+        return polls / (time.perf_counter() - started)
+    finally:
+        sun2000.disconnect()
+
+
+async def _poll_async(port, read_plan, duration):
+    sun2000 = inverter.AsyncSun2000(host='127.0.0.1', port=port, wait=0)
+    await sun2000.connect()
+    try:
+        polls = 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < duration:
+            await sun2000.read_snapshot(read_plan)
+            polls += 1
+        return polls / (time.perf_counter() - started)
+    finally:
+        sun2000.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark sun2000_modbus and print the results as JSON')
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated inverter latency per request in seconds (default: 0)')
+    parser.add_argument('--duration', type=float, default=2.0, help='seconds to poll each register enum for (default: 2)')
+    parser.add_argument('--min-time', type=float, default=0.2, help='minimum seconds per timing of the micro benchmarks (default: 0.2)')
+    parser.add_argument('--import-repeat', type=int, default=10, help='fresh interpreters to time each import in (default: 10)')
+    parser.add_argument('--skip-polling', action='store_true', help='skip the end-to-end polling benchmark')
+    parser.add_argument('--output', help='file to write the results to instead of stdout')
+    args = parser.parse_args()
+
+    results = {
+        'version': sun2000_modbus.__version__,
+        'python': platform.python_version(),
+        'pymodbus': pymodbus.__version__,
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+        'datatypes': bench_datatypes(args.min_time),
+        'read_formatted': bench_read_formatted(args.min_time),
+        'plans': bench_plans(args.min_time),
+        'imports': bench_imports(args.import_repeat),
+    }
+    if not args.skip_polling:
+        results['polling'] = {'latency': args.latency, **bench_polling(args.latency, args.duration)}
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import functools
+from enum import IntFlag
+
+from .registers import InverterEquipmentRegister
+
+
+class State1(IntFlag):
+    STANDBY = 1 << 0
+    GRID_CONNECTED = 1 << 1
+    GRID_CONNECTED_NORMALLY = 1 << 2
+    GRID_CONNECTION_WITH_DERATING_DUE_TO_POWER_RATIONING = 1 << 3
+    GRID_CONNECTION_WITH_DERATING_DUE_TO_INTERNAL_CAUSES = 1 << 4
+    NORMAL_STOP = 1 << 5
+    STOP_DUE_TO_FAULTS = 1 << 6
+    STOP_DUE_TO_POWER_RATIONING = 1 << 7
+    SHUTDOWN = 1 << 8
+    SPOT_CHECK = 1 << 9
+
+
+class State2(IntFlag):
+    UNLOCKED = 1 << 0
+    PV_CONNECTED = 1 << 1
+    DSP_DATA_COLLECTION = 1 << 2
+
+
+class State3(IntFlag):
+    OFF_GRID = 1 << 0
+    OFF_GRID_SWITCH_ENABLED = 1 << 1
+
+
+class Alarm1(IntFlag):
+    HIGH_STRING_INPUT_VOLTAGE = 1 << 0
+    DC_ARC_FAULT = 1 << 1
+    STRING_REVERSE_CONNECTION = 1 << 2
+    STRING_CURRENT_BACKFEED = 1 << 3
+    ABNORMAL_STRING_POWER = 1 << 4
+    AFCI_SELF_CHECK_FAIL = 1 << 5
+    PHASE_WIRE_SHORT_CIRCUITED_TO_PE = 1 << 6
+    GRID_LOSS = 1 << 7
+    GRID_UNDERVOLTAGE = 1 << 8
+    GRID_OVERVOLTAGE = 1 << 9
+    GRID_VOLTAGE_IMBALANCE = 1 << 10
+    GRID_OVERFREQUENCY = 1 << 11
+    GRID_UNDERFREQUENCY = 1 << 12
+    UNSTABLE_GRID_FREQUENCY = 1 << 13
+    OUTPUT_OVERCURRENT = 1 << 14
+    OUTPUT_DC_COMPONENT_OVERHIGH = 1 << 15
+
+
+class Alarm2(IntFlag):
+    ABNORMAL_RESIDUAL_CURRENT = 1 << 0
+    ABNORMAL_GROUNDING = 1 << 1
+    LOW_INSULATION_RESISTANCE = 1 << 2
+    OVERTEMPERATURE = 1 << 3
+    DEVICE_FAULT = 1 << 4
+    UPGRADE_FAILED_OR_VERSION_MISMATCH = 1 << 5
+    LICENSE_EXPIRED = 1 << 6
+    FAULTY_MONITORING_UNIT = 1 << 7
+    FAULTY_POWER_COLLECTOR = 1 << 8
+    BATTERY_ABNORMAL = 1 << 9
+    ACTIVE_ISLANDING = 1 << 10
+    PASSIVE_ISLANDING = 1 << 11
+    TRANSIENT_AC_OVERVOLTAGE = 1 << 12
+    PERIPHERAL_PORT_SHORT_CIRCUIT = 1 << 13
+    CHURN_OUTPUT_OVERLOAD = 1 << 14
+    ABNORMAL_PV_MODULE_CONFIGURATION = 1 << 15
+
+
+class Alarm3(IntFlag):
+    OPTIMIZER_FAULT = 1 << 0
+    BUILT_IN_PID_OPERATION_ABNORMAL = 1 << 1
+    HIGH_INPUT_STRING_VOLTAGE_TO_GROUND = 1 << 2
+    EXTERNAL_FAN_ABNORMAL = 1 << 3
+    BATTERY_REVERSE_CONNECTION = 1 << 4
+    ON_GRID_OFF_GRID_CONTROLLER_ABNORMAL = 1 << 5
+    PV_STRING_LOSS = 1 << 6
+    INTERNAL_FAN_ABNORMAL = 1 << 7
+    DC_PROTECTION_UNIT_ABNORMAL = 1 << 8
+    EL_UNIT_ABNORMAL = 1 << 9
+    ACTIVE_ADJUSTMENT_INSTRUCTION_ABNORMAL = 1 << 10
+    REACTIVE_ADJUSTMENT_INSTRUCTION_ABNORMAL = 1 << 11
+    CT_WIRING_ABNORMAL = 1 << 12
+    DC_ARC_FAULT_TO_BE_CLEARED_MANUALLY = 1 << 13
+    DC_SWITCH_ABNORMAL = 1 << 14
+    LOW_BATTERY_DISCHARGE_CAPACITY = 1 << 15
+
+
+Flags = {
+    InverterEquipmentRegister.State1: State1,
+    InverterEquipmentRegister.State2: State2,
+    InverterEquipmentRegister.State3: State3,
+    InverterEquipmentRegister.Alarm1: Alarm1,
+    InverterEquipmentRegister.Alarm2: Alarm2,
+    InverterEquipmentRegister.Alarm3: Alarm3,
+}
+
+# Indices of the set bits for every byte value, so finding the active bits of a value takes one lookup per byte
+_ACTIVE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+def decode_flags(register, value):
+    """Convert a bitfield register value to its IntFlag
+
+    value may be an int or the binary string returned by Sun2000.read for bitfield registers.
+    """
+    if isinstance(value, str):
+        value = int(value, 2)
+    return Flags[register](value)
+
+
+def active_flags(flags):
+    """Return a tuple of the single flags set in the given IntFlag value, in bit order
+
+    Bits without a defined flag are ignored.
+    """
+    members = _members_by_bit(type(flags))
+    value = int(flags)
+    active = []
+    shift = 0
+    while value:
+        for bit in _ACTIVE_BITS[value & 0xFF]:
+            member = members.get(shift + bit)
+            if member is not None:
+                active.append(member)
+        value >>= 8
+        shift += 8
+    return tuple(active)
+
+
+def edges(previous, current):
+    """Return a tuple (raised, cleared) of the flags set respectively cleared between two readings of the same register"""
+    return current & ~previous, previous & ~current
+
+
+class EdgeDetector:
+    """Track bitfield registers over successive polls and report which flags were raised or cleared
+
+    The first reading of a register reports all of its set flags as raised. Readings are tracked per unit, which identifies the
+    inverter unit a value was read from. Like the clients' caches, detectors tracking several hosts should use
+    (host, port, device_id), a plain device_id only suffices for the units of a single host.
+    """
+
+    def __init__(self):
+        self._last = {}
+
+    def update(self, register, value, unit=0):
+        """Store the new value of register and return a tuple (raised, cleared) of the changed flags"""
+        current = decode_flags(register, value)
+        previous = self._last.get((unit, register), type(current)(0))
+        self._last[(unit, register)] = current
+        return edges(previous, current)
+
+    def reset(self, unit=None):
+        """Forget all readings or those of unit, which may also be a tuple (host, port) to forget all units of a host"""
+        if unit is None:
+            self._last.clear()
+        else:
+            for key in [key for key in self._last if key[0] == unit or (isinstance(key[0], tuple) and key[0][:len(unit)] == unit)]:
+                del self._last[key]
+
+
+@functools.lru_cache(maxsize=None)
+def _members_by_bit(flag_type):
+    return {member.value.bit_length() - 1: member for member in flag_type.__members__.values() if member.value and member.value & (member.value - 1) == 0}
@@ -0,0 +1,86 @@
+import collections
+import threading
+import time
+
+from .registers import AccessType, overlaps
+
+STATIC_ADDRESS_LIMIT = 32000  # read-only registers below this address hold equipment information which does not change
+FOREVER = float('inf')
+
+
+class RegisterCache:
+    """LRU cache for decoded register values with per-register time to live
+
+    Read-only registers holding equipment information (Model, SN, RatedPower, ...) are cached forever, all other registers for
+    default_ttl seconds. ttls maps registers to custom time to live values in seconds, overriding the defaults. At most maxsize
+    values are kept, the least recently used value is evicted first.
+
+    Values are stored per unit, which identifies the inverter unit a value was read from. The clients use (host, port, device_id),
+    so one cache may be shared by clients of different hosts, also from different threads.
+    """
+
+    def __init__(self, maxsize=1024, default_ttl=1, ttls=None):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self.ttls = {} if ttls is None else dict(ttls)
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl(self, register):
+        if register in self.ttls:
+            return self.ttls[register]
+        if register.value.access_type == AccessType.RO and register.value.address < STATIC_ADDRESS_LIMIT:
+            return FOREVER
+        return self.default_ttl
+
+    def get(self, register, unit):
+        """Return a tuple (hit, value) for the given register and unit"""
+        key = (unit, register)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, register, unit, value):
+        ttl = self.ttl(register)
+        if ttl <= 0:
+            return
+        key = (unit, register)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, register=None, unit=None):
+        """Drop cached values
+
+        Without arguments, the whole cache is cleared. If register is given, all cached registers overlapping its address range
+        are dropped, optionally restricted to the given unit.
+        """
+        with self._lock:
+            if register is None and unit is None:
+                self._entries.clear()
+                return
+
+            for key in list(self._entries):
+                cached_unit, cached_register = key
+                if unit is not None and cached_unit != unit:
+                    continue
+                if register is not None and not overlaps(cached_register, register):
+                    continue
+                del self._entries[key]
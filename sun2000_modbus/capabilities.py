@@ -0,0 +1,124 @@
+import functools
+import re
+
+from . import plan
+from . import registers
+from .registers import InverterEquipmentRegister
+
+MAX_PV_STRINGS = 24
+
+_PV_REGISTER = re.compile(r'PV(\d+)(Voltage|Current)')
+
+# Registers read by discovery to identify the unit
+IDENTIFICATION = (InverterEquipmentRegister.ModelID, InverterEquipmentRegister.NumberOfPVStrings, InverterEquipmentRegister.NumberOfMPPTrackers)
+
+
+class OptionalGroup:
+    """Registers only some models or installations provide, probed by reading a single register of the group"""
+    name: str
+    probe: InverterEquipmentRegister
+    registers: tuple
+
+    def __init__(self, name, probe, registers):
+        self.name = name
+        self.probe = probe
+        self.registers = tuple(registers)
+
+    def __repr__(self):
+        return f'OptionalGroup(name={self.name!r}, registers={len(self.registers)})'
+
+
+@functools.lru_cache(maxsize=None)
+def optional_groups():
+    """Return the tuple of OptionalGroup probed by discovery, built on first use as it needs all register enums"""
+    return (
+        OptionalGroup('license', InverterEquipmentRegister.LicenseStatus, [
+            InverterEquipmentRegister.AuthorizationFunction,
+            InverterEquipmentRegister.LicenseStatus,
+            InverterEquipmentRegister.LicenseExpirationTime,
+            InverterEquipmentRegister.LicenseLoadingTime,
+            InverterEquipmentRegister.LicenseRevocationTime,
+            InverterEquipmentRegister.LicenseSN,
+            InverterEquipmentRegister.RevocationCode,
+        ]),
+        OptionalGroup('4g', InverterEquipmentRegister.ModuleStatus4G, [register for register in InverterEquipmentRegister if register.name.endswith('4G')]),
+        OptionalGroup('optimizers', InverterEquipmentRegister.TotalNumberOfOptimizers, [
+            InverterEquipmentRegister.TotalNumberOfOptimizers,
+            InverterEquipmentRegister.NumberOfOnlineOptimizers,
+            InverterEquipmentRegister.FeatureData,
+        ]),
+        OptionalGroup('battery', registers.BatteryEquipmentRegister.RunningStatus, list(registers.BatteryEquipmentRegister)),
+        OptionalGroup('meter', registers.MeterEquipmentRegister.MeterStatus, list(registers.MeterEquipmentRegister) + [InverterEquipmentRegister.PowerMeterCollectionActivePower]),
+    )
+
+
+class Capabilities:
+    """Capability profile of one inverter unit
+
+    pv_strings is the number of PV strings, the voltage and current registers of all further strings are unsupported.
+    unsupported_groups holds the names of the optional_groups() the unit answered with an exception response. Reads of the clients
+    skip unsupported registers of units with a known profile, see Sun2000.discover.
+    """
+
+    def __init__(self, model_id, pv_strings=MAX_PV_STRINGS, mppt_trackers=None, unsupported_groups=()):
+        self.model_id = model_id
+        self.pv_strings = pv_strings
+        self.mppt_trackers = mppt_trackers
+        self.unsupported_groups = tuple(sorted(unsupported_groups))
+        groups = {group.name: group for group in optional_groups()}
+        unsupported = [register for name in self.unsupported_groups for register in groups[name].registers]
+        for register in InverterEquipmentRegister:
+            match = _PV_REGISTER.fullmatch(register.name)
+            if match and int(match.group(1)) > pv_strings:
+                unsupported.append(register)
+        self.unsupported = frozenset(unsupported)
+
+    def __repr__(self):
+        return (f'Capabilities(model_id={self.model_id}, pv_strings={self.pv_strings}, mppt_trackers={self.mppt_trackers}, '
+                f'unsupported_groups={self.unsupported_groups})')
+
+    def __eq__(self, other):
+        return isinstance(other, Capabilities) and self.as_dict() == other.as_dict()
+
+    def __hash__(self):
+        return hash((self.model_id, self.pv_strings, self.mppt_trackers, self.unsupported_groups))
+
+    def supports(self, register):
+        return register not in self.unsupported
+
+    def prune(self, registers):
+        """Return the list of the given registers supported by the unit"""
+        return [register for register in registers if register not in self.unsupported]
+
+    def prune_plan(self, read_plan):
+        """Return a tuple (pruned_plan, positions) for read_plan
+
+        pruned_plan covers the supported registers of read_plan only, positions holds for each of its blocks the indexes of the
+        block's registers in read_plan, see snapshot.Snapshot.set_values.
+        """
+        return _pruned_plan(read_plan, self.unsupported)
+
+    def as_dict(self):
+        return {
+            'model_id': self.model_id,
+            'pv_strings': self.pv_strings,
+            'mppt_trackers': self.mppt_trackers,
+            'unsupported_groups': list(self.unsupported_groups),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['model_id'], data['pv_strings'], data['mppt_trackers'], data['unsupported_groups'])
+
+
+def from_identification(values, unsupported_groups=()):
+    """Return the Capabilities of a unit from the values of its IDENTIFICATION registers as returned by read_many"""
+    return Capabilities(values[InverterEquipmentRegister.ModelID], int(values[InverterEquipmentRegister.NumberOfPVStrings]),
+                        int(values[InverterEquipmentRegister.NumberOfMPPTrackers]), unsupported_groups)
+
+
+@functools.lru_cache(maxsize=64)
+def _pruned_plan(read_plan, unsupported):
+    pruned = plan.get_plan([register for register in read_plan.registers if register not in unsupported], read_plan.max_gap, read_plan.max_quantity)
+    positions = tuple(tuple(read_plan.index[register] for register in block.registers) for block in pruned.blocks)
+    return pruned, positions
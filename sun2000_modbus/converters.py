@@ -0,0 +1,69 @@
+from . import datatypes
+from .datatypes import DataType
+
+
+def _decode_unsigned(raw_value):
+    return int.from_bytes(raw_value, 'big')
+
+
+def _decode_signed(raw_value):
+    return int.from_bytes(raw_value, 'big', signed=True)
+
+
+_DECODERS = {
+    DataType.STRING: datatypes.decode_string,
+    DataType.UINT16_BE: _decode_unsigned,
+    DataType.UINT32_BE: _decode_unsigned,
+    DataType.INT16_BE: _decode_signed,
+    DataType.INT32_BE: _decode_signed,
+    DataType.BITFIELD16: datatypes.decode_bitfield,
+    DataType.BITFIELD32: datatypes.decode_bitfield,
+    DataType.MULTIDATA: bytes,
+}
+
+
+def _identity(value):
+    return value
+
+
+class Converter:
+    """Conversions of one register compiled into single calls, see Register.converter
+
+    decode turns the register's raw bytes into its raw value like datatypes.decode, scale applies the gain to a raw value, read
+    does both at once. format and format_locale turn a scaled value into its unit suffixed or mapped form like
+    Sun2000.read_formatted. The data type, gain, unit and mapping are looked up once on compilation, not on every call.
+    """
+    __slots__ = ('decode', 'scale', 'read', 'format', 'format_locale')
+
+    def __init__(self, register):
+        if register.data_type not in _DECODERS:
+            raise ValueError('Unknown register type')
+        decode = _DECODERS[register.data_type]
+        gain = register.gain
+        unit = register.unit
+        mapping = register.mapping
+
+        if register.data_type in (DataType.BITFIELD16, DataType.BITFIELD32):
+            # Formatting the bitfield as a single integer is much faster than formatting each byte
+            bitfield_format = f'0{register.quantity * 16}b'
+            decode = lambda raw_value: format(int.from_bytes(raw_value, 'big'), bitfield_format)
+
+        # The integer decoding is repeated in read instead of calling decode, this saves a call per read value
+        self.decode = decode
+        if gain is None or register.data_type in datatypes.UNSCALED_TYPES:
+            self.scale = _identity
+            self.read = decode
+        elif decode is _decode_signed:
+            self.scale = lambda value: value / gain
+            self.read = lambda raw_value: int.from_bytes(raw_value, 'big', signed=True) / gain
+        else:
+            self.scale = lambda value: value / gain
+            self.read = lambda raw_value: int.from_bytes(raw_value, 'big') / gain
+
+        if unit is not None:
+            self.format = lambda value: f'{value} {unit}'
+            self.format_locale = lambda value: f'{value:n} {unit}'
+        elif mapping is not None:
+            self.format = self.format_locale = lambda value: mapping.get(value, 'undefined')
+        else:
+            self.format = self.format_locale = _identity
@@ -1,3 +1,5 @@
+import functools
+import struct
 from enum import Enum
 
 
@@ -12,8 +14,12 @@ class DataType(Enum):
     MULTIDATA = 'multidata'
 
 
+# Data types whose values are never scaled by the register's gain
+UNSCALED_TYPES = (DataType.STRING, DataType.BITFIELD16, DataType.BITFIELD32, DataType.MULTIDATA)
+
+
 def decode_string(value):
-    return value.decode('utf-8', 'replace').strip('\0')
+    return str(value, 'utf-8', 'replace').strip('\0')
 
 
 def encode_uint_be(value, length):
@@ -63,6 +69,20 @@ def decode(value, data_type):
     elif data_type == DataType.BITFIELD16 or data_type == DataType.BITFIELD32:
         return decode_bitfield(value)
     elif data_type == DataType.MULTIDATA:
-        return value
+        return bytes(value)
     else:
         raise ValueError('Unknown register type')
+
+
+def pack_registers(registers, buffer):
+    """Pack a sequence of 16 bit register values big-endian into buffer
+
+    Returns a memoryview over the packed bytes, which is only valid until buffer is written again. buffer must be large enough.
+    """
+    _registers_struct(len(registers)).pack_into(buffer, 0, *registers)
+    return memoryview(buffer)[:len(registers) * 2]
+
+
+@functools.lru_cache(maxsize=None)
+def _registers_struct(quantity):
+    return struct.Struct(f'>{quantity}H')
@@ -0,0 +1,93 @@
+import time
+
+from . import snapshot
+
+
+class Delta:
+    """Values emitted by a DeltaFilter for one poll result
+
+    full is True for heartbeat frames, which contain all values regardless of whether they changed.
+    """
+    __slots__ = ('values', 'full', 'timestamp')
+
+    def __init__(self, values, full, timestamp):
+        self.values = values
+        self.full = full
+        self.timestamp = timestamp
+
+    def __repr__(self):
+        return f'Delta(values={len(self.values)}, full={self.full}, timestamp={self.timestamp})'
+
+    def __bool__(self):
+        return bool(self.values)
+
+
+class DeltaFilter:
+    """Filter successive poll results of one device down to the registers that changed significantly
+
+    A numeric value is emitted if it differs from the last emitted value by at least its deadband, which is the larger of its
+    absolute deadband and, if given, relative times the last emitted value. Absolute deadbands default to steps units of the
+    register's resolution (1 / gain), i.e. by default every change is emitted; deadbands maps registers to custom absolute
+    deadbands. Non-numeric values are emitted whenever they change. Every heartbeat seconds a full frame containing all values is
+    emitted; heartbeat None disables full frames.
+    """
+
+    def __init__(self, deadbands=None, relative=None, steps=1, heartbeat=60):
+        self.deadbands = {} if deadbands is None else dict(deadbands)
+        self.relative = relative
+        self.steps = steps
+        self.heartbeat = heartbeat
+        self.emitted = 0
+        self.suppressed = 0
+        self._last = {}
+        self._last_full = None
+
+    def deadband(self, register):
+        if register in self.deadbands:
+            return self.deadbands[register]
+        gain = register.value.gain
+        return self.steps / gain if gain else self.steps
+
+    def filter(self, values, timestamp=None):
+        """Return a Delta holding the significant changes of values, a dict of register values or a snapshot.Snapshot
+
+        timestamp defaults to the snapshot's timestamp or the current time.
+        """
+        if isinstance(values, snapshot.Snapshot):
+            if timestamp is None:
+                timestamp = values.timestamp
+            values = values.as_dict()
+        elif timestamp is None:
+            timestamp = time.time()
+
+        if self.heartbeat is not None and (self._last_full is None or timestamp - self._last_full >= self.heartbeat):
+            self._last_full = timestamp
+            self._last.update(values)
+            self.emitted += len(values)
+            return Delta(dict(values), True, timestamp)
+
+        changes = {}
+        for register, value in values.items():
+            if register not in self._last or self._changed(register, self._last[register], value):
+                changes[register] = value
+        self._last.update(changes)
+        self.emitted += len(changes)
+        self.suppressed += len(values) - len(changes)
+        return Delta(changes, False, timestamp)
+
+    def reset(self):
+        """Forget all emitted values, the next result is emitted as full frame"""
+        self._last.clear()
+        self._last_full = None
+
+    def _changed(self, register, last, value):
+        if not isinstance(value, (int, float)) or not isinstance(last, (int, float)):
+            return value != last
+        difference = abs(value - last)
+        if difference == 0:
+            return False
+        deadband = self.deadband(register)
+        if self.relative is not None:
+            deadband = max(deadband, self.relative * abs(last))
+        # Tolerate rounding errors of values scaled by their gain, e.g. 350.6 - 350.5 < 0.1
+        return difference >= deadband * (1 - 1e-9)
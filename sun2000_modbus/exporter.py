@@ -0,0 +1,225 @@
+"""Prometheus exporter polling inverters in the background and serving the latest values on /metrics
+
+Run it with python -m sun2000_modbus.exporter --help.
+"""
+import argparse
+import asyncio
+import logging
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from . import plan
+from . import sampling
+from .datatypes import DataType
+from .fleet import Endpoint
+from .inverter import AsyncSun2000
+from .registers import BatteryEquipmentRegister, InverterEquipmentRegister, MeterEquipmentRegister
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+NAMESPACE = 'sun2000'
+
+REGISTER_ENUMS = {
+    'inverter': InverterEquipmentRegister,
+    'battery': BatteryEquipmentRegister,
+    'meter': MeterEquipmentRegister,
+}
+
+# Metric name suffixes of the register units
+UNITS = {
+    'W': 'watts',
+    'kW': 'kilowatts',
+    'Wh': 'watt_hours',
+    'kWh': 'kilowatt_hours',
+    'var': 'vars',
+    'kvar': 'kilovars',
+    'kvarh': 'kilovar_hours',
+    'kVA': 'kilovolt_amperes',
+    'V': 'volts',
+    'A': 'amperes',
+    'Hz': 'hertz',
+    '°C': 'celsius',
+    '%': 'percent',
+    '%/s': 'percent_per_second',
+    'MOhm': 'megaohms',
+    's': 'seconds',
+    'min': 'minutes',
+    'mins': 'minutes',
+}
+
+_NUMERIC_TYPES = [DataType.UINT16_BE, DataType.UINT32_BE, DataType.INT16_BE, DataType.INT32_BE]
+_WORD_BOUNDARY = re.compile(r'(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
+
+
+def metric_name(prefix, register):
+    """Return the Prometheus metric name of register, e.g. sun2000_inverter_pv1_voltage_volts"""
+    name = f'{NAMESPACE}_{prefix}_{_WORD_BOUNDARY.sub("_", register.name).lower()}'
+    unit = UNITS.get(register.value.unit)
+    return f'{name}_{unit}' if unit else name
+
+
+def numeric_registers(register_enums):
+    """Return a list of (prefix, register) tuples of all numeric registers of the given REGISTER_ENUMS keys"""
+    for prefix in register_enums:
+        if prefix not in REGISTER_ENUMS:
+            raise ValueError(f'Unknown register enum {prefix!r}')
+    return [(prefix, register) for prefix in register_enums for register in REGISTER_ENUMS[prefix] if register.value.data_type in _NUMERIC_TYPES]
+
+
+class Exporter:
+    """Cache of the latest values of all endpoints rendered in the Prometheus text format
+
+    Each endpoint is polled every interval seconds, endpoints sharing a host over one connection which is closed after every poll.
+    Scrapes never touch the inverters. Sample lines are only formatted if their value changed, and a metric family is only
+    reassembled if one of its lines changed, so an unchanged exposition is returned as is.
+    """
+
+    def __init__(self, endpoints, register_enums=tuple(REGISTER_ENUMS), interval=10, timeout=5, wait=2, max_gap=plan.DEFAULT_MAX_GAP):
+        self.endpoints = list(endpoints)
+        self.interval = interval
+        self.timeout = timeout
+        self.wait = wait
+        registers = numeric_registers(register_enums)
+        self.plan = plan.get_plan([register for _, register in registers], max_gap)
+        self.names = {register: metric_name(prefix, register) for prefix, register in registers}
+
+        families = [
+            (f'{NAMESPACE}_up', 'Whether the last poll of the device succeeded'),
+            (f'{NAMESPACE}_poll_duration_seconds', 'Duration of the last poll of the device'),
+            (f'{NAMESPACE}_last_poll_timestamp_seconds', 'Unix time the last poll of the device started'),
+        ]
+        for register in self.plan.registers:
+            unit = f' in {register.value.unit}' if register.value.unit else ''
+            families.append((self.names[register], f'{register.__class__.__name__}.{register.name}{unit}'))
+        self._names = [name for name, _ in families]
+        self._headers = [f'# HELP {name} {help}\n# TYPE {name} gauge\n' for name, help in families]
+        self._blocks = list(self._headers)
+        self._labels = {id(endpoint): _labels(endpoint) for endpoint in self.endpoints}
+        self._values = {id(endpoint): [None] * len(families) for endpoint in self.endpoints}
+        self._lines = {id(endpoint): [''] * len(families) for endpoint in self.endpoints}
+        self._dirty = set()
+        self._body = b''.join(block.encode() for block in self._blocks)
+        self._lock = threading.Lock()
+
+    def update(self, endpoint, snapshot, started, duration):
+        """Store the result of polling endpoint, snapshot being a snapshot.Snapshot or None if polling failed"""
+        values = [0 if snapshot is None else 1, duration, started]
+        if snapshot is None:
+            values.extend([None] * len(self.plan.registers))
+        else:
+            values.extend(value if valid else None for value, valid in zip(snapshot.values, snapshot.valid))
+
+        with self._lock:
+            labels = self._labels[id(endpoint)]
+            last_values = self._values[id(endpoint)]
+            lines = self._lines[id(endpoint)]
+            for index, value in enumerate(values):
+                if value == last_values[index]:
+                    continue
+                last_values[index] = value
+                lines[index] = '' if value is None else f'{self._names[index]}{labels} {value!r}\n'
+                self._dirty.add(index)
+
+    def render(self):
+        """Return the exposition of the latest values of all endpoints as bytes"""
+        with self._lock:
+            if self._dirty:
+                for index in self._dirty:
+                    self._blocks[index] = self._headers[index] + ''.join(self._lines[id(endpoint)][index] for endpoint in self.endpoints)
+                self._dirty.clear()
+                self._body = ''.join(self._blocks).encode()
+            return self._body
+
+    async def run(self):
+        """Poll all endpoints forever"""
+        hosts = {}
+        for endpoint in self.endpoints:
+            hosts.setdefault((endpoint.host, endpoint.port), []).append(endpoint)
+        await asyncio.gather(*(self._run_host(endpoints) for endpoints in hosts.values()))
+
+    async def poll_host(self, endpoints):
+        """Poll the endpoints of one host once"""
+        inverter = AsyncSun2000(host=endpoints[0].host, port=endpoints[0].port, timeout=self.timeout, wait=self.wait)
+        done = 0
+        started = time.time()
+        start = time.perf_counter()
+        try:
+            async with inverter.session():
+                for endpoint in endpoints:
+                    started = time.time()
+                    start = time.perf_counter()
+                    snapshot = await inverter.read_snapshot(self.plan, device_id=endpoint.device_id)
+                    self.update(endpoint, snapshot if any(snapshot.valid) else None, started, time.perf_counter() - start)
+                    done += 1
+        except Exception as e:
+            logger.error(f'Polling host {endpoints[0].host} failed: {e}')
+            for endpoint in endpoints[done:]:
+                self.update(endpoint, None, started, time.perf_counter() - start)
+
+    async def _run_host(self, endpoints):
+        async for _ in sampling.async_stream(lambda: self.poll_host(endpoints), self.interval):
+            pass
+
+
+def _labels(endpoint):
+    return f'{{host="{endpoint.host}",port="{endpoint.port}",device_id="{endpoint.device_id}"}}'
+
+
+def serve(exporter, address):
+    """Serve exporter's metrics on address, a tuple (host, port), until interrupted"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = exporter.render()
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    server = ThreadingHTTPServer(address, Handler)
+    polling = threading.Thread(target=asyncio.run, args=(exporter.run(),), daemon=True)
+    polling.start()
+    logger.info(f'Serving metrics of {len(exporter.endpoints)} devices on http://{address[0] or "0.0.0.0"}:{address[1]}/metrics')
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def parse_endpoint(value):
+    """Parse an endpoint given as host[:port][/device_id]"""
+    address, _, device_id = value.partition('/')
+    host, _, port = address.partition(':')
+    return Endpoint(host, int(port) if port else 502, int(device_id) if device_id else 0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sun2000_modbus.exporter', description='Export Sun2000 inverter metrics to Prometheus')
+    parser.add_argument('endpoints', nargs='+', type=parse_endpoint, metavar='host[:port][/device_id]')
+    parser.add_argument('--listen', default=':9830', help='address to serve /metrics on (default: :9830)')
+    parser.add_argument('--interval', type=float, default=10, help='seconds between polls of each inverter (default: 10)')
+    parser.add_argument('--timeout', type=float, default=5, help='Modbus request timeout in seconds (default: 5)')
+    parser.add_argument('--wait', type=float, default=2, help='maximum seconds to wait for an inverter after connecting (default: 2)')
+    parser.add_argument('--registers', default=','.join(REGISTER_ENUMS), help='comma separated register enums to export (default: inverter,battery,meter)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s:%(name)s:%(message)s')
+    host, _, port = args.listen.rpartition(':')
+    exporter = Exporter(args.endpoints, args.registers.split(','), args.interval, args.timeout, args.wait)
+    try:
+        serve(exporter, (host, int(port)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
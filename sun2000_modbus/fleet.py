@@ -0,0 +1,177 @@
+import asyncio
+import ipaddress
+import logging
+import time
+
+from pymodbus.exceptions import ConnectionException
+
+from . import pacing
+from . import plan
+from . import resilience
+from .inverter import AsyncSun2000
+
+logger = logging.getLogger(__name__)
+
+
+class Endpoint:
+    """Address of a single inverter unit
+
+    Several endpoints may share a host, e.g. cascaded inverters behind one dongle; they are read over one connection. segment
+    groups hosts sharing a network path, it defaults to the host's /24 network.
+    """
+    host: str
+    port: int
+    device_id: int
+    segment: str
+
+    def __init__(self, host, port=502, device_id=0, segment=None):
+        self.host = host
+        self.port = port
+        self.device_id = device_id
+        self.segment = _default_segment(host) if segment is None else segment
+
+    def __repr__(self):
+        return f'Endpoint(host={self.host!r}, port={self.port}, device_id={self.device_id})'
+
+
+class DeviceSnapshot:
+    """Result of polling one endpoint
+
+    values maps each register to its value as returned by Sun2000.read. If polling failed, values is empty and error holds the
+    exception. started is a unix timestamp, duration is given in seconds.
+    """
+    __slots__ = ('endpoint', 'values', 'error', 'started', 'duration')
+
+    def __init__(self, endpoint, values, error, started, duration):
+        self.endpoint = endpoint
+        self.values = values
+        self.error = error
+        self.started = started
+        self.duration = duration
+
+    def __repr__(self):
+        return f'DeviceSnapshot(endpoint={self.endpoint!r}, values={len(self.values)}, error={self.error!r}, duration={self.duration:.3f})'
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class FleetPoller:
+    """Poll many inverters concurrently
+
+    At most max_concurrency hosts per segment are polled at the same time. Each host has to be finished within deadline seconds,
+    otherwise its pending request is cancelled and a TimeoutError is reported for its endpoints. Failures are isolated per host.
+    hooks are passed to every AsyncSun2000, see instrumentation. pacing, a dict of pacing.Pacer arguments, paces the requests to
+    each host with the Pacer shared by all clients of the host, see pacing.for_host. retry and breaker are passed to every
+    AsyncSun2000, see resilience; hosts whose endpoints all have an open circuit are not connected to at all. If discover is True,
+    the capabilities of each endpoint are discovered on its first poll and its unsupported registers are skipped from then on,
+    capabilities maps (host, port, device_id) to the discovered capabilities.Capabilities. With a metadata.MetadataStore as store,
+    the capabilities are looked up in the store first, see Sun2000.identify.
+    """
+
+    def __init__(self, endpoints, registers, max_concurrency=4, deadline=30, timeout=5, wait=2, probe=True, max_gap=plan.DEFAULT_MAX_GAP, hooks=None,
+                 pacing=None, retry=None, breaker=None, discover=False, store=None):
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+        self.endpoints = list(endpoints)
+        self.plan = registers if isinstance(registers, plan.ReadPlan) else plan.get_plan(registers, max_gap)
+        self.max_concurrency = max_concurrency
+        self.deadline = deadline
+        self.timeout = timeout
+        self.wait = wait
+        self.probe = probe
+        self.hooks = [] if hooks is None else list(hooks)
+        self.pacing = pacing
+        self.retry = retry
+        self.breaker = breaker
+        self.discover = discover
+        self.store = store
+        self.capabilities = {}
+
+    def poll(self):
+        """Poll all endpoints once and return a list of DeviceSnapshot in the order of the endpoints"""
+        return asyncio.run(self.async_poll())
+
+    async def async_poll(self):
+        hosts = {}
+        for endpoint in self.endpoints:
+            hosts.setdefault((endpoint.host, endpoint.port), []).append(endpoint)
+
+        semaphores = {}
+        for endpoint in self.endpoints:
+            if endpoint.segment not in semaphores:
+                semaphores[endpoint.segment] = asyncio.Semaphore(self.max_concurrency)
+
+        results = await asyncio.gather(*(self._poll_host(endpoints, semaphores[endpoints[0].segment]) for endpoints in hosts.values()))
+        snapshots = {}
+        for host_snapshots in results:
+            for snapshot in host_snapshots:
+                snapshots[id(snapshot.endpoint)] = snapshot
+        return [snapshots[id(endpoint)] for endpoint in self.endpoints]
+
+    async def _poll_host(self, endpoints, semaphore):
+        async with semaphore:
+            snapshots = []
+            started = time.time()
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(self._read_host(endpoints, snapshots), self.deadline)
+            except asyncio.TimeoutError as e:
+                logger.error(f'Polling host {endpoints[0].host} exceeded the deadline of {self.deadline}s')
+                self._fail(endpoints[len(snapshots):], snapshots, e, started, time.perf_counter() - start)
+            except Exception as e:
+                logger.error(f'Polling host {endpoints[0].host} failed')
+                self._fail(endpoints[len(snapshots):], snapshots, e, started, time.perf_counter() - start)
+            return snapshots
+
+    @staticmethod
+    def _fail(endpoints, snapshots, error, started, duration):
+        snapshots.extend(DeviceSnapshot(endpoint, {}, error, started, duration) for endpoint in endpoints)
+
+    async def _read_host(self, endpoints, snapshots):
+        pacer = None if self.pacing is None else pacing.for_host(endpoints[0].host, endpoints[0].port, **self.pacing)
+        keys = [(endpoint.host, endpoint.port, endpoint.device_id) for endpoint in endpoints]
+        if self.breaker is not None and all(self.breaker.is_open(key) for key in keys):
+            raise resilience.CircuitOpenError(keys[0])
+        inverter = AsyncSun2000(host=endpoints[0].host, port=endpoints[0].port, timeout=self.timeout, wait=self.wait, hooks=self.hooks, pacer=pacer,
+                                retry=self.retry, breaker=self.breaker)
+        try:
+            await inverter.connect(probe=self.probe)
+            if not inverter.isConnected():
+                if self.breaker is not None:
+                    for key in keys:
+                        self.breaker.record(key, False)
+                raise ConnectionException(f'Connection to {endpoints[0].host} failed')
+            for key, endpoint in zip(keys, endpoints):
+                if key in self.capabilities:
+                    inverter.capabilities[endpoint.device_id] = self.capabilities[key]
+            for key, endpoint in zip(keys, endpoints):
+                started = time.time()
+                start = time.perf_counter()
+                try:
+                    if self.discover and key not in self.capabilities:
+                        if self.store is None:
+                            self.capabilities[key] = await inverter.discover(endpoint.device_id)
+                        else:
+                            self.capabilities[key] = (await inverter.identify(self.store, endpoint.device_id)).capabilities
+                    values = await inverter.read_many(self.plan, device_id=endpoint.device_id)
+                    error = None
+                except resilience.CircuitOpenError as e:
+                    values = {}
+                    error = e
+                except ConnectionException:
+                    raise
+                except Exception as e:
+                    values = {}
+                    error = e
+                snapshots.append(DeviceSnapshot(endpoint, values, error, started, time.perf_counter() - start))
+        finally:
+            inverter.disconnect()
+
+
+def _default_segment(host):
+    try:
+        return str(ipaddress.ip_network(f'{host}/24', strict=False))
+    except ValueError:
+        return host
@@ -0,0 +1,289 @@
+"""Modbus TCP gateway sharing a single inverter connection between many clients
+
+Requires pymodbus 3.12 or later. Run it with python -m sun2000_modbus.gateway --help.
+"""
+import argparse
+import asyncio
+import logging
+import struct
+import time
+
+import pymodbus
+
+if tuple(int(part) for part in pymodbus.__version__.split('.')[:2]) < (3, 12):
+    raise ImportError(f'sun2000_modbus.gateway requires pymodbus 3.12 or later, {pymodbus.__version__} is installed')
+
+from pymodbus.constants import ExcCodes
+from pymodbus.datastore import ModbusServerContext
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+from pymodbus.server import ModbusTcpServer
+
+from .inverter import AsyncSun2000, ExceptionResponseError
+
+logger = logging.getLogger(__name__)
+
+READ_FUNCTION_CODE = 3
+WRITE_FUNCTION_CODES = (6, 16)
+
+
+class Gateway:
+    """Forward Modbus requests of any number of clients to one inverter over a single connection
+
+    Requests are sent to the inverter one at a time, writes in the order they arrived. A read is answered without contacting the
+    inverter if all of its registers were read within the last max_age seconds, or by waiting for a pending read covering all
+    of its registers. Writes drop the written registers from the cache. The connection is closed after idle_timeout seconds
+    without requests, as dongles suffer from long-lived connections, and reopened on the next request. device_ids restricts
+    the forwarded device ids, by default all are forwarded.
+    """
+
+    def __init__(self, host, port=502, timeout=5, wait=2, max_age=1, idle_timeout=5, device_ids=None, hooks=None):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.wait = wait
+        self.max_age = max_age
+        self.idle_timeout = idle_timeout
+        self.device_ids = None if device_ids is None else list(device_ids)
+        self.hooks = [] if hooks is None else list(hooks)
+        self.requests = 0
+        self.upstream_requests = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.upstream = None
+        self._lock = None
+        self._pending = {}
+        self._cache = {}
+        self._idle_handle = None
+
+    def __repr__(self):
+        return (f'Gateway(host={self.host!r}, requests={self.requests}, upstream_requests={self.upstream_requests}, cache_hits={self.cache_hits}, '
+                f'coalesced={self.coalesced})')
+
+    async def read(self, device_id, address, count):
+        """Return count register words starting from address, raising the exceptions of AsyncSun2000 on errors"""
+        self.requests += 1
+        words = self._lookup(device_id, address, count)
+        if words is not None:
+            return words
+
+        for (pending_device_id, pending_address, pending_count), future in self._pending.items():
+            if pending_device_id == device_id and pending_address <= address and address + count <= pending_address + pending_count:
+                self.coalesced += 1
+                words = await asyncio.shield(future)
+                return words[address - pending_address:address - pending_address + count]
+
+        key = (device_id, address, count)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            # Requests queued behind the upstream lock may find the words read by the request ahead of them
+            words = await self._upstream(device_id, lambda: self._read_upstream(device_id, address, count), lambda: self._lookup(device_id, address, count))
+        except BaseException as e:
+            # Coalesced readers must not hang if this read is cancelled, they get a connection error instead
+            future.set_exception(e if isinstance(e, Exception) else ConnectionException(f'Read from {self.host} was cancelled'))
+            # Mark the exception as retrieved, nobody may be waiting for it
+            future.exception()
+            raise
+        else:
+            future.set_result(words)
+            return words
+        finally:
+            del self._pending[key]
+
+    async def write(self, device_id, address, values):
+        """Write values starting from address, raising the exceptions of AsyncSun2000 on errors"""
+        self.requests += 1
+        try:
+            await self._upstream(device_id, lambda: self.upstream._write_registers(address, values, device_id))
+        finally:
+            for offset in range(len(values)):
+                self._cache.pop((device_id, address + offset), None)
+
+    async def start(self):
+        """Create the upstream client, must be called within the running event loop serving the clients"""
+        if self.upstream is None:
+            self.upstream = AsyncSun2000(self.host, self.port, self.timeout, self.wait, hooks=self.hooks)
+            self._lock = asyncio.Lock()
+
+    async def stop(self):
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        if self.upstream is not None:
+            self.upstream.disconnect()
+
+    async def _read_upstream(self, device_id, address, count):
+        raw = await self.upstream._read_registers(address, count, device_id)
+        words = list(struct.unpack(f'>{count}H', raw))
+        now = time.monotonic()
+        for offset, word in enumerate(words):
+            self._cache[(device_id, address + offset)] = (now, word)
+        return words
+
+    async def _upstream(self, device_id, request, cached=None):
+        await self.start()
+        async with self._lock:
+            if cached is not None:
+                result = cached()
+                if result is not None:
+                    return result
+            if self._idle_handle is not None:
+                self._idle_handle.cancel()
+            try:
+                if not self.upstream.isConnected():
+                    # The connection is probed with the device id of the request, other device ids may not exist
+                    self.upstream.device_id = device_id
+                    await self.upstream.connect(probe=True)
+                    if not self.upstream.isConnected():
+                        raise ConnectionException(f'Connection to {self.host} failed')
+                self.upstream_requests += 1
+                return await request()
+            except asyncio.CancelledError:
+                # The response of a cancelled request may still arrive and would be taken for the answer to the next request
+                self.upstream.disconnect()
+                raise
+            finally:
+                self._idle_handle = asyncio.get_running_loop().call_later(self.idle_timeout, self._close_if_idle)
+
+    def _close_if_idle(self):
+        self._idle_handle = None
+        if not self._lock.locked() and self.upstream.isConnected():
+            logger.info(f'Closing idle connection to {self.host}')
+            self.upstream.disconnect()
+
+    def _lookup(self, device_id, address, count):
+        words = self._cached(device_id, address, count)
+        if words is not None:
+            self.cache_hits += 1
+        return words
+
+    def _cached(self, device_id, address, count):
+        oldest = time.monotonic() - self.max_age
+        words = []
+        for current in range(address, address + count):
+            entry = self._cache.get((device_id, current))
+            if entry is None or entry[0] < oldest:
+                return None
+            words.append(entry[1])
+        return words
+
+
+class GatewayContext(ModbusServerContext):
+    """pymodbus server context forwarding requests to a Gateway"""
+
+    def __init__(self, gateway):
+        # ModbusServerContext.__init__ is not called, it only sets up pymodbus' own datastores. old_simulator and simdevices are
+        # internals of pymodbus' server (3.12 up to 3.16 at the time of writing) which have to be set nevertheless, check them when
+        # raising the pymodbus upper bound.
+        self.gateway = gateway
+        self.old_simulator = True
+        self.simdevices = []
+        self._written = {}
+
+    def device_ids(self):
+        return [] if self.gateway.device_ids is None else list(self.gateway.device_ids)
+
+    async def async_getValues(self, device_id, func_code, address, count=1):
+        if func_code in WRITE_FUNCTION_CODES:
+            # pymodbus reads back the written values to build the response of single register writes
+            return self._written.pop((device_id, address), [0] * count)[:count]
+        if func_code != READ_FUNCTION_CODE:
+            return ExcCodes.ILLEGAL_FUNCTION
+        if self.gateway.device_ids is not None and device_id not in self.gateway.device_ids:
+            return ExcCodes.GATEWAY_PATH_UNAVIABLE
+        try:
+            return await self.gateway.read(device_id, address, count)
+        except Exception as e:
+            return _exception_code(e)
+
+    async def async_setValues(self, device_id, func_code, address, values):
+        if func_code not in WRITE_FUNCTION_CODES:
+            return ExcCodes.ILLEGAL_FUNCTION
+        if self.gateway.device_ids is not None and device_id not in self.gateway.device_ids:
+            return ExcCodes.GATEWAY_PATH_UNAVIABLE
+        try:
+            await self.gateway.write(device_id, address, list(values))
+        except Exception as e:
+            return _exception_code(e)
+        if func_code == 6:
+            self._written[(device_id, address)] = list(values)
+        return None
+
+
+def _exception_code(error):
+    if isinstance(error, ExceptionResponseError):
+        try:
+            return ExcCodes(error.exception_code)
+        except ValueError:
+            return ExcCodes.DEVICE_FAILURE
+    if isinstance(error, ConnectionException):
+        return ExcCodes.GATEWAY_PATH_UNAVIABLE
+    if isinstance(error, ModbusIOException):
+        return ExcCodes.GATEWAY_NO_RESPONSE
+    logger.error(f'Forwarding a request failed: {error!r}')
+    return ExcCodes.DEVICE_FAILURE
+
+
+class GatewayServer:
+    """Modbus TCP server accepting clients and forwarding their requests to a Gateway
+
+    port 0 binds a free port, the bound port is available as port after start. Must be started within a running event loop.
+    """
+
+    def __init__(self, gateway, host='0.0.0.0', port=5020):
+        self.gateway = gateway
+        self.host = host
+        self.port = port
+        self.server = None
+
+    async def start(self):
+        await self.gateway.start()
+        self.server = ModbusTcpServer(GatewayContext(self.gateway), address=(self.host, self.port))
+        await self.server.serve_forever(background=True)
+        self.port = self.server.transport.sockets[0].getsockname()[1]
+        logger.info(f'Forwarding requests on {self.host}:{self.port} to {self.gateway.host}:{self.gateway.port}')
+
+    async def stop(self):
+        if self.server is not None:
+            await self.server.shutdown()
+            self.server = None
+        await self.gateway.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self.server.serving
+        finally:
+            await self.stop()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sun2000_modbus.gateway', description='Share one Sun2000 Modbus TCP connection between many clients')
+    parser.add_argument('host', help='inverter or dongle host')
+    parser.add_argument('--port', type=int, default=502, help='inverter or dongle port (default: 502)')
+    parser.add_argument('--listen', default=':5020', help='address to accept clients on (default: :5020)')
+    parser.add_argument('--timeout', type=float, default=5, help='Modbus request timeout in seconds (default: 5)')
+    parser.add_argument('--wait', type=float, default=2, help='maximum seconds to wait for the inverter after connecting (default: 2)')
+    parser.add_argument('--max-age', type=float, default=1, help='seconds reads are answered from the cache (default: 1)')
+    parser.add_argument('--idle-timeout', type=float, default=5, help='seconds without requests after which the connection is closed (default: 5)')
+    parser.add_argument('--device-id', type=int, action='append', dest='device_ids', help='device id to forward, may be repeated (default: all)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s:%(name)s:%(message)s')
+    listen_host, _, listen_port = args.listen.rpartition(':')
+    gateway = Gateway(args.host, args.port, args.timeout, args.wait, args.max_age, args.idle_timeout, args.device_ids)
+    try:
+        asyncio.run(GatewayServer(gateway, listen_host or '0.0.0.0', int(listen_port)).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+import bisect
+import math
+
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+from pymodbus.pdu import ExceptionResponse
+
+READ = 'read'
+WRITE = 'write'
+
+OK = 'ok'
+NO_RESPONSE = 'no_response'
+EXCEPTION_RESPONSE = 'exception_response'
+CONNECTION_ERROR = 'connection_error'
+ERROR = 'error'
+
+# Upper bounds in seconds of the latency histogram buckets, the last bucket counts everything above
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Transaction:
+    """A single Modbus request as passed to hooks
+
+    kind is READ or WRITE, bytes the number of register bytes read or written, duration the number of seconds from sending the
+    request to receiving the response or error. outcome is one of OK, NO_RESPONSE, EXCEPTION_RESPONSE, CONNECTION_ERROR and
+    ERROR, error the raised exception if the transaction failed.
+    """
+    __slots__ = ('kind', 'host', 'port', 'device_id', 'address', 'quantity', 'bytes', 'duration', 'outcome', 'error')
+
+    def __init__(self, kind, host, port, device_id, address, quantity, bytes, duration, outcome, error=None):
+        self.kind = kind
+        self.host = host
+        self.port = port
+        self.device_id = device_id
+        self.address = address
+        self.quantity = quantity
+        self.bytes = bytes
+        self.duration = duration
+        self.outcome = outcome
+        self.error = error
+
+    def __repr__(self):
+        return (f'Transaction(kind={self.kind!r}, host={self.host!r}, device_id={self.device_id}, address={self.address}, quantity={self.quantity}, '
+                f'duration={self.duration:.4f}, outcome={self.outcome!r})')
+
+    @property
+    def ok(self):
+        return self.outcome == OK
+
+
+def outcome(response, error):
+    """Classify the result of a request by its response and the exception raised while handling it"""
+    if error is None:
+        return OK
+    if isinstance(error, ConnectionException):
+        return CONNECTION_ERROR
+    if isinstance(response, ExceptionResponse):
+        return EXCEPTION_RESPONSE
+    if isinstance(error, ModbusIOException):
+        return NO_RESPONSE
+    return ERROR
+
+
+class Histogram:
+    """Latency histogram counting the observations per bucket, see DEFAULT_BUCKETS"""
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def __repr__(self):
+        return f'Histogram(count={self.count}, mean={self.mean:.4f})'
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q):
+        """Return the upper bound of the bucket containing the q-quantile, inf if it lies in the last bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return math.inf
+
+
+class TransactionStats:
+    """Counters and latency histogram of the transactions of one device or one register block"""
+    __slots__ = ('transactions', 'bytes', 'outcomes', 'latency')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.transactions = 0
+        self.bytes = 0
+        self.outcomes = {}
+        self.latency = Histogram(buckets)
+
+    def __repr__(self):
+        return f'TransactionStats(transactions={self.transactions}, errors={self.errors}, mean={self.latency.mean:.4f})'
+
+    def add(self, transaction):
+        self.transactions += 1
+        self.bytes += transaction.bytes
+        self.outcomes[transaction.outcome] = self.outcomes.get(transaction.outcome, 0) + 1
+        self.latency.observe(transaction.duration)
+
+    @property
+    def errors(self):
+        return self.transactions - self.outcomes.get(OK, 0)
+
+    @property
+    def error_rate(self):
+        return self.errors / self.transactions if self.transactions else 0.0
+
+
+class TransactionMetrics:
+    """Hook aggregating transactions per device and per register block
+
+    devices maps (host, port, device_id) and blocks maps (host, port, device_id, kind, address, quantity) to TransactionStats.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.devices = {}
+        self.blocks = {}
+
+    def __call__(self, transaction):
+        device = (transaction.host, transaction.port, transaction.device_id)
+        block = device + (transaction.kind, transaction.address, transaction.quantity)
+        if device not in self.devices:
+            self.devices[device] = TransactionStats(self.buckets)
+        if block not in self.blocks:
+            self.blocks[block] = TransactionStats(self.buckets)
+        self.devices[device].add(transaction)
+        self.blocks[block].add(transaction)
+
+    def slowest(self, n=10, q=0.95):
+        """Return up to n (block, stats) tuples ordered by their q-quantile latency, then their mean latency, slowest first"""
+        return sorted(self.blocks.items(), key=lambda item: (item[1].latency.quantile(q), item[1].latency.mean), reverse=True)[:n]
+
+    def flakiest(self, n=10):
+        """Return up to n (block, stats) tuples with errors ordered by their error rate, highest first"""
+        failing = [item for item in self.blocks.items() if item[1].errors]
+        return sorted(failing, key=lambda item: item[1].error_rate, reverse=True)[:n]
+
+    def reset(self):
+        self.devices.clear()
+        self.blocks.clear()
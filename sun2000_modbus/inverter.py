@@ -1,32 +1,93 @@
+import asyncio
+import contextlib
 import logging
+import threading
 import time
 
-from pymodbus.client import ModbusTcpClient
+from pymodbus.client import AsyncModbusTcpClient, ModbusTcpClient
 from pymodbus.exceptions import ModbusIOException, ConnectionException
+from pymodbus.pdu import ExceptionResponse
 
 from . import datatypes
-from .datatypes import DataType
+from . import instrumentation
+from . import plan
+from . import registers
+from . import resilience
+from . import sampling
+from . import snapshot
 from .registers import AccessType
 
+# bitfields, capabilities and metadata need the register enums, which are loaded on first use, so they are imported by the methods
+# using them, keeping the import of this module cheap.
+
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-log_format = logging.Formatter('%(levelname)s:%(name)s:%(message)s')
-handler = logging.StreamHandler()
-handler.setFormatter(log_format)
-logger.addHandler(handler)
-logger.propagate = False
+
+PROBE_INITIAL_DELAY = 0.1
+
+
+def _setup_logger():
+    # The handler is attached when the first client is created instead of on import
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(levelname)s:%(name)s:%(message)s'))
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    logger.propagate = False
+
+
+class ExceptionResponseError(ModbusIOException):
+    """Raised if the inverter answers a request with a Modbus exception, e.g. illegal address"""
+
+    def __init__(self, exception_code):
+        super().__init__(f'Exception code {exception_code}')
+        self.exception_code = exception_code
+
+
+class WriteVerificationError(ModbusIOException):
+    """Raised by write_many if registers read back differ from the written values
+
+    mismatches maps each differing register to its raw value read back.
+    """
+
+    def __init__(self, mismatches):
+        super().__init__(f'Verification of {", ".join(register.name for register in mismatches)} failed')
+        self.mismatches = mismatches
 
 
 class Sun2000:
-    def __init__(self, host, port=502, timeout=5, wait=2, device_id=0): # some models need device_id=1
+    def __init__(self, host, port=502, timeout=5, wait=2, device_id=0, cache=None, hooks=None, pacer=None, retry=None, breaker=None, suppressor=None): # some models need device_id=1
+        _setup_logger()
+        self.host = host
+        self.port = port
         self.wait = wait
         self.device_id = device_id
+        self.cache = cache
+        self.hooks = [] if hooks is None else list(hooks)
+        self.pacer = pacer
+        self.retry = retry
+        self.breaker = breaker
+        self.suppressor = suppressor
+        self.capabilities = {}
         self.inverter = ModbusTcpClient(host=host, port=port, timeout=timeout)
+        self._local = threading.local()
+
+    def connect(self, probe=False):
+        """Open the underlying tcp socket
 
-    def connect(self):
+        By default, waits for wait seconds after opening the socket. If probe is True, a cheap register is read instead with an
+        exponentially increasing delay between attempts, returning as soon as the inverter answers. No read is started after wait
+        seconds, but a read in progress is not interrupted: a unit which does not answer delays the return by up to timeout seconds
+        per attempt pymodbus makes for that read.
+        """
         if not self.isConnected():
+            if self.suppressor is not None:
+                self.suppressor.invalidate(unit=(self.host, self.port))
             self.inverter.connect()
-            time.sleep(self.wait)
+            if probe:
+                self._probe()
+            else:
+                time.sleep(self.wait)
             if self.isConnected():
                 logger.info('Successfully connected to inverter')
                 return True
@@ -34,6 +95,37 @@ class Sun2000:
                 logger.error('Connection to inverter failed')
                 return False
 
+    def _probe(self):
+        probe_register = registers.InverterEquipmentRegister.ModelID.value
+        deadline = time.monotonic() + self.wait
+        for delay in _probe_delays():
+            if not self.isConnected():
+                return
+            try:
+                if type(self.inverter.read_holding_registers(address=probe_register.address, count=probe_register.quantity, device_id=self.device_id)) != ModbusIOException:
+                    return
+            except ConnectionException:
+                return
+            except Exception:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(delay, remaining))
+
+    @contextlib.contextmanager
+    def session(self, probe=True):
+        """Context manager connecting to the inverter on enter and disconnecting on exit
+
+        Meant for short bursts of reads and writes, see disconnect. Raises a ConnectionException if the connection fails.
+        """
+        if not self.connect(probe=probe) and not self.isConnected():
+            raise ConnectionException('Connection to inverter failed')
+        try:
+            yield self
+        finally:
+            self.disconnect()
+
     def disconnect(self):
         """Close the underlying tcp socket"""
         # Some Sun2000 models with the SDongle WLAN-FE require the TCP connection to be closed
@@ -49,86 +141,725 @@ class Sun2000:
     def connected(self):
         return self.isConnected()
 
+    def _unit(self, device_id=None):
+        """Key identifying the addressed inverter unit in caches shared by several clients"""
+        return self.host, self.port, self.device_id if device_id is None else device_id
+
+    def _read_registers(self, address, quantity, device_id=None):
+        device_id = self.device_id if device_id is None else device_id
+        response = self._execute(instrumentation.READ, device_id, address, quantity,
+                                      lambda: self.inverter.read_holding_registers(address=address, count=quantity, device_id=device_id))
+        return self._unpack(response)
+
+    def _unpack(self, response):
+        # The response's registers are packed into a buffer reused for every read of the calling thread, the returned memoryview is
+        # only valid until the thread's next read and has to be decoded right away. Buffers are per thread as a client may be shared
+        # by several threads, pymodbus serializes their requests but not the decoding.
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None or len(response.registers) * 2 > len(buffer):
+            buffer = self._local.buffer = bytearray(max(len(response.registers), plan.MAX_REGISTERS_PER_REQUEST) * 2)
+        return datatypes.pack_registers(response.registers, buffer)
+
     def read_raw_value(self, register, device_id=None):
         if not self.isConnected():
             raise ValueError('Inverter is not connected')
 
-        try:
-            register_value = self.inverter.read_holding_registers(address=register.value.address, count=register.value.quantity, device_id=self.device_id if device_id is None else device_id)
-            if type(register_value) == ModbusIOException:
-                logger.error('Inverter unit did not respond')
-                raise register_value
-        except ConnectionException:
-            logger.error('A connection error occurred')
-            raise
-        except Exception:
-            logger.error(f'An error occurred during reading address {register.value.address}')
-            raise
+        if self.cache is not None:
+            hit, value = self.cache.get(register, self._unit(device_id))
+            if hit:
+                return value
 
-        return datatypes.decode(register_value.encode()[1:], register.value.data_type)
+        raw_value = self._read_registers(register.value.address, register.value.quantity, device_id)
+        value = register.value.converter.decode(raw_value)
+        if self.cache is not None:
+            self.cache.put(register, self._unit(device_id), value)
+        return value
 
     def read(self, register, device_id=None):
-        raw_value = self.read_raw_value(register, device_id)
+        converter = register.value.converter
+        if self.cache is not None:
+            return converter.scale(self.read_raw_value(register, device_id))
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
+        return converter.read(self._read_registers(register.value.address, register.value.quantity, device_id))
 
-        if register.value.gain is None or register.value.data_type in [DataType.STRING, DataType.BITFIELD16, DataType.BITFIELD32, DataType.MULTIDATA]:
-            return raw_value
-        else:
-            return raw_value / register.value.gain
+    def read_many(self, registers, max_gap=plan.DEFAULT_MAX_GAP, device_id=None):
+        """Read several registers using as few Modbus requests as possible
 
-    def read_formatted(self, register, device_id=None, use_locale=False):
-        value = self.read(register, device_id)
+        registers may be a register enum, an iterable of registers or a precomputed plan.ReadPlan. Registers lying close to each other
+        are fetched together in one request. Returns a dict mapping each register to its postprocessed value as returned by read.
+        """
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
+
+        read_plan = registers if isinstance(registers, plan.ReadPlan) else plan.get_plan(registers, max_gap)
+        profile = self.capabilities.get(self.device_id if device_id is None else device_id)
+        if profile is not None:
+            read_plan = profile.prune_plan(read_plan)[0]
+        values = {}
+        for index, block in enumerate(read_plan.blocks):
+            raw_block = self._read_registers(block.address, block.quantity, device_id)
+            values.update(zip(block.registers, read_plan.decode_values(index, raw_block)))
+
+        return values
+
+    def read_snapshot(self, registers, max_gap=plan.DEFAULT_MAX_GAP, device_id=None):
+        """Read all given registers into a snapshot.Snapshot
+
+        registers may be a register enum, an iterable of registers or a precomputed plan.ReadPlan. Blocks which could not be read
+        because the inverter unit did not respond are marked invalid in the snapshot, connection errors are raised.
+        """
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
 
-        if register.value.unit is not None:
-            if use_locale:
-                return f'{value:n} {register.value.unit}'
+        read_plan = registers if isinstance(registers, plan.ReadPlan) else plan.get_plan(registers, max_gap)
+        result = snapshot.Snapshot(read_plan, time.time())
+        profile = self.capabilities.get(self.device_id if device_id is None else device_id)
+        blocks_plan, positions = (read_plan, None) if profile is None else profile.prune_plan(read_plan)
+        for index, block in enumerate(blocks_plan.blocks):
+            try:
+                raw_block = self._read_registers(block.address, block.quantity, device_id)
+            except ModbusIOException:
+                continue
+            if positions is None:
+                result.set_block(index, blocks_plan.decode_values(index, raw_block))
             else:
-                return f'{value} {register.value.unit}'
-        elif register.value.mapping is not None:
-            return register.value.mapping.get(value, 'undefined')
-        else:
-            return value
+                result.set_values(positions[index], blocks_plan.decode_values(index, raw_block))
+
+        return result
+
+    def discover(self, device_id=None):
+        """Discover the capabilities of the inverter unit, skipping its unsupported registers in all further reads
+
+        Reads ModelID, NumberOfPVStrings and NumberOfMPPTrackers and probes each group of capabilities.optional_groups(), a group
+        answered with an exception response is unsupported. Returns the capabilities.Capabilities, which are also stored in
+        capabilities by device_id. read_many and read_snapshot skip the unsupported registers, they are invalid in snapshots.
+        """
+        from . import capabilities
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
+
+        device_id = self.device_id if device_id is None else device_id
+        identification = self.read_many(capabilities.IDENTIFICATION, device_id=device_id)
+        unsupported = []
+        for group in capabilities.optional_groups():
+            try:
+                self._read_registers(group.probe.value.address, group.probe.value.quantity, device_id)
+            except ExceptionResponseError:
+                unsupported.append(group.name)
+        profile = capabilities.from_identification(identification, unsupported)
+        self.capabilities[device_id] = profile
+        return profile
+
+    def identify(self, store, device_id=None, discover=True):
+        """Return the metadata.DeviceRecord of the inverter unit, reading its static registers only if store holds no valid record
+
+        SN and MonitoringSoftwareVersion are read to look the unit up in store, a metadata.MetadataStore. If there is no record or
+        it was taken with another firmware, all metadata.STATIC_REGISTERS are read, the capabilities are discovered if discover
+        is True, and the record is saved. The record's values are put into cache and its capabilities into capabilities.
+        """
+        from . import metadata
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
+
+        device_id = self.device_id if device_id is None else device_id
+        validation = self.read_many(metadata.VALIDATION_REGISTERS, device_id=device_id)
+        sn, firmware = (validation[register] for register in metadata.VALIDATION_REGISTERS)
+        record = store.get(sn, firmware)
+        if record is None or (discover and record.capabilities is None):
+            static_plan = metadata.static_plan()
+            values = {}
+            for index, block in enumerate(static_plan.blocks):
+                try:
+                    raw_block = self._read_registers(block.address, block.quantity, device_id)
+                except ExceptionResponseError:
+                    continue
+                values.update(static_plan.decode(index, raw_block))
+            record = metadata.DeviceRecord(sn, firmware, values, self.discover(device_id) if discover else None)
+            store.put(record)
+            store.save()
+        _apply_record(self, record, device_id)
+        return record
+
+    def read_flags(self, register, device_id=None):
+        """Read a State or Alarm bitfield register as bitfields.Flags IntFlag, see bitfields.active_flags"""
+        from . import bitfields
+        if register not in bitfields.Flags:
+            raise ValueError('Register is not a supported bitfield')
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
+
+        raw_value = self._read_registers(register.value.address, register.value.quantity, device_id)
+        return bitfields.Flags[register](datatypes.decode_uint_be(raw_value))
+
+    def stream(self, registers, interval, overrun=sampling.SKIP, max_gap=plan.DEFAULT_MAX_GAP, device_id=None):
+        """Generator reading the given registers every interval seconds, yielding a sampling.Sample holding a snapshot per read
+
+        Reads are scheduled at a fixed rate independent of the time reading takes. If a deadline is missed because the inverter or
+        the consumer is too slow, overrun decides whether to wait for the next deadline (sampling.SKIP) or to read right away
+        (sampling.COALESCE), the number of dropped deadlines is reported in Sample.missed.
+        """
+        read_plan = registers if isinstance(registers, plan.ReadPlan) else plan.get_plan(registers, max_gap)
+        return sampling.stream(lambda: self.read_snapshot(read_plan, device_id=device_id), interval, overrun)
+
+    def read_formatted(self, register, device_id=None, use_locale=False):
+        converter = register.value.converter
+        return (converter.format_locale if use_locale else converter.format)(self.read(register, device_id))
 
     def read_range(self, start_address, quantity=0, end_address=0, device_id=None):
-        if quantity == 0 and end_address == 0:
-            raise ValueError('Either parameter quantity or end_address is required and must be greater than 0')
-        if quantity != 0 and end_address != 0:
-            raise ValueError('Only one parameter quantity or end_address should be defined')
-        if end_address != 0 and end_address <= start_address:
-            raise ValueError('end_address must be greater than start_address')
+        quantity = _range_quantity(start_address, quantity, end_address)
+
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
+
+        return datatypes.decode(self._read_registers(start_address, quantity, device_id), datatypes.DataType.MULTIDATA)
 
+    def write(self, register, value, device_id=None):
         if not self.isConnected():
             raise ValueError('Inverter is not connected')
 
-        if end_address != 0:
-            quantity = end_address - start_address + 1
+        encoded_value = _encode(register, value)
+        if self.suppressor is not None and self.suppressor.suppresses(register, self._unit(device_id), encoded_value):
+            return
+
+        try:
+            self._write_registers(register.value.address, _words(encoded_value), device_id)
+        except Exception:
+            if self.suppressor is not None:
+                self.suppressor.invalidate(register, self._unit(device_id))
+            raise
+        else:
+            if self.suppressor is not None:
+                self.suppressor.acknowledge(register, self._unit(device_id), encoded_value)
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate(register, self._unit(device_id))
+
+    def write_many(self, values, verify=False, device_id=None):
+        """Write several registers using as few Modbus requests as possible
+
+        values maps registers to the values to write as accepted by write. All values are validated and encoded before the first
+        request, registers with adjacent addresses are written together in one request. If verify is True, the written readable
+        registers are read back using as few requests as possible and WriteVerificationError is raised if any of them differs.
+        """
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
+
+        blocks, encoded = _write_blocks(values)
+
         try:
-            register_range_value = self.inverter.read_holding_registers(address=start_address, count=quantity, device_id=self.device_id if device_id is None else device_id)
-            if type(register_range_value) == ModbusIOException:
-                logger.error('Inverter unit did not respond')
-                raise register_range_value
-        except ConnectionException:
+            for address, words in blocks:
+                self._write_registers(address, words, device_id)
+        finally:
+            for register in encoded:
+                if self.cache is not None:
+                    self.cache.invalidate(register, self._unit(device_id))
+                if self.suppressor is not None:
+                    self.suppressor.invalidate(register, self._unit(device_id))
+
+        if verify:
+            read_plan = _verification_plan(encoded)
+            mismatches = {}
+            for block in read_plan.blocks:
+                mismatches.update(_mismatches(block, self._read_registers(block.address, block.quantity, device_id), encoded))
+            if mismatches:
+                raise WriteVerificationError(mismatches)
+
+    def _write_registers(self, address, values, device_id=None):
+        device_id = self.device_id if device_id is None else device_id
+        self._execute(instrumentation.WRITE, device_id, address, len(values),
+                           lambda: self.inverter.write_registers(address=address, values=values, device_id=device_id))
+
+    def _execute(self, kind, device_id, address, quantity, request):
+        key = (self.host, self.port, device_id)
+        if self.breaker is not None:
+            self.breaker.check(key)
+        delays = self.retry.delays() if self.retry is not None else iter(())
+        try:
+            while True:
+                try:
+                    response = self._attempt(kind, device_id, address, quantity, request)
+                except Exception as exception:
+                    transient = _transient(exception)
+                    delay = next(delays, None) if transient else None
+                    if delay is None:
+                        if self.breaker is not None:
+                            self.breaker.record(key, not transient)
+                        raise
+                    logger.warning(f'Retrying {kind} starting from address {address} in {delay:.2f}s')
+                    time.sleep(delay)
+                else:
+                    if self.breaker is not None:
+                        self.breaker.record(key, True)
+                    return response
+        except BaseException:
+            # Cancellation and other non-Exception errors bypass record, the claimed probe has to be released nevertheless
+            if self.breaker is not None:
+                self.breaker.release(key)
+            raise
+
+    def _attempt(self, kind, device_id, address, quantity, request):
+        if self.pacer is not None:
+            self.pacer.wait()
+        started = time.perf_counter()
+        response = None
+        error = None
+        try:
+            response = request()
+            _check_response(response)
+        except ConnectionException as exception:
+            error = exception
             logger.error('A connection error occurred')
+            if self.suppressor is not None:
+                # pymodbus reconnects on the next request, the dongle or inverter may have lost the written values meanwhile
+                self.suppressor.invalidate(unit=(self.host, self.port))
             raise
-        except Exception:
-            logger.error(f'An error occurred during reading starting from address {start_address}')
+        except Exception as exception:
+            error = exception
+            if kind == instrumentation.READ:
+                logger.error(f'An error occurred during reading starting from address {address}')
             raise
+        finally:
+            if self.hooks or self.pacer is not None:
+                _notify(self, kind, device_id, address, quantity, time.perf_counter() - started, response, error)
+        return response
 
-        return datatypes.decode(register_range_value.encode()[1:], datatypes.DataType.MULTIDATA)
 
-    def write(self, register, value, device_id=None):
+class AsyncSun2000:
+    """asyncio counterpart of Sun2000 based on pymodbus' AsyncModbusTcpClient
+
+    Provides the same methods as Sun2000, all methods performing I/O are coroutines. Decoding and postprocessing are shared with
+    Sun2000, so both clients return identical values. Must be instantiated within a running event loop.
+    """
+
+    def __init__(self, host, port=502, timeout=5, wait=2, device_id=0, cache=None, hooks=None, pacer=None, retry=None, breaker=None, suppressor=None): # some models need device_id=1
+        _setup_logger()
+        self.host = host
+        self.port = port
+        self.wait = wait
+        self.device_id = device_id
+        self.cache = cache
+        self.hooks = [] if hooks is None else list(hooks)
+        self.pacer = pacer
+        self.retry = retry
+        self.breaker = breaker
+        self.suppressor = suppressor
+        self.capabilities = {}
+        self.inverter = AsyncModbusTcpClient(host=host, port=port, timeout=timeout)
+        self._buffer = bytearray(plan.MAX_REGISTERS_PER_REQUEST * 2)
+
+    async def connect(self, probe=False):
+        """Open the underlying tcp socket, see Sun2000.connect"""
+        if not self.isConnected():
+            if self.suppressor is not None:
+                self.suppressor.invalidate(unit=(self.host, self.port))
+            await self.inverter.connect()
+            if probe:
+                await self._probe()
+            else:
+                await asyncio.sleep(self.wait)
+            if self.isConnected():
+                logger.info('Successfully connected to inverter')
+                return True
+            else:
+                logger.error('Connection to inverter failed')
+                return False
+
+    async def _probe(self):
+        probe_register = registers.InverterEquipmentRegister.ModelID.value
+        deadline = time.monotonic() + self.wait
+        for delay in _probe_delays():
+            if not self.isConnected():
+                return
+            try:
+                if type(await self.inverter.read_holding_registers(address=probe_register.address, count=probe_register.quantity, device_id=self.device_id)) != ModbusIOException:
+                    return
+            except ConnectionException:
+                return
+            except Exception:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(delay, remaining))
+
+    @contextlib.asynccontextmanager
+    async def session(self, probe=True):
+        """Asynchronous context manager connecting to the inverter on enter and disconnecting on exit, see Sun2000.session"""
+        if not await self.connect(probe=probe) and not self.isConnected():
+            raise ConnectionException('Connection to inverter failed')
+        try:
+            yield self
+        finally:
+            self.disconnect()
+
+    def disconnect(self):
+        """Close the underlying tcp socket"""
+        # See Sun2000.disconnect, the connection should be closed as soon as possible.
+        self.inverter.close()
+
+    def isConnected(self):
+        """Check if underlying tcp socket is open"""
+        return self.inverter.connected
+
+    @property
+    def connected(self):
+        return self.isConnected()
+
+    def _unit(self, device_id=None):
+        """Key identifying the addressed inverter unit in caches shared by several clients"""
+        return self.host, self.port, self.device_id if device_id is None else device_id
+
+    async def _read_registers(self, address, quantity, device_id=None):
+        device_id = self.device_id if device_id is None else device_id
+        response = await self._execute(instrumentation.READ, device_id, address, quantity,
+                                      lambda: self.inverter.read_holding_registers(address=address, count=quantity, device_id=device_id))
+        return self._unpack(response)
+
+    def _unpack(self, response):
+        # See Sun2000._unpack, callers must not await between reading and decoding
+        if len(response.registers) * 2 > len(self._buffer):
+            self._buffer = bytearray(len(response.registers) * 2)
+        return datatypes.pack_registers(response.registers, self._buffer)
+
+    async def read_raw_value(self, register, device_id=None):
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
+
+        if self.cache is not None:
+            hit, value = self.cache.get(register, self._unit(device_id))
+            if hit:
+                return value
+
+        raw_value = await self._read_registers(register.value.address, register.value.quantity, device_id)
+        value = register.value.converter.decode(raw_value)
+        if self.cache is not None:
+            self.cache.put(register, self._unit(device_id), value)
+        return value
+
+    async def read(self, register, device_id=None):
+        converter = register.value.converter
+        if self.cache is not None:
+            return converter.scale(await self.read_raw_value(register, device_id))
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
+        return converter.read(await self._read_registers(register.value.address, register.value.quantity, device_id))
+
+    async def read_many(self, registers, max_gap=plan.DEFAULT_MAX_GAP, device_id=None):
+        """Read several registers using as few Modbus requests as possible, see Sun2000.read_many"""
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
+
+        read_plan = registers if isinstance(registers, plan.ReadPlan) else plan.get_plan(registers, max_gap)
+        profile = self.capabilities.get(self.device_id if device_id is None else device_id)
+        if profile is not None:
+            read_plan = profile.prune_plan(read_plan)[0]
+        values = {}
+        for index, block in enumerate(read_plan.blocks):
+            raw_block = await self._read_registers(block.address, block.quantity, device_id)
+            values.update(zip(block.registers, read_plan.decode_values(index, raw_block)))
+
+        return values
+
+    async def read_snapshot(self, registers, max_gap=plan.DEFAULT_MAX_GAP, device_id=None):
+        """Read all given registers into a snapshot.Snapshot, see Sun2000.read_snapshot"""
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
+
+        read_plan = registers if isinstance(registers, plan.ReadPlan) else plan.get_plan(registers, max_gap)
+        result = snapshot.Snapshot(read_plan, time.time())
+        profile = self.capabilities.get(self.device_id if device_id is None else device_id)
+        blocks_plan, positions = (read_plan, None) if profile is None else profile.prune_plan(read_plan)
+        for index, block in enumerate(blocks_plan.blocks):
+            try:
+                raw_block = await self._read_registers(block.address, block.quantity, device_id)
+            except ModbusIOException:
+                continue
+            if positions is None:
+                result.set_block(index, blocks_plan.decode_values(index, raw_block))
+            else:
+                result.set_values(positions[index], blocks_plan.decode_values(index, raw_block))
+
+        return result
+
+    async def discover(self, device_id=None):
+        """Discover the capabilities of the inverter unit, see Sun2000.discover"""
+        from . import capabilities
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
+
+        device_id = self.device_id if device_id is None else device_id
+        identification = await self.read_many(capabilities.IDENTIFICATION, device_id=device_id)
+        unsupported = []
+        for group in capabilities.optional_groups():
+            try:
+                await self._read_registers(group.probe.value.address, group.probe.value.quantity, device_id)
+            except ExceptionResponseError:
+                unsupported.append(group.name)
+        profile = capabilities.from_identification(identification, unsupported)
+        self.capabilities[device_id] = profile
+        return profile
+
+    async def identify(self, store, device_id=None, discover=True):
+        """Return the metadata.DeviceRecord of the inverter unit, see Sun2000.identify"""
+        from . import metadata
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
+
+        device_id = self.device_id if device_id is None else device_id
+        validation = await self.read_many(metadata.VALIDATION_REGISTERS, device_id=device_id)
+        sn, firmware = (validation[register] for register in metadata.VALIDATION_REGISTERS)
+        record = store.get(sn, firmware)
+        if record is None or (discover and record.capabilities is None):
+            static_plan = metadata.static_plan()
+            values = {}
+            for index, block in enumerate(static_plan.blocks):
+                try:
+                    raw_block = await self._read_registers(block.address, block.quantity, device_id)
+                except ExceptionResponseError:
+                    continue
+                values.update(static_plan.decode(index, raw_block))
+            record = metadata.DeviceRecord(sn, firmware, values, await self.discover(device_id) if discover else None)
+            store.put(record)
+            store.save()
+        _apply_record(self, record, device_id)
+        return record
+
+    async def read_flags(self, register, device_id=None):
+        """Read a State or Alarm bitfield register as IntFlag, see Sun2000.read_flags"""
+        from . import bitfields
+        if register not in bitfields.Flags:
+            raise ValueError('Register is not a supported bitfield')
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
+
+        raw_value = await self._read_registers(register.value.address, register.value.quantity, device_id)
+        return bitfields.Flags[register](datatypes.decode_uint_be(raw_value))
+
+    def stream(self, registers, interval, overrun=sampling.SKIP, max_gap=plan.DEFAULT_MAX_GAP, device_id=None):
+        """Asynchronous generator reading the given registers every interval seconds, see Sun2000.stream"""
+        read_plan = registers if isinstance(registers, plan.ReadPlan) else plan.get_plan(registers, max_gap)
+        return sampling.async_stream(lambda: self.read_snapshot(read_plan, device_id=device_id), interval, overrun)
+
+    async def read_formatted(self, register, device_id=None, use_locale=False):
+        converter = register.value.converter
+        return (converter.format_locale if use_locale else converter.format)(await self.read(register, device_id))
+
+    async def read_range(self, start_address, quantity=0, end_address=0, device_id=None):
+        quantity = _range_quantity(start_address, quantity, end_address)
+
         if not self.isConnected():
             raise ValueError('Inverter is not connected')
-        if not register.value.access_type in [AccessType.RW, AccessType.WO]:
-            raise ValueError('Register is not writeable')
 
-        encoded_value = datatypes.encode(value, register.value.data_type)
-        chunks = [int.from_bytes(encoded_value[i:i+2], byteorder='big', signed=False) for i in range(0, len(encoded_value), 2)]
+        return datatypes.decode(await self._read_registers(start_address, quantity, device_id), datatypes.DataType.MULTIDATA)
+
+    async def write(self, register, value, device_id=None):
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
+
+        encoded_value = _encode(register, value)
+        if self.suppressor is not None and self.suppressor.suppresses(register, self._unit(device_id), encoded_value):
+            return
+
+        try:
+            await self._write_registers(register.value.address, _words(encoded_value), device_id)
+        except Exception:
+            if self.suppressor is not None:
+                self.suppressor.invalidate(register, self._unit(device_id))
+            raise
+        else:
+            if self.suppressor is not None:
+                self.suppressor.acknowledge(register, self._unit(device_id), encoded_value)
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate(register, self._unit(device_id))
+
+    async def write_many(self, values, verify=False, device_id=None):
+        """Write several registers using as few Modbus requests as possible, see Sun2000.write_many"""
+        if not self.isConnected():
+            raise ValueError('Inverter is not connected')
+
+        blocks, encoded = _write_blocks(values)
 
         try:
-            response = self.inverter.write_registers(address=register.value.address, values=chunks, device_id=self.device_id if device_id is None else device_id)
-            if type(response) == ModbusIOException:
-                logger.error('Inverter unit did not respond')
-                raise response
-        except ConnectionException:
+            for address, words in blocks:
+                await self._write_registers(address, words, device_id)
+        finally:
+            for register in encoded:
+                if self.cache is not None:
+                    self.cache.invalidate(register, self._unit(device_id))
+                if self.suppressor is not None:
+                    self.suppressor.invalidate(register, self._unit(device_id))
+
+        if verify:
+            read_plan = _verification_plan(encoded)
+            mismatches = {}
+            for block in read_plan.blocks:
+                mismatches.update(_mismatches(block, await self._read_registers(block.address, block.quantity, device_id), encoded))
+            if mismatches:
+                raise WriteVerificationError(mismatches)
+
+    async def _write_registers(self, address, values, device_id=None):
+        device_id = self.device_id if device_id is None else device_id
+        await self._execute(instrumentation.WRITE, device_id, address, len(values),
+                           lambda: self.inverter.write_registers(address=address, values=values, device_id=device_id))
+
+    async def _execute(self, kind, device_id, address, quantity, request):
+        key = (self.host, self.port, device_id)
+        if self.breaker is not None:
+            self.breaker.check(key)
+        delays = self.retry.delays() if self.retry is not None else iter(())
+        try:
+            while True:
+                try:
+                    response = await self._attempt(kind, device_id, address, quantity, request)
+                except Exception as exception:
+                    transient = _transient(exception)
+                    delay = next(delays, None) if transient else None
+                    if delay is None:
+                        if self.breaker is not None:
+                            self.breaker.record(key, not transient)
+                        raise
+                    logger.warning(f'Retrying {kind} starting from address {address} in {delay:.2f}s')
+                    await asyncio.sleep(delay)
+                else:
+                    if self.breaker is not None:
+                        self.breaker.record(key, True)
+                    return response
+        except BaseException:
+            # Cancellation and other non-Exception errors bypass record, the claimed probe has to be released nevertheless
+            if self.breaker is not None:
+                self.breaker.release(key)
+            raise
+
+    async def _attempt(self, kind, device_id, address, quantity, request):
+        if self.pacer is not None:
+            await self.pacer.async_wait()
+        started = time.perf_counter()
+        response = None
+        error = None
+        try:
+            response = await request()
+            _check_response(response)
+        except ConnectionException as exception:
+            error = exception
             logger.error('A connection error occurred')
+            if self.suppressor is not None:
+                # pymodbus reconnects on the next request, the dongle or inverter may have lost the written values meanwhile
+                self.suppressor.invalidate(unit=(self.host, self.port))
+            raise
+        except Exception as exception:
+            error = exception
+            if kind == instrumentation.READ:
+                logger.error(f'An error occurred during reading starting from address {address}')
             raise
+        finally:
+            if self.hooks or self.pacer is not None:
+                _notify(self, kind, device_id, address, quantity, time.perf_counter() - started, response, error)
+        return response
+
+
+def _check_response(response):
+    if type(response) == ModbusIOException:
+        logger.error('Inverter unit did not respond')
+        raise response
+    if isinstance(response, ExceptionResponse):
+        logger.error(f'Inverter unit responded with exception code {response.exception_code}')
+        raise ExceptionResponseError(response.exception_code)
+
+
+def _notify(client, kind, device_id, address, quantity, duration, response, error):
+    outcome = instrumentation.outcome(response, error)
+    if client.pacer is not None:
+        client.pacer.observe(duration, outcome)
+    transaction = instrumentation.Transaction(kind, client.host, client.port, device_id, address, quantity, 0 if error else quantity * 2, duration,
+                                              outcome, error)
+    for hook in client.hooks:
+        try:
+            hook(transaction)
+        except Exception:
+            logger.exception('A transaction hook failed')
+
+
+def _transient(error):
+    # Timeouts and connection errors may pass, exception responses are the inverter's final answer
+    return isinstance(error, (ConnectionException, ModbusIOException)) and not isinstance(error, (ExceptionResponseError, resilience.CircuitOpenError))
+
+
+def _apply_record(client, record, device_id):
+    if record.capabilities is not None:
+        client.capabilities[device_id] = record.capabilities
+    if client.cache is not None:
+        for register, value in record.values.items():
+            client.cache.put(register, client._unit(device_id), value)
+
+
+def _probe_delays():
+    delay = PROBE_INITIAL_DELAY
+    while True:
+        yield delay
+        delay *= 2
+
+
+def _range_quantity(start_address, quantity, end_address):
+    if quantity == 0 and end_address == 0:
+        raise ValueError('Either parameter quantity or end_address is required and must be greater than 0')
+    if quantity != 0 and end_address != 0:
+        raise ValueError('Only one parameter quantity or end_address should be defined')
+    if end_address != 0 and end_address <= start_address:
+        raise ValueError('end_address must be greater than start_address')
+
+    if end_address != 0:
+        return end_address - start_address + 1
+    return quantity
+
+
+def _encode(register, value):
+    if not register.value.access_type in [AccessType.RW, AccessType.WO]:
+        raise ValueError('Register is not writeable')
+
+    return datatypes.encode(value, register.value.data_type)
+
+
+def _words(encoded_value):
+    return [int.from_bytes(encoded_value[i:i+2], byteorder='big', signed=False) for i in range(0, len(encoded_value), 2)]
+
+
+def _write_blocks(values):
+    """Return a tuple (blocks, encoded) for write_many
+
+    blocks is the list of (address, words) written with one request each, encoded maps each register to its encoded value.
+    Raises ValueError before anything is written if any register is not writeable or any value cannot be encoded.
+    """
+    encoded = {}
+    for register, value in values.items():
+        encoded_value = _encode(register, value)
+        if len(encoded_value) != register.value.quantity * 2:
+            raise ValueError(f'Value of {register.name} must be {register.value.quantity * 2} bytes long')
+        encoded[register] = encoded_value
+
+    blocks = []
+    for block in plan.plan_blocks(encoded, max_gap=0, max_quantity=plan.MAX_REGISTERS_PER_WRITE):
+        words = []
+        for register in block.registers:
+            if register.value.address != block.address + len(words):
+                raise ValueError('Registers to write must not overlap')
+            words.extend(_words(encoded[register]))
+        blocks.append((block.address, words))
+    return blocks, encoded
+
+
+def _verification_plan(encoded):
+    # No gaps, units rejecting reads of undefined addresses would fail the verification of a successful write otherwise
+    return plan.get_plan([register for register in encoded if register.value.access_type == AccessType.RW], max_gap=0)
+
+
+def _mismatches(block, raw_block, encoded):
+    """Return a dict mapping the registers of block whose bytes in raw_block differ from their encoded value to the value read back"""
+    mismatches = {}
+    for register in block.registers:
+        offset = block.offset(register)
+        raw_value = raw_block[offset:offset + register.value.quantity * 2]
+        if raw_value != encoded[register]:
+            mismatches[register] = register.value.converter.decode(raw_value)
+    return mismatches
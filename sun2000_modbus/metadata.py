@@ -0,0 +1,100 @@
+import json
+import logging
+import os
+import time
+
+from . import plan
+from .cache import STATIC_ADDRESS_LIMIT
+from .capabilities import Capabilities
+from .registers import AccessType, InverterEquipmentRegister
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# Registers read on every identification to look a unit up in the store, a record taken with another firmware is stale
+VALIDATION_REGISTERS = (InverterEquipmentRegister.SN, InverterEquipmentRegister.MonitoringSoftwareVersion)
+
+# Equipment information which does not change as long as the firmware is not updated
+STATIC_REGISTERS = tuple(
+    register for register in InverterEquipmentRegister
+    if register.value.access_type == AccessType.RO and register.value.address < STATIC_ADDRESS_LIMIT
+)
+
+
+class DeviceRecord:
+    """Static equipment information of one inverter unit
+
+    values maps the STATIC_REGISTERS the unit answered to their decoded values, gains not applied, as returned by
+    Sun2000.read_raw_value. capabilities is the discovered capabilities.Capabilities or None if discovery was skipped.
+    """
+
+    def __init__(self, sn, firmware, values, capabilities=None, updated=None):
+        self.sn = sn
+        self.firmware = firmware
+        self.values = dict(values)
+        self.capabilities = capabilities
+        self.updated = time.time() if updated is None else updated
+
+    def __repr__(self):
+        return f'DeviceRecord(sn={self.sn!r}, firmware={self.firmware!r}, values={len(self.values)}, capabilities={self.capabilities!r})'
+
+    def as_dict(self):
+        return {
+            'firmware': self.firmware,
+            'updated': self.updated,
+            'values': {register.name: value for register, value in self.values.items()},
+            'capabilities': None if self.capabilities is None else self.capabilities.as_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, sn, data):
+        values = {InverterEquipmentRegister[name]: value for name, value in data['values'].items()}
+        capabilities = None if data['capabilities'] is None else Capabilities.from_dict(data['capabilities'])
+        return cls(sn, data['firmware'], values, capabilities, data['updated'])
+
+
+class MetadataStore:
+    """JSON file holding a DeviceRecord per serial number, see Sun2000.identify
+
+    The file is read on instantiation, a missing or unreadable file results in an empty store. save writes the file atomically,
+    so concurrent readers never see a partial file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.records = {}
+        try:
+            with open(path, encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get('version') == FORMAT_VERSION:
+                self.records = {sn: DeviceRecord.from_dict(sn, record) for sn, record in data['devices'].items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f'Ignoring unreadable metadata store {path}: {e}')
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, sn, firmware):
+        """Return the record of the unit with serial number sn if it was taken with the given firmware, otherwise None"""
+        record = self.records.get(sn)
+        if record is None or record.firmware != firmware:
+            return None
+        return record
+
+    def put(self, record):
+        self.records[record.sn] = record
+
+    def save(self):
+        data = {'version': FORMAT_VERSION, 'devices': {sn: record.as_dict() for sn, record in self.records.items()}}
+        temporary_path = f'{self.path}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=1)
+        os.replace(temporary_path, self.path)
+
+
+def static_plan():
+    """Return the read plan of all STATIC_REGISTERS"""
+    return plan.get_plan(STATIC_REGISTERS)
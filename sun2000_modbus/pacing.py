@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+
+from . import instrumentation
+
+# Outcomes hinting at an overloaded host
+CONGESTION_OUTCOMES = (instrumentation.NO_RESPONSE, instrumentation.CONNECTION_ERROR)
+
+_pacers = {}
+_pacers_lock = threading.Lock()
+
+
+class Pacer:
+    """Space the requests sent to one host, adapting the gap between requests AIMD-style
+
+    Every successful request answered within slow seconds shrinks the gap by step seconds (additive increase of the request
+    rate), every timeout, connection error or slow answer multiplies it by factor (multiplicative decrease), keeping it between
+    min_gap and max_gap. max_rate caps the requests per second regardless of the gap. Exception responses of the inverter,
+    e.g. illegal address, are no sign of overload and count as success.
+
+    A Pacer may be shared by several clients of the same host, see for_host.
+    """
+
+    def __init__(self, max_rate=None, min_gap=0.0, max_gap=5.0, step=0.01, factor=2.0, slow=1.0):
+        if max_rate is not None and max_rate <= 0:
+            raise ValueError('max_rate must be greater than 0')
+        if factor <= 1:
+            raise ValueError('factor must be greater than 1')
+        self.max_rate = max_rate
+        self.min_gap = max(min_gap, 1 / max_rate if max_rate else 0.0)
+        self.max_gap = max(max_gap, self.min_gap)
+        self.step = step
+        self.factor = factor
+        self.slow = slow
+        self.gap = self.min_gap
+        self.requests = 0
+        self.congestions = 0
+        self.delayed = 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'Pacer(gap={self.gap:.3f}, requests={self.requests}, congestions={self.congestions})'
+
+    def reserve(self, now=None):
+        """Reserve the next slot for a request and return the number of seconds to wait until it"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            start = max(now, self._next)
+            self._next = start + self.gap
+            self.requests += 1
+            self.delayed += start - now
+        return start - now
+
+    def observe(self, duration, outcome=instrumentation.OK):
+        """Adapt the gap to a request, duration being its latency in seconds and outcome its instrumentation outcome"""
+        with self._lock:
+            if outcome in CONGESTION_OUTCOMES or duration > self.slow:
+                self.congestions += 1
+                self.gap = min(self.max_gap, max(self.gap, self.step) * self.factor)
+            else:
+                self.gap = max(self.min_gap, self.gap - self.step)
+
+    def wait(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def async_wait(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def for_host(host, port=502, **options):
+    """Return the Pacer shared by all clients of host and port, created with options on first use"""
+    with _pacers_lock:
+        if (host, port) not in _pacers:
+            _pacers[(host, port)] = Pacer(**options)
+        return _pacers[(host, port)]
@@ -0,0 +1,186 @@
+import functools
+import struct
+
+from .datatypes import UNSCALED_TYPES
+
+MAX_REGISTERS_PER_REQUEST = 125  # Modbus limit for function code 0x03 (read holding registers)
+MAX_REGISTERS_PER_WRITE = 123  # Modbus limit for function code 0x10 (write multiple registers)
+DEFAULT_MAX_GAP = 10
+
+
+class Block:
+    """A contiguous range of registers fetched with a single Modbus request"""
+    address: int
+    quantity: int
+    registers: list
+
+    def __init__(self, address, quantity, registers):
+        self.address = address
+        self.quantity = quantity
+        self.registers = registers
+
+    def __repr__(self):
+        return f'Block(address={self.address}, quantity={self.quantity}, registers={len(self.registers)})'
+
+    def offset(self, register):
+        """Byte offset of the given register inside the block's response payload"""
+        return (register.value.address - self.address) * 2
+
+    @property
+    def wasted_registers(self):
+        """Number of registers read but not belonging to any register of the block"""
+        used = set()
+        for register in self.registers:
+            used.update(range(register.value.address, register.value.address + register.value.quantity))
+        return self.quantity - len(used)
+
+
+class BlockDecoder:
+    """Decoder for a block's response payload using the converters of its registers
+
+    The payload is split into the bytes of each register with one struct call, gaps between registers are skipped by pad bytes.
+    The bytes are decoded by the registers' converters, see Register.converter, so blocks decode exactly like single registers.
+    If registers of the block overlap, the payload is sliced per register instead.
+    """
+
+    def __init__(self, block):
+        self.registers = tuple(block.registers)
+        converters = [register.value.converter for register in self.registers]
+        self.decoders = tuple(converter.decode for converter in converters)
+        self.readers = tuple(converter.read for converter in converters)
+        self.scales = tuple(
+            (index, converter.scale) for index, (register, converter) in enumerate(zip(self.registers, converters))
+            if register.value.gain is not None and register.value.data_type not in UNSCALED_TYPES
+        )
+
+        ranges = tuple((block.offset(register), block.offset(register) + register.value.quantity * 2) for register in self.registers)
+        position = 0
+        layout = '>'
+        for start, end in ranges:
+            if start < position:
+                self.split = lambda raw_block: [raw_block[first:last] for first, last in ranges]
+                break
+            if start > position:
+                layout += f'{start - position}x'
+            layout += f'{end - start}s'
+            position = end
+        else:
+            self.split = struct.Struct(layout).unpack_from
+
+    def unpack(self, raw_block):
+        """Return the list of decoded raw values of the block's registers"""
+        return [decode(raw) for decode, raw in zip(self.decoders, self.split(raw_block))]
+
+    def scale(self, values):
+        """Apply the registers' gains to the given list of raw values in place"""
+        for index, scale in self.scales:
+            values[index] = scale(values[index])
+        return values
+
+    def read(self, raw_block):
+        """Return the list of values of the block's registers scaled by their gains"""
+        return [read(raw) for read, raw in zip(self.readers, self.split(raw_block))]
+
+
+class ReadPlan:
+    """Precomputed, address-sorted set of blocks covering a set of registers
+
+    A plan is built once per register set and reused for every poll, see get_plan. Each block has a BlockDecoder compiled from
+    the byte offsets and converters of its registers, so decoding a block's response needs no further lookups.
+    """
+    blocks: tuple
+    decoders: tuple
+    registers: tuple
+    index: dict
+    offsets: tuple
+    max_gap: int
+    max_quantity: int
+
+    def __init__(self, registers, max_gap=DEFAULT_MAX_GAP, max_quantity=MAX_REGISTERS_PER_REQUEST):
+        self.max_gap = max_gap
+        self.max_quantity = max_quantity
+        self.blocks = tuple(plan_blocks(registers, max_gap, max_quantity))
+        self.registers = tuple(register for block in self.blocks for register in block.registers)
+        self.index = {register: index for index, register in enumerate(self.registers)}
+        self.offsets = tuple(self.index[block.registers[0]] for block in self.blocks)
+        self.decoders = tuple(BlockDecoder(block) for block in self.blocks)
+
+    def __repr__(self):
+        return f'ReadPlan(registers={self.register_count}, requests={self.request_count}, wasted_bytes={self.wasted_bytes})'
+
+    def __reduce__(self):
+        return get_plan, (self.registers, self.max_gap, self.max_quantity)
+
+    def __iter__(self):
+        return iter(self.blocks)
+
+    def __len__(self):
+        return len(self.blocks)
+
+    @property
+    def request_count(self):
+        """Number of Modbus requests needed to execute the plan"""
+        return len(self.blocks)
+
+    @property
+    def register_count(self):
+        return len(self.registers)
+
+    @property
+    def wasted_registers(self):
+        """Number of registers read in gaps between the planned registers"""
+        return sum(block.wasted_registers for block in self.blocks)
+
+    @property
+    def wasted_bytes(self):
+        return self.wasted_registers * 2
+
+    def decode(self, index, raw_block):
+        """Decode the response payload of the block at the given index into a dict of raw register values"""
+        decoder = self.decoders[index]
+        return dict(zip(decoder.registers, decoder.unpack(raw_block)))
+
+    def decode_values(self, index, raw_block):
+        """Decode the response payload of the block at the given index into a list of values scaled by the registers' gains
+
+        The values are in the order of the block's registers.
+        """
+        return self.decoders[index].read(raw_block)
+
+
+def get_plan(registers, max_gap=DEFAULT_MAX_GAP, max_quantity=MAX_REGISTERS_PER_REQUEST):
+    """Return the cached read plan for the given registers, e.g. a whole register enum or a list of its members"""
+    return _cached_plan(frozenset(registers), max_gap, max_quantity)
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_plan(registers, max_gap, max_quantity):
+    return ReadPlan(registers, max_gap, max_quantity)
+
+
+def plan_blocks(registers, max_gap=DEFAULT_MAX_GAP, max_quantity=MAX_REGISTERS_PER_REQUEST):
+    """Merge the given registers into as few blocks as possible
+
+    Registers are sorted by address and merged as long as the number of unused registers between two neighbours does not exceed
+    max_gap and the resulting block does not exceed max_quantity registers.
+    """
+    if max_gap < 0:
+        raise ValueError('max_gap must not be negative')
+    if max_quantity < 1 or max_quantity > MAX_REGISTERS_PER_REQUEST:
+        raise ValueError(f'max_quantity must be between 1 and {MAX_REGISTERS_PER_REQUEST}')
+
+    blocks = []
+    current = None
+    for register in sorted(set(registers), key=lambda r: (r.value.address, r.value.quantity)):
+        start = register.value.address
+        end = start + register.value.quantity
+        if current is not None:
+            current_end = current.address + current.quantity
+            if start - current_end <= max_gap and max(end, current_end) - current.address <= max_quantity:
+                current.quantity = max(end, current_end) - current.address
+                current.registers.append(register)
+                continue
+        current = Block(start, register.value.quantity, [register])
+        blocks.append(current)
+
+    return blocks
@@ -0,0 +1,121 @@
+import random
+import threading
+import time
+
+from pymodbus.exceptions import ConnectionException
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(ConnectionException):
+    """Raised instead of sending a request to a unit whose circuit is open"""
+
+    def __init__(self, key):
+        host, port, device_id = key
+        super().__init__(f'Circuit of {host}:{port} device {device_id} is open')
+        self.key = key
+
+
+class RetryPolicy:
+    """Retry requests failing with a timeout or connection error
+
+    A request is sent at most attempts times. Before retry n the client sleeps for a random delay of up to
+    min(max_backoff, backoff * 2 ** (n - 1)) seconds, jitter being the randomized fraction of that delay. Exception responses
+    of the inverter are never retried.
+    """
+
+    def __init__(self, attempts=3, backoff=0.2, max_backoff=5.0, jitter=1.0, seed=None):
+        if attempts < 1:
+            raise ValueError('attempts must be at least 1')
+        if not 0 <= jitter <= 1:
+            raise ValueError('jitter must be between 0 and 1')
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retries = 0
+        self._random = random.Random(seed)
+
+    def __repr__(self):
+        return f'RetryPolicy(attempts={self.attempts}, backoff={self.backoff}, retries={self.retries})'
+
+    def delays(self):
+        """Yield the delays before each retry of one request"""
+        for retry in range(self.attempts - 1):
+            delay = min(self.max_backoff, self.backoff * 2 ** retry)
+            self.retries += 1
+            yield delay * (1 - self.jitter * self._random.random())
+
+
+class CircuitBreaker:
+    """Fail fast while a unit is known to be down
+
+    Keeps one circuit per (host, port, device_id). A circuit opens after threshold consecutive requests failed with a timeout or
+    connection error, requests to it raise CircuitOpenError without touching the network. After recovery seconds the circuit is
+    half open and lets a single request through as probe: if it succeeds the circuit closes, otherwise it opens again for another
+    recovery seconds. A CircuitBreaker may be shared by any number of clients.
+    """
+
+    def __init__(self, threshold=3, recovery=60.0):
+        if threshold < 1:
+            raise ValueError('threshold must be at least 1')
+        self.threshold = threshold
+        self.recovery = recovery
+        self.rejected = 0
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'CircuitBreaker(open={len(self.open_circuits())}, rejected={self.rejected})'
+
+    def state(self, key, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit[1] is None:
+                return CLOSED
+            return HALF_OPEN if circuit[2] or now >= circuit[1] + self.recovery else OPEN
+
+    def is_open(self, key, now=None):
+        """Return True if a request to key would be rejected, without claiming the probe of a half open circuit"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            circuit = self._circuits.get(key)
+            return circuit is not None and circuit[1] is not None and (circuit[2] or now < circuit[1] + self.recovery)
+
+    def open_circuits(self, now=None):
+        return [key for key in list(self._circuits) if self.state(key, now) != CLOSED]
+
+    def check(self, key, now=None):
+        """Raise CircuitOpenError if the circuit of key is open, otherwise let the request through"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit[1] is None:
+                return
+            if circuit[2] or now < circuit[1] + self.recovery:
+                self.rejected += 1
+                raise CircuitOpenError(key)
+            circuit[2] = True
+
+    def release(self, key):
+        """Release the probe of a half open circuit claimed by check without recording a result, e.g. if the request was cancelled"""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is not None:
+                circuit[2] = False
+
+    def record(self, key, ok, now=None):
+        """Record the result of a request let through by check, ok being False if it failed with a timeout or connection error"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if ok:
+                self._circuits.pop(key, None)
+                return
+            circuit = self._circuits.setdefault(key, [0, None, False])
+            circuit[0] += 1
+            circuit[2] = False
+            if circuit[1] is not None or circuit[0] >= self.threshold:
+                circuit[1] = now
@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+SKIP = 'skip'
+COALESCE = 'coalesce'
+
+
+class Sample:
+    """A single reading taken by a stream
+
+    scheduled is the monotonic time the reading was due, lateness the number of seconds it started after that and duration the
+    number of seconds the read took. missed is the number of ticks dropped right before this sample because the previous read or
+    the consumer was too slow.
+    """
+    __slots__ = ('snapshot', 'scheduled', 'lateness', 'duration', 'missed')
+
+    def __init__(self, snapshot, scheduled, lateness, duration, missed):
+        self.snapshot = snapshot
+        self.scheduled = scheduled
+        self.lateness = lateness
+        self.duration = duration
+        self.missed = missed
+
+    def __repr__(self):
+        return f'Sample(timestamp={self.timestamp}, lateness={self.lateness:.3f}, duration={self.duration:.3f}, missed={self.missed})'
+
+    @property
+    def timestamp(self):
+        return self.snapshot.timestamp
+
+
+class Schedule:
+    """Fixed-rate schedule of ticks interval seconds apart
+
+    Ticks are computed from the start time, so time spent reading or consuming samples does not accumulate as drift. If a tick
+    is missed, overrun decides how to continue: SKIP waits for the next tick in the future, COALESCE takes one sample right away
+    standing in for all missed ticks.
+    """
+
+    def __init__(self, interval, overrun=SKIP, start=None):
+        if interval <= 0:
+            raise ValueError('interval must be greater than 0')
+        if overrun not in [SKIP, COALESCE]:
+            raise ValueError(f'overrun must be either {SKIP!r} or {COALESCE!r}')
+        self.interval = interval
+        self.overrun = overrun
+        self.tick = time.monotonic() if start is None else start
+        self.missed_total = 0
+        self._first = True
+
+    def advance(self, now):
+        """Move to the next tick and return a tuple (tick, missed), tick being the monotonic time the next sample is due"""
+        if self._first:
+            self._first = False
+            return self.tick, 0
+
+        self.tick += self.interval
+        if now <= self.tick:
+            return self.tick, 0
+
+        passed = int((now - self.tick) // self.interval)
+        if self.overrun == SKIP:
+            missed = passed + 1
+            self.tick += missed * self.interval
+        else:
+            missed = passed
+            self.tick += passed * self.interval
+        self.missed_total += missed
+        return self.tick, missed
+
+
+def stream(read, interval, overrun=SKIP):
+    """Generator calling read every interval seconds and yielding a Sample per call, see Schedule"""
+    schedule = Schedule(interval, overrun)
+    while True:
+        tick, missed = schedule.advance(time.monotonic())
+        delay = tick - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        start = time.monotonic()
+        snapshot = read()
+        yield Sample(snapshot, tick, max(start - tick, 0.0), time.monotonic() - start, missed)
+
+
+async def async_stream(read, interval, overrun=SKIP):
+    """Asynchronous generator awaiting read every interval seconds and yielding a Sample per call, see Schedule"""
+    schedule = Schedule(interval, overrun)
+    while True:
+        tick, missed = schedule.advance(time.monotonic())
+        delay = tick - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        start = time.monotonic()
+        snapshot = await read()
+        yield Sample(snapshot, tick, max(start - tick, 0.0), time.monotonic() - start, missed)
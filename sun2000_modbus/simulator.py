@@ -0,0 +1,307 @@
+"""Local Modbus TCP simulator of Sun2000 inverters for load tests and development without hardware
+
+Requires pymodbus 3.12 or later. Run it with python -m sun2000_modbus.simulator --help.
+"""
+import argparse
+import asyncio
+import logging
+import math
+import random
+import struct
+import time
+
+import pymodbus
+
+if tuple(int(part) for part in pymodbus.__version__.split('.')[:2]) < (3, 12):
+    raise ImportError(f'sun2000_modbus.simulator requires pymodbus 3.12 or later, {pymodbus.__version__} is installed')
+
+from pymodbus.constants import ExcCodes
+from pymodbus.datastore import ModbusServerContext
+from pymodbus.exceptions import NoSuchIdException
+from pymodbus.server import ModbusTcpServer
+
+from .datatypes import DataType
+from .registers import AccessType, BatteryEquipmentRegister, InverterEquipmentRegister, MeterEquipmentRegister
+
+logger = logging.getLogger(__name__)
+
+REGISTER_ENUMS = (InverterEquipmentRegister, BatteryEquipmentRegister, MeterEquipmentRegister)
+READ_FUNCTION_CODE = 3
+WRITE_FUNCTION_CODES = (6, 16)
+
+# Values of registers whose value is not derived from their unit
+_STATIC_VALUES = {
+    InverterEquipmentRegister.Model: 'SUN2000-10KTL-M1',
+    InverterEquipmentRegister.PN: '01074950',
+    InverterEquipmentRegister.ModelID: 428,
+    InverterEquipmentRegister.NumberOfPVStrings: 2,
+    InverterEquipmentRegister.NumberOfMPPTrackers: 2,
+    InverterEquipmentRegister.State1: 0x0006,
+    InverterEquipmentRegister.State2: 0x0003,
+    InverterEquipmentRegister.DeviceStatus: 0x0200,
+}
+
+# Relative amplitude of the variation of measurements over time, by unit
+_AMPLITUDES = {'W': 0.2, 'var': 0.2, 'kW': 0.2, 'A': 0.2, 'V': 0.02, 'Hz': 0.002, '°C': 0.05, '%': 0.1}
+_PERIOD = 300
+
+
+class SimulatedInverter:
+    """Register map of a single simulated inverter
+
+    Every register of the register enums is served. Measurements vary slowly over time, energy counters increase, writes to RW
+    and WO registers are stored and read back. Registers sharing addresses, e.g. the meter registers, return the value of the
+    first register defined at the address.
+
+    Addresses outside of all registers read as 0, unless strict is True, then requests touching them are answered with an
+    illegal address exception like real inverters do. Requests touching illegal_addresses always are. latency delays every
+    request by the given number of seconds or, if it is a tuple (min, max), by a random delay in between. With probability
+    timeout_rate a request is delayed by hang seconds, so clients time out.
+    """
+
+    def __init__(self, device_id=0, rated_power=10000, strict=False, illegal_addresses=(), latency=0, timeout_rate=0, hang=30, seed=None):
+        self.device_id = device_id
+        self.rated_power = rated_power
+        self.strict = strict
+        self.illegal_addresses = frozenset(illegal_addresses)
+        self.latency = latency
+        self.timeout_rate = timeout_rate
+        self.hang = hang
+        self.requests = 0
+        self.started = time.time()
+        self._random = random.Random(seed)
+        self._written = {}
+        self._registers = {}
+        for register_enum in REGISTER_ENUMS:
+            for register in register_enum:
+                for address in range(register.value.address, register.value.address + register.value.quantity):
+                    self._registers.setdefault(address, register)
+
+    def __repr__(self):
+        return f'SimulatedInverter(device_id={self.device_id}, rated_power={self.rated_power})'
+
+    def value(self, register, now=None):
+        """Return the physical value the inverter currently serves for register, before scaling by its gain"""
+        now = time.time() if now is None else now
+        if register in _STATIC_VALUES:
+            return _STATIC_VALUES[register]
+        name = register.name
+        register = register.value
+        if register.data_type == DataType.STRING:
+            if name.endswith('SN'):
+                return f'SIM{self.device_id:04d}{register.address:05d}'
+            if name.endswith('Version'):
+                return 'V100R001C00SPC100'
+            return ''
+        if register.data_type in [DataType.BITFIELD16, DataType.BITFIELD32, DataType.MULTIDATA]:
+            return 0
+        if register.mapping is not None:
+            return min(register.mapping)
+
+        elapsed = now - self.started
+        if register.unit in ['kWh', 'kvarh']:
+            # Energy counters grow with the average power
+            return (10 if 'Daily' in name else 1000) + elapsed * self.rated_power * 0.6 / 3600000
+        if register.unit == 's':
+            return int(now) if name.endswith('Time') and register.quantity == 2 else 60
+
+        nominal = self._nominal(name, register)
+        amplitude = _AMPLITUDES.get(register.unit)
+        if amplitude is None or register.access_type != AccessType.RO or register.address < 32000:
+            return nominal
+        return nominal * (1 + amplitude * math.sin(2 * math.pi * elapsed / _PERIOD + register.address))
+
+    def read(self, address, count):
+        """Return count register words starting from address or the ExcCodes the request is answered with"""
+        now = time.time()
+        words = []
+        cached = {}
+        for current in range(address, address + count):
+            if current in self.illegal_addresses:
+                return ExcCodes.ILLEGAL_ADDRESS
+            if current in self._written:
+                words.append(self._written[current])
+                continue
+            register = self._registers.get(current)
+            if register is None:
+                if self.strict:
+                    return ExcCodes.ILLEGAL_ADDRESS
+                words.append(0)
+                continue
+            if register not in cached:
+                cached[register] = encode_words(register, self.value(register, now))
+            words.append(cached[register][current - register.value.address])
+        return words
+
+    def write(self, address, values):
+        """Store values starting from address, returns None or the ExcCodes the request is answered with"""
+        for current in range(address, address + len(values)):
+            register = self._registers.get(current)
+            if current in self.illegal_addresses or register is None or register.value.access_type == AccessType.RO:
+                return ExcCodes.ILLEGAL_ADDRESS
+        for offset, value in enumerate(values):
+            self._written[address + offset] = value
+        return None
+
+    async def delay(self):
+        """Sleep for the configured latency or, with probability timeout_rate, for hang seconds"""
+        self.requests += 1
+        if self.timeout_rate and self._random.random() < self.timeout_rate:
+            await asyncio.sleep(self.hang)
+            return
+        latency = self._random.uniform(*self.latency) if isinstance(self.latency, tuple) else self.latency
+        if latency:
+            await asyncio.sleep(latency)
+
+    def _nominal(self, name, register):
+        if name in ['RatedPower', 'MaximumActivePower']:
+            return self.rated_power
+        if register.unit in ['W', 'var']:
+            return self.rated_power * 0.6
+        if register.unit in ['kW', 'kVA', 'kvar']:
+            return self.rated_power / 1000
+        if register.unit == 'V':
+            return 350 if 'PV' in name else 230
+        if register.unit == 'A':
+            return 8
+        if register.unit == 'Hz':
+            return 50
+        if register.unit == '°C':
+            return 35
+        if register.unit in ['%', '%/s']:
+            return 50 if register.unit == '%' else 0.25
+        if register.unit == 'MOhm':
+            return 3
+        if register.unit in ['min', 'mins']:
+            return 60
+        return 1
+
+
+def encode_words(register, value):
+    """Encode a physical value of register to the tuple of register words an inverter would return"""
+    register = register.value
+    length = register.quantity * 2
+    if register.data_type == DataType.STRING:
+        data = value.encode('utf-8')[:length].ljust(length, b'\0')
+    elif register.data_type == DataType.MULTIDATA:
+        data = bytes(value)[:length].ljust(length, b'\0') if isinstance(value, bytes) else bytes(length)
+    else:
+        raw = round(value * register.gain) if register.gain else int(value)
+        bits = length * 8
+        if register.data_type in [DataType.INT16_BE, DataType.INT32_BE]:
+            raw = max(-(1 << bits - 1), min(raw, (1 << bits - 1) - 1))
+        else:
+            raw = max(0, min(raw, (1 << bits) - 1))
+        data = (raw & (1 << bits) - 1).to_bytes(length, byteorder='big')
+    return struct.unpack(f'>{register.quantity}H', data)
+
+
+class SimulatorContext(ModbusServerContext):
+    """pymodbus server context dispatching requests to SimulatedInverters by device_id"""
+
+    def __init__(self, inverters):
+        # ModbusServerContext.__init__ is not called, it only sets up pymodbus' own datastores. old_simulator and simdevices are
+        # internals of pymodbus' server (3.12 up to 3.16 at the time of writing) which have to be set nevertheless, check them when
+        # raising the pymodbus upper bound.
+        self.inverters = {inverter.device_id: inverter for inverter in inverters}
+        self.old_simulator = True
+        self.simdevices = []
+
+    def __getitem__(self, device_id):
+        return self._inverter(device_id)
+
+    def device_ids(self):
+        return list(self.inverters)
+
+    async def async_getValues(self, device_id, func_code, address, count=1):
+        inverter = self._inverter(device_id)
+        if func_code == READ_FUNCTION_CODE:
+            await inverter.delay()
+        elif func_code not in WRITE_FUNCTION_CODES:
+            return ExcCodes.ILLEGAL_FUNCTION
+        return inverter.read(address, count)
+
+    async def async_setValues(self, device_id, func_code, address, values):
+        inverter = self._inverter(device_id)
+        if func_code not in WRITE_FUNCTION_CODES:
+            return ExcCodes.ILLEGAL_FUNCTION
+        await inverter.delay()
+        return inverter.write(address, values)
+
+    def _inverter(self, device_id):
+        if device_id not in self.inverters:
+            raise NoSuchIdException(f'device_id {device_id} is not simulated')
+        return self.inverters[device_id]
+
+
+class Simulator:
+    """Modbus TCP server serving SimulatedInverters
+
+    port 0 binds a free port, the bound port is available as port after start. Must be started within a running event loop.
+    """
+
+    def __init__(self, inverters=None, host='127.0.0.1', port=5020):
+        self.inverters = [SimulatedInverter()] if inverters is None else list(inverters)
+        self.host = host
+        self.port = port
+        self.context = SimulatorContext(self.inverters)
+        self.server = None
+
+    async def start(self):
+        self.server = ModbusTcpServer(self.context, address=(self.host, self.port))
+        await self.server.serve_forever(background=True)
+        self.port = self.server.transport.sockets[0].getsockname()[1]
+        logger.info(f'Simulating device ids {self.context.device_ids()} on {self.host}:{self.port}')
+
+    async def stop(self):
+        if self.server is not None:
+            await self.server.shutdown()
+            self.server = None
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self.server.serving
+        finally:
+            await self.stop()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+
+def _latency(value):
+    if ':' in value:
+        low, high = value.split(':', 1)
+        return float(low), float(high)
+    return float(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sun2000_modbus.simulator', description='Simulate Sun2000 inverters via Modbus TCP')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5020)
+    parser.add_argument('--device-id', type=int, action='append', dest='device_ids', help='device id to simulate, may be repeated (default: 0 and 1)')
+    parser.add_argument('--rated-power', type=int, default=10000, help='rated power in W')
+    parser.add_argument('--latency', type=_latency, default=0, help='response delay in seconds, either fixed or a range min:max')
+    parser.add_argument('--timeout-rate', type=float, default=0, help='probability of a request not being answered in time')
+    parser.add_argument('--illegal-address', type=int, action='append', default=[], dest='illegal_addresses', help='address answered with an illegal address exception, may be repeated')
+    parser.add_argument('--strict', action='store_true', help='answer requests touching addresses without register with an illegal address exception')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s:%(name)s:%(message)s')
+    inverters = [
+        SimulatedInverter(device_id, args.rated_power, args.strict, args.illegal_addresses, args.latency, args.timeout_rate)
+        for device_id in (args.device_ids or [0, 1])
+    ]
+    try:
+        asyncio.run(Simulator(inverters, args.host, args.port).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+class Snapshot:
+    """Compact record holding the values of all registers of a read plan
+
+    Values are stored in a list in the plan's register order, validity flags in a bytearray. A register is invalid if the block
+    containing it could not be read. The plan is shared by all snapshots taken with it, so a snapshot costs little more than its
+    values. timestamp is the unix time the read started.
+    """
+    __slots__ = ('plan', 'timestamp', 'values', 'valid')
+
+    def __init__(self, plan, timestamp, values=None, valid=None):
+        self.plan = plan
+        self.timestamp = timestamp
+        self.values = [None] * len(plan.registers) if values is None else values
+        self.valid = bytearray(len(plan.registers)) if valid is None else valid
+
+    def __repr__(self):
+        return f'Snapshot(timestamp={self.timestamp}, registers={len(self.values)}, valid={sum(self.valid)})'
+
+    def __getitem__(self, register):
+        return self.values[self.plan.index[register]]
+
+    def __contains__(self, register):
+        return register in self.plan.index
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.plan.registers)
+
+    def __getstate__(self):
+        return self.plan, self.timestamp, self.values, self.valid
+
+    def __setstate__(self, state):
+        self.plan, self.timestamp, self.values, self.valid = state
+
+    def set(self, register, value):
+        index = self.plan.index[register]
+        self.values[index] = value
+        self.valid[index] = 1
+
+    def set_block(self, index, values):
+        """Store the values of the plan's block at the given index, in the order of the block's registers"""
+        start = self.plan.offsets[index]
+        end = start + len(values)
+        self.values[start:end] = values
+        self.valid[start:end] = b'\x01' * len(values)
+
+    def set_values(self, indexes, values):
+        """Store values at the given indexes of the plan's registers, see capabilities.Capabilities.prune_plan"""
+        for index, value in zip(indexes, values):
+            self.values[index] = value
+            self.valid[index] = 1
+
+    def is_valid(self, register):
+        return bool(self.valid[self.plan.index[register]])
+
+    @property
+    def complete(self):
+        """True if all registers were read successfully"""
+        return all(self.valid)
+
+    def get(self, register, default=None):
+        """Return the value of register if it is valid, otherwise default"""
+        index = self.plan.index.get(register)
+        if index is None or not self.valid[index]:
+            return default
+        return self.values[index]
+
+    def as_dict(self):
+        """Return a dict mapping each valid register to its value"""
+        return {register: value for register, value, valid in zip(self.plan.registers, self.values, self.valid) if valid}
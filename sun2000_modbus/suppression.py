@@ -0,0 +1,66 @@
+import threading
+import time
+
+from .registers import overlaps
+
+
+class WriteSuppressor:
+    """Tracks the last value acknowledged per register to skip writes which would not change anything
+
+    A write is suppressed if its encoded value equals the value last acknowledged by the inverter for the same register and unit and
+    that value was written less than refresh seconds ago. The clients use (host, port, device_id) as unit, so one suppressor may be
+    shared by clients of different hosts, also from different threads. Writing the value again after refresh seconds restores
+    settings changed by someone else in the meantime, e.g. via FusionSolar. The clients invalidate all values of the host on
+    connecting and on connection errors, as the dongle or inverter may have been restarted, and a register's value if writing it
+    failed.
+    """
+
+    def __init__(self, refresh=60):
+        if refresh <= 0:
+            raise ValueError('refresh must be greater than 0')
+        self.refresh = refresh
+        self.suppressed = 0
+        self._written = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._written)
+
+    def suppresses(self, register, unit, encoded_value):
+        """Return True and count the write as suppressed if encoded_value needs not be written to the register"""
+        with self._lock:
+            entry = self._written.get((unit, register))
+            if entry is not None:
+                written, value = entry
+                if value == encoded_value and time.monotonic() - written < self.refresh:
+                    self.suppressed += 1
+                    return True
+            return False
+
+    def acknowledge(self, register, unit, encoded_value):
+        """Remember encoded_value as the register's value after the inverter acknowledged writing it"""
+        with self._lock:
+            self._invalidate(register, unit)
+            self._written[(unit, register)] = (time.monotonic(), bytes(encoded_value))
+
+    def invalidate(self, register=None, unit=None):
+        """Forget written values
+
+        Without arguments, all values are forgotten. If register is given, the values of all registers overlapping its address range
+        are forgotten. unit restricts this to a unit, a tuple (host, port) to all units of a host.
+        """
+        with self._lock:
+            self._invalidate(register, unit)
+
+    def _invalidate(self, register, unit):
+        if register is None and unit is None:
+            self._written.clear()
+            return
+
+        for key in list(self._written):
+            written_unit, written_register = key
+            if unit is not None and written_unit[:len(unit)] != unit:
+                continue
+            if register is not None and not overlaps(written_register, register):
+                continue
+            del self._written[key]
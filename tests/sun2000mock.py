@@ -9,6 +9,10 @@ class MockedResponse:
     def encode(self):
         return MockedRegisters[(self.address, self.quantity)]
 
+    @property
+    def registers(self):
+        return _to_registers(self.encode())
+
 
 MockedRegisters = {
     # InverterEquipmentRegister.Model - 'SUN2000'
@@ -34,10 +38,56 @@ MockedRegisters = {
 }
 
 
+class MockedBlockResponse:
+    def __init__(self, address, quantity):
+        self.address = address
+        self.quantity = quantity
+
+    def encode(self):
+        words = [MockedRegisterMap.get(address, 0) for address in range(self.address, self.address + self.quantity)]
+        return bytes([self.quantity * 2]) + b''.join(word.to_bytes(2, byteorder='big') for word in words)
+
+    @property
+    def registers(self):
+        return _to_registers(self.encode())
+
+
+def _to_registers(encoded):
+    return [int.from_bytes(encoded[i:i + 2], byteorder='big') for i in range(1, len(encoded), 2)]
+
+
+MockedRegisterMap = {
+    # InverterEquipmentRegister.ModelID - 429
+    30070: 0x01AD,
+    # InverterEquipmentRegister.NumberOfPVStrings - 4
+    30071: 0x0004,
+    # InverterEquipmentRegister.NumberOfMPPTrackers - 2
+    30072: 0x0002,
+    # InverterEquipmentRegister.RatedPower - 10000
+    30073: 0x0000,
+    30074: 0x2710,
+    # InverterEquipmentRegister.State1 - '0000000000000110'
+    32000: 0x0006,
+    # InverterEquipmentRegister.PV1Voltage - 350.5 V
+    32016: 0x0DB1,
+    # InverterEquipmentRegister.PV1Current - -1.5 A
+    32017: 0xFF6A,
+    # InverterEquipmentRegister.DeviceStatus - 512
+    32089: 0x0200,
+    # MeterEquipmentRegister.ActivePower - 1000
+    37113: 0x0000,
+    37114: 0x03E8,
+}
+
+
 def mock_read_holding_registers(self, address, count, device_id):
     return MockedResponse(address, count)
 
 
+def mock_read_holding_registers_block(self, address, count, device_id):
+    return MockedBlockResponse(address, count)
+
+
 def mock_read_holding_registers_ModbusIOException(self, address, count, device_id):
     return ModbusIOException('Requested device is not available')
 
@@ -1,12 +1,47 @@
+import asyncio
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import threading
 import unittest
-from unittest.mock import patch
+from enum import Enum
+from unittest.mock import patch, call, AsyncMock, MagicMock, PropertyMock
 
 from pymodbus.exceptions import ModbusIOException, ConnectionException
+from pymodbus.pdu import ExceptionResponse
 
 import sun2000mock
-from sun2000_modbus.datatypes import encode, decode, DataType
-from sun2000_modbus.inverter import Sun2000
-from sun2000_modbus.registers import InverterEquipmentRegister, MeterEquipmentRegister, BatteryEquipmentRegister
+from sun2000_modbus import bitfields
+from sun2000_modbus import instrumentation
+from sun2000_modbus import pacing
+from sun2000_modbus import registers as registers_module
+from sun2000_modbus import resilience
+from sun2000_modbus.capabilities import Capabilities
+from sun2000_modbus.cache import RegisterCache, FOREVER
+from sun2000_modbus.datatypes import encode, decode, pack_registers, DataType
+from sun2000_modbus.inverter import Sun2000, AsyncSun2000, ExceptionResponseError, WriteVerificationError
+from sun2000_modbus.deltas import DeltaFilter
+from sun2000_modbus.metadata import DeviceRecord, MetadataStore, STATIC_REGISTERS
+from sun2000_modbus.exporter import Exporter, metric_name, parse_endpoint
+from sun2000_modbus.fleet import Endpoint, FleetPoller
+from sun2000_modbus.pacing import Pacer
+from sun2000_modbus.sampling import Schedule, SKIP, COALESCE
+from sun2000_modbus.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from sun2000_modbus.plan import plan_blocks, get_plan, ReadPlan, BlockDecoder
+from sun2000_modbus.snapshot import Snapshot
+from sun2000_modbus.suppression import WriteSuppressor
+from sun2000_modbus.registers import InverterEquipmentRegister, MeterEquipmentRegister, BatteryEquipmentRegister, Register, AccessType
+
+try:
+    from pymodbus.constants import ExcCodes
+    from sun2000_modbus.gateway import Gateway, GatewayServer
+    from sun2000_modbus.simulator import Simulator, SimulatedInverter, encode_words
+    SERVER_SKIP_REASON = None
+except ImportError as e:
+    # The simulator and the gateway require pymodbus 3.12 or later, the rest of the library runs on pymodbus 3.11
+    SERVER_SKIP_REASON = str(e)
 
 
 class TestDataTypes(unittest.TestCase):
@@ -75,11 +110,590 @@ class TestDataTypes(unittest.TestCase):
         decoded = decode(value, DataType.MULTIDATA)
         self.assertEqual(decoded, b'\x3E\x22\xAF\x45')
 
+    def test_pack_registers(self):
+        buffer = bytearray(8)
+        packed = pack_registers([0x3E22, 0xAF45], buffer)
+        self.assertIsInstance(packed, memoryview)
+        self.assertEqual(packed.tobytes(), b'\x3E\x22\xAF\x45')
+        self.assertEqual(decode(packed, DataType.BITFIELD32), '00111110001000101010111101000101')
+        self.assertEqual(decode(packed[:2], DataType.INT16_BE), 15906)
+
+    def test_decode_from_memoryview(self):
+        value = memoryview(bytearray(b'SUN2000\x00\x00\x00'))
+        self.assertEqual(decode(value, DataType.STRING), 'SUN2000')
+        self.assertEqual(decode(value[:4], DataType.MULTIDATA), b'SUN2')
+        self.assertIsInstance(decode(value[:4], DataType.MULTIDATA), bytes)
+
     def test_decode_invalid(self):
         value = b'\x3E'
         self.assertRaises(ValueError, decode, value, 'invalid')
 
 
+class TestRegister(unittest.TestCase):
+    def test_immutable(self):
+        register = InverterEquipmentRegister.RatedPower.value
+        with self.assertRaises(AttributeError):
+            register.gain = 10
+        with self.assertRaises(AttributeError):
+            del register.unit
+        with self.assertRaises(AttributeError):
+            register.description = 'Rated power'
+        self.assertEqual(register.gain, 1)
+
+    def test_pickle(self):
+        register = pickle.loads(pickle.dumps(InverterEquipmentRegister.RatedPower.value))
+        self.assertEqual((register.address, register.quantity, register.data_type, register.unit), (30073, 2, DataType.UINT32_BE, 'W'))
+        self.assertIs(pickle.loads(pickle.dumps(BatteryEquipmentRegister.SOC)), BatteryEquipmentRegister.SOC)
+
+    def test_converter(self):
+        for register_enum in (InverterEquipmentRegister, BatteryEquipmentRegister, MeterEquipmentRegister):
+            for register in register_enum:
+                converter = register.value.converter
+                self.assertIs(converter, register.value.converter)
+                raw = bytes(range(1, 2 * register.value.quantity + 1))
+                self.assertEqual(converter.decode(raw), decode(raw, register.value.data_type))
+                self.assertEqual(converter.read(raw), converter.scale(converter.decode(raw)))
+        self.assertEqual(InverterEquipmentRegister.PV1Voltage.value.converter.read(b'\x0f\xa0'), 400.0)
+        self.assertEqual(InverterEquipmentRegister.State1.value.converter.read(b'\x00\x06'), '0000000000000110')
+        self.assertEqual(InverterEquipmentRegister.PV1Voltage.value.converter.format(400.0), '400.0 V')
+        self.assertEqual(InverterEquipmentRegister.DeviceStatus.value.converter.format(0x0200), 'On-grid')
+        self.assertEqual(InverterEquipmentRegister.DeviceStatus.value.converter.format(0xffff), 'undefined')
+        self.assertEqual(InverterEquipmentRegister.Model.value.converter.format('SUN2000'), 'SUN2000')
+
+    def test_register_enums_are_loaded_lazily(self):
+        code = ('import sys\n'
+                'from sun2000_modbus import registers\n'
+                'assert not any(name.endswith("_registers") for name in sys.modules), sys.modules\n'
+                'assert registers.MeterEquipmentRegister.__module__ == "sun2000_modbus.registers"\n'
+                'assert "sun2000_modbus._battery_registers" not in sys.modules\n'
+                'assert "BatteryEquipmentRegister" in dir(registers)\n'
+                'from sun2000_modbus.registers import *\n'
+                'assert InverterEquipmentRegister.Model.value.address == 30000\n'
+                'assert {AccessType, Register, RegisterEnum, BatteryEquipmentRegister, MeterEquipmentRegister}\n')
+        environment = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(registers_module.__file__))))
+        subprocess.run([sys.executable, '-c', code], check=True, env=environment)
+        with self.assertRaises(AttributeError):
+            registers_module.PVRegister
+
+    def test_inverter_loads_register_enums_lazily(self):
+        code = ('import sys\n'
+                'import sun2000_modbus.inverter\n'
+                'loaded = [name for name in sys.modules if name.startswith("sun2000_modbus.")]\n'
+                'assert not any(name.endswith("_registers") for name in loaded), loaded\n'
+                'assert "sun2000_modbus.bitfields" not in loaded, loaded\n'
+                'assert "sun2000_modbus.metadata" not in loaded, loaded\n')
+        environment = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(registers_module.__file__))))
+        subprocess.run([sys.executable, '-c', code], check=True, env=environment)
+
+
+class TestPlan(unittest.TestCase):
+    def test_plan_blocks_merges_adjacent_registers(self):
+        blocks = plan_blocks([InverterEquipmentRegister.RatedPower, InverterEquipmentRegister.ModelID, InverterEquipmentRegister.NumberOfPVStrings])
+        self.assertEqual(len(blocks), 1)
+        self.assertEqual((blocks[0].address, blocks[0].quantity), (30070, 5))
+        self.assertEqual(blocks[0].registers, [InverterEquipmentRegister.ModelID, InverterEquipmentRegister.NumberOfPVStrings, InverterEquipmentRegister.RatedPower])
+        self.assertEqual(blocks[0].offset(InverterEquipmentRegister.RatedPower), 6)
+
+    def test_plan_blocks_splits_on_gap(self):
+        blocks = plan_blocks([InverterEquipmentRegister.ModelID, InverterEquipmentRegister.RatedPower], max_gap=1)
+        self.assertEqual([(block.address, block.quantity) for block in blocks], [(30070, 1), (30073, 2)])
+
+    def test_plan_blocks_respects_max_quantity(self):
+        blocks = plan_blocks(list(InverterEquipmentRegister), max_gap=1000)
+        self.assertTrue(all(block.quantity <= 125 for block in blocks))
+        self.assertEqual(sum(len(block.registers) for block in blocks), len(InverterEquipmentRegister))
+
+    def test_plan_blocks_with_negative_gap(self):
+        with self.assertRaises(ValueError) as cm:
+            plan_blocks([InverterEquipmentRegister.ModelID], max_gap=-1)
+        self.assertEqual(str(cm.exception), 'max_gap must not be negative')
+
+    def test_get_plan_is_cached(self):
+        read_plan = get_plan(InverterEquipmentRegister)
+        self.assertIs(get_plan(InverterEquipmentRegister), read_plan)
+        self.assertIs(get_plan(list(InverterEquipmentRegister)), read_plan)
+        self.assertIsNot(get_plan(InverterEquipmentRegister, max_gap=0), read_plan)
+
+    def test_read_plan_statistics(self):
+        read_plan = ReadPlan([InverterEquipmentRegister.ModelID, InverterEquipmentRegister.RatedPower, InverterEquipmentRegister.State1])
+        self.assertEqual(read_plan.request_count, 2)
+        self.assertEqual(read_plan.register_count, 3)
+        self.assertEqual(read_plan.wasted_registers, 2)
+        self.assertEqual(read_plan.wasted_bytes, 4)
+        self.assertEqual(repr(read_plan), 'ReadPlan(registers=3, requests=2, wasted_bytes=4)')
+
+    def test_read_plan_decode_values_matches_decode(self):
+        for register_enum in [InverterEquipmentRegister, BatteryEquipmentRegister, MeterEquipmentRegister]:
+            read_plan = ReadPlan(register_enum)
+            for index, block in enumerate(read_plan.blocks):
+                raw_block = bytes((address * 7 + 3) % 256 for address in range(block.quantity * 2))
+                for register, value in zip(block.registers, read_plan.decode_values(index, raw_block)):
+                    offset = block.offset(register)
+                    expected = decode(raw_block[offset:offset + register.value.quantity * 2], register.value.data_type)
+                    if register.value.gain is not None and isinstance(expected, int):
+                        expected = expected / register.value.gain
+                    self.assertEqual(value, expected, register)
+
+    def test_block_decoder_with_overlapping_registers(self):
+        class OverlappingRegister(Enum):
+            Power = Register(100, 2, DataType.INT32_BE, 10, 'W', AccessType.RO, None)
+            PowerLow = Register(101, 1, DataType.UINT16_BE, None, None, AccessType.RO, None)
+
+        block = plan_blocks(OverlappingRegister)[0]
+        decoder = BlockDecoder(block)
+        self.assertEqual(decoder.scale(decoder.unpack(b'\xFF\xFF\xD8\x28')), [-1020.0, 55336])
+        self.assertEqual(decoder.read(memoryview(b'\xFF\xFF\xD8\x28')), [-1020.0, 55336])
+
+    def test_read_plan_decode(self):
+        read_plan = ReadPlan([InverterEquipmentRegister.ModelID, InverterEquipmentRegister.RatedPower])
+        decoded = read_plan.decode(0, b'\x01\xAD\x00\x04\x00\x02\x00\x00\x27\x10')
+        self.assertEqual(decoded, {InverterEquipmentRegister.ModelID: 429, InverterEquipmentRegister.RatedPower: 10000})
+
+
+class TestRegisterCache(unittest.TestCase):
+    def test_ttl(self):
+        cache = RegisterCache(default_ttl=5, ttls={InverterEquipmentRegister.ActivePower: 0.5})
+        self.assertEqual(cache.ttl(InverterEquipmentRegister.Model), FOREVER)
+        self.assertEqual(cache.ttl(InverterEquipmentRegister.RatedPower), FOREVER)
+        self.assertEqual(cache.ttl(InverterEquipmentRegister.InputPower), 5)
+        self.assertEqual(cache.ttl(BatteryEquipmentRegister.BackupPowerSOC), 5)
+        self.assertEqual(cache.ttl(InverterEquipmentRegister.ActivePower), 0.5)
+
+    @patch('sun2000_modbus.cache.time.monotonic')
+    def test_expiry(self, mock_monotonic):
+        cache = RegisterCache(default_ttl=1)
+        mock_monotonic.return_value = 100
+        cache.put(InverterEquipmentRegister.InputPower, 1, 1000)
+        cache.put(InverterEquipmentRegister.Model, 1, 'SUN2000')
+        mock_monotonic.return_value = 100.5
+        self.assertEqual(cache.get(InverterEquipmentRegister.InputPower, 1), (True, 1000))
+        self.assertEqual(cache.get(InverterEquipmentRegister.InputPower, 2), (False, None))
+        mock_monotonic.return_value = 101
+        self.assertEqual(cache.get(InverterEquipmentRegister.InputPower, 1), (False, None))
+        self.assertEqual(cache.get(InverterEquipmentRegister.Model, 1), (True, 'SUN2000'))
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_lru_eviction(self):
+        cache = RegisterCache(maxsize=2)
+        cache.put(InverterEquipmentRegister.Model, 1, 'SUN2000')
+        cache.put(InverterEquipmentRegister.SN, 1, '123')
+        cache.get(InverterEquipmentRegister.Model, 1)
+        cache.put(InverterEquipmentRegister.PN, 1, '456')
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(InverterEquipmentRegister.SN, 1), (False, None))
+        self.assertEqual(cache.get(InverterEquipmentRegister.Model, 1), (True, 'SUN2000'))
+
+    def test_invalidate(self):
+        cache = RegisterCache(default_ttl=60)
+        cache.put(BatteryEquipmentRegister.MaximumFeedGridPowerInW, 1, -10200)
+        cache.put(BatteryEquipmentRegister.MaximumFeedGridPowerInW, 2, -10200)
+        cache.put(BatteryEquipmentRegister.BackupPowerSOC, 1, 10)
+        cache.invalidate(BatteryEquipmentRegister.MaximumFeedGridPowerInW, 1)
+        self.assertEqual(len(cache), 2)
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+    def test_shared_between_threads(self):
+        cache = RegisterCache(maxsize=8, default_ttl=60)
+        registers = list(InverterEquipmentRegister)[:32]
+
+        def worker(unit):
+            for _ in range(200):
+                for register in registers:
+                    cache.put(register, unit, 0)
+                    cache.get(register, unit)
+                cache.invalidate(registers[0], unit)
+
+        threads = [threading.Thread(target=worker, args=(unit,)) for unit in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(len(cache), 8)
+        self.assertEqual(cache.hits + cache.misses, 4 * 200 * 32)
+
+
+class TestWriteSuppressor(unittest.TestCase):
+    unit = ('192.168.8.1', 502, 1)
+    other_unit = ('192.168.8.1', 502, 2)
+
+    @patch('sun2000_modbus.suppression.time.monotonic')
+    def test_suppresses(self, mock_monotonic):
+        suppressor = WriteSuppressor(refresh=10)
+        mock_monotonic.return_value = 100
+        self.assertFalse(suppressor.suppresses(InverterEquipmentRegister.FixedActivePowerDeratedInW, self.unit, b'\x00\x64'))
+        suppressor.acknowledge(InverterEquipmentRegister.FixedActivePowerDeratedInW, self.unit, b'\x00\x64')
+        mock_monotonic.return_value = 109
+        self.assertTrue(suppressor.suppresses(InverterEquipmentRegister.FixedActivePowerDeratedInW, self.unit, b'\x00\x64'))
+        self.assertFalse(suppressor.suppresses(InverterEquipmentRegister.FixedActivePowerDeratedInW, self.unit, b'\x00\x65'))
+        self.assertFalse(suppressor.suppresses(InverterEquipmentRegister.FixedActivePowerDeratedInW, self.other_unit, b'\x00\x64'))
+        mock_monotonic.return_value = 110
+        self.assertFalse(suppressor.suppresses(InverterEquipmentRegister.FixedActivePowerDeratedInW, self.unit, b'\x00\x64'))
+        self.assertEqual(suppressor.suppressed, 1)
+
+    def test_invalidate(self):
+        suppressor = WriteSuppressor()
+        suppressor.acknowledge(BatteryEquipmentRegister.MaximumFeedGridPowerInW, self.unit, b'\xff\xff\xd8\x28')
+        suppressor.acknowledge(BatteryEquipmentRegister.MaximumFeedGridPowerInW, self.other_unit, b'\xff\xff\xd8\x28')
+        suppressor.acknowledge(BatteryEquipmentRegister.BackupPowerSOC, self.unit, b'\x00\x64')
+        suppressor.acknowledge(BatteryEquipmentRegister.BackupPowerSOC, ('192.168.9.1', 502, 1), b'\x00\x64')
+        suppressor.invalidate(BatteryEquipmentRegister.MaximumFeedGridPowerInW, self.unit)
+        self.assertEqual(len(suppressor), 3)
+        suppressor.invalidate(unit=('192.168.8.1', 502))
+        self.assertEqual(len(suppressor), 1)
+        suppressor.invalidate()
+        self.assertEqual(len(suppressor), 0)
+        with self.assertRaises(ValueError) as context:
+            WriteSuppressor(refresh=0)
+        self.assertEqual(str(context.exception), 'refresh must be greater than 0')
+
+    def test_shared_between_threads(self):
+        suppressor = WriteSuppressor()
+        registers = list(InverterEquipmentRegister)[:16]
+        errors = []
+
+        def worker(device_id):
+            unit = ('192.168.8.1', 502, device_id)
+            try:
+                for _ in range(200):
+                    for register in registers:
+                        suppressor.acknowledge(register, unit, b'\x00\x64')
+                        suppressor.suppresses(register, unit, b'\x00\x64')
+                    suppressor.invalidate(unit=('192.168.8.1', 502))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(device_id,)) for device_id in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(suppressor), 0)
+
+
+class TestBitfields(unittest.TestCase):
+    def test_decode_flags(self):
+        self.assertEqual(bitfields.decode_flags(InverterEquipmentRegister.State1, '0000000000000110'), bitfields.State1.GRID_CONNECTED | bitfields.State1.GRID_CONNECTED_NORMALLY)
+        self.assertEqual(bitfields.decode_flags(InverterEquipmentRegister.Alarm1, 0x0180), bitfields.Alarm1.GRID_LOSS | bitfields.Alarm1.GRID_UNDERVOLTAGE)
+
+    def test_active_flags(self):
+        flags = bitfields.Alarm2(0x8011)
+        self.assertEqual(bitfields.active_flags(flags), (bitfields.Alarm2.ABNORMAL_RESIDUAL_CURRENT, bitfields.Alarm2.DEVICE_FAULT, bitfields.Alarm2.ABNORMAL_PV_MODULE_CONFIGURATION))
+        self.assertEqual(bitfields.active_flags(bitfields.Alarm2(0)), ())
+
+    def test_active_flags_ignores_undefined_bits(self):
+        self.assertEqual(bitfields.active_flags(bitfields.State2(0xFF01)), (bitfields.State2.UNLOCKED,))
+
+    def test_edge_detector(self):
+        detector = bitfields.EdgeDetector()
+        raised, cleared = detector.update(InverterEquipmentRegister.State1, '0000000000000110')
+        self.assertEqual((raised, cleared), (bitfields.State1(6), bitfields.State1(0)))
+        raised, cleared = detector.update(InverterEquipmentRegister.State1, 0x0042)
+        self.assertEqual(raised, bitfields.State1.STOP_DUE_TO_FAULTS)
+        self.assertEqual(cleared, bitfields.State1.GRID_CONNECTED_NORMALLY)
+        raised, cleared = detector.update(InverterEquipmentRegister.State1, 0x0042, unit=2)
+        self.assertEqual(raised, bitfields.State1(0x0042))
+        detector.reset()
+        self.assertEqual(detector.update(InverterEquipmentRegister.State1, 0x0042)[0], bitfields.State1(0x0042))
+
+    def test_edge_detector_with_several_hosts(self):
+        detector = bitfields.EdgeDetector()
+        first, second = ('192.168.8.1', 502, 0), ('192.168.9.1', 502, 0)
+        detector.update(InverterEquipmentRegister.Alarm1, 0x0001, first)
+        self.assertEqual(detector.update(InverterEquipmentRegister.Alarm1, 0x0000, second), (bitfields.Alarm1(0), bitfields.Alarm1(0)))
+        self.assertEqual(detector.update(InverterEquipmentRegister.Alarm1, 0x0001, first), (bitfields.Alarm1(0), bitfields.Alarm1(0)))
+        self.assertEqual(detector.update(InverterEquipmentRegister.Alarm1, 0x0001, second)[0], bitfields.Alarm1(1))
+        detector.reset(('192.168.8.1', 502))
+        self.assertEqual(detector.update(InverterEquipmentRegister.Alarm1, 0x0001, first)[0], bitfields.Alarm1(1))
+        self.assertEqual(detector.update(InverterEquipmentRegister.Alarm1, 0x0001, second)[0], bitfields.Alarm1(0))
+
+
+class TestSchedule(unittest.TestCase):
+    def test_advance_without_overrun(self):
+        schedule = Schedule(1, start=100)
+        self.assertEqual(schedule.advance(100), (100, 0))
+        self.assertEqual(schedule.advance(100.4), (101, 0))
+        self.assertEqual(schedule.advance(101.9), (102, 0))
+
+    def test_advance_with_skip(self):
+        schedule = Schedule(1, overrun=SKIP, start=100)
+        schedule.advance(100)
+        self.assertEqual(schedule.advance(102.5), (103, 2))
+        self.assertEqual(schedule.advance(103.2), (104, 0))
+        self.assertEqual(schedule.missed_total, 2)
+
+    def test_advance_with_coalesce(self):
+        schedule = Schedule(1, overrun=COALESCE, start=100)
+        schedule.advance(100)
+        self.assertEqual(schedule.advance(102.5), (102, 1))
+        self.assertEqual(schedule.advance(102.6), (103, 0))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError) as cm:
+            Schedule(0)
+        self.assertEqual(str(cm.exception), 'interval must be greater than 0')
+        with self.assertRaises(ValueError) as cm:
+            Schedule(1, overrun='drop')
+        self.assertEqual(str(cm.exception), "overrun must be either 'skip' or 'coalesce'")
+
+
+class TestDeltaFilter(unittest.TestCase):
+    def test_deadband_defaults_to_resolution(self):
+        delta_filter = DeltaFilter(deadbands={InverterEquipmentRegister.InputPower: 50}, steps=2)
+        self.assertEqual(delta_filter.deadband(InverterEquipmentRegister.PV1Voltage), 0.2)
+        self.assertEqual(delta_filter.deadband(InverterEquipmentRegister.DeviceStatus), 2)
+        self.assertEqual(delta_filter.deadband(InverterEquipmentRegister.InputPower), 50)
+
+    def test_filter(self):
+        delta_filter = DeltaFilter(deadbands={InverterEquipmentRegister.InputPower: 50}, heartbeat=60)
+        first = delta_filter.filter({InverterEquipmentRegister.InputPower: 1000.0, InverterEquipmentRegister.PV1Voltage: 350.5, InverterEquipmentRegister.State1: '0000000000000110'}, 0)
+        self.assertTrue(first.full)
+        self.assertEqual(len(first.values), 3)
+
+        second = delta_filter.filter({InverterEquipmentRegister.InputPower: 1040.0, InverterEquipmentRegister.PV1Voltage: 350.6, InverterEquipmentRegister.State1: '0000000000000110'}, 1)
+        self.assertFalse(second.full)
+        self.assertEqual(second.values, {InverterEquipmentRegister.PV1Voltage: 350.6})
+
+        third = delta_filter.filter({InverterEquipmentRegister.InputPower: 1050.0, InverterEquipmentRegister.PV1Voltage: 350.6, InverterEquipmentRegister.State1: '0000000001000000'}, 2)
+        self.assertEqual(third.values, {InverterEquipmentRegister.InputPower: 1050.0, InverterEquipmentRegister.State1: '0000000001000000'})
+
+        self.assertFalse(delta_filter.filter({InverterEquipmentRegister.InputPower: 1050.0}, 3))
+        self.assertEqual((delta_filter.emitted, delta_filter.suppressed), (6, 4))
+        self.assertTrue(delta_filter.filter({InverterEquipmentRegister.InputPower: 1050.0}, 60).full)
+
+    def test_filter_with_relative_deadband(self):
+        delta_filter = DeltaFilter(relative=0.05, heartbeat=None)
+        delta_filter.filter({MeterEquipmentRegister.ActivePower: 5000.0})
+        self.assertFalse(delta_filter.filter({MeterEquipmentRegister.ActivePower: 5001.0}))
+        self.assertFalse(delta_filter.filter({MeterEquipmentRegister.ActivePower: 5249.0}))
+        self.assertTrue(delta_filter.filter({MeterEquipmentRegister.ActivePower: 5250.0}))
+        self.assertFalse(delta_filter.filter({MeterEquipmentRegister.ActivePower: 5250.0}))
+
+    def test_filter_with_relative_and_absolute_deadband(self):
+        delta_filter = DeltaFilter(deadbands={MeterEquipmentRegister.ActivePower: 100}, relative=0.05, heartbeat=None)
+        delta_filter.filter({MeterEquipmentRegister.ActivePower: 20.0})
+        self.assertFalse(delta_filter.filter({MeterEquipmentRegister.ActivePower: 90.0}))
+        self.assertTrue(delta_filter.filter({MeterEquipmentRegister.ActivePower: 120.0}))
+
+
+class TestInstrumentation(unittest.TestCase):
+    def transaction(self, address=32016, duration=0.02, outcome=instrumentation.OK, device_id=1):
+        return instrumentation.Transaction(instrumentation.READ, '192.168.8.1', 502, device_id, address, 2, 4, duration, outcome)
+
+    def test_outcome(self):
+        self.assertEqual(instrumentation.outcome(MagicMock(), None), instrumentation.OK)
+        self.assertEqual(instrumentation.outcome(None, ConnectionException()), instrumentation.CONNECTION_ERROR)
+        self.assertEqual(instrumentation.outcome(ExceptionResponse(3, 2), ModbusIOException()), instrumentation.EXCEPTION_RESPONSE)
+        self.assertEqual(instrumentation.outcome(ModbusIOException(), ModbusIOException()), instrumentation.NO_RESPONSE)
+        self.assertEqual(instrumentation.outcome(None, ValueError()), instrumentation.ERROR)
+
+    def test_histogram(self):
+        histogram = instrumentation.Histogram((0.1, 1))
+        for value in [0.05, 0.1, 0.5, 2]:
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.mean, 0.6625)
+        self.assertEqual(histogram.quantile(0.5), 0.1)
+        self.assertEqual(histogram.quantile(0.75), 1)
+        self.assertEqual(histogram.quantile(1), float('inf'))
+        self.assertEqual(instrumentation.Histogram().quantile(0.5), 0.0)
+
+    def test_metrics(self):
+        metrics = instrumentation.TransactionMetrics()
+        metrics(self.transaction())
+        metrics(self.transaction(address=32064, duration=0.4))
+        metrics(self.transaction(address=32064, outcome=instrumentation.NO_RESPONSE, duration=5))
+        metrics(self.transaction(device_id=2))
+        device = metrics.devices[('192.168.8.1', 502, 1)]
+        self.assertEqual(device.transactions, 3)
+        self.assertEqual(device.bytes, 12)
+        self.assertEqual(device.errors, 1)
+        self.assertAlmostEqual(device.error_rate, 1 / 3)
+        self.assertEqual(len(metrics.blocks), 3)
+        slowest, stats = metrics.slowest(1)[0]
+        self.assertEqual(slowest, ('192.168.8.1', 502, 1, instrumentation.READ, 32064, 2))
+        self.assertEqual(stats.outcomes, {instrumentation.OK: 1, instrumentation.NO_RESPONSE: 1})
+        self.assertEqual([block for block, _ in metrics.flakiest()], [slowest])
+        metrics.reset()
+        self.assertEqual(metrics.devices, {})
+
+
+class TestPacer(unittest.TestCase):
+    def test_reserve(self):
+        pacer = Pacer(max_rate=10)
+        self.assertEqual(pacer.reserve(100), 0)
+        self.assertAlmostEqual(pacer.reserve(100), 0.1)
+        self.assertAlmostEqual(pacer.reserve(100.05), 0.15)
+        self.assertEqual(pacer.reserve(200), 0)
+        self.assertEqual(pacer.requests, 4)
+        self.assertAlmostEqual(pacer.delayed, 0.25)
+
+    def test_observe(self):
+        pacer = Pacer(min_gap=0.05, max_gap=1, step=0.01, factor=2, slow=0.5)
+        pacer.observe(0.1, instrumentation.NO_RESPONSE)
+        self.assertAlmostEqual(pacer.gap, 0.1)
+        pacer.observe(0.6)
+        self.assertAlmostEqual(pacer.gap, 0.2)
+        pacer.observe(0.1, instrumentation.CONNECTION_ERROR)
+        pacer.observe(0.1, instrumentation.CONNECTION_ERROR)
+        pacer.observe(0.1, instrumentation.CONNECTION_ERROR)
+        self.assertEqual(pacer.gap, 1)
+        self.assertEqual(pacer.congestions, 5)
+        pacer.observe(0.1, instrumentation.EXCEPTION_RESPONSE)
+        pacer.observe(0.1)
+        self.assertAlmostEqual(pacer.gap, 0.98)
+        for _ in range(100):
+            pacer.observe(0.1)
+        self.assertEqual(pacer.gap, 0.05)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError) as context:
+            Pacer(max_rate=0)
+        self.assertEqual(str(context.exception), 'max_rate must be greater than 0')
+        with self.assertRaises(ValueError) as context:
+            Pacer(factor=1)
+        self.assertEqual(str(context.exception), 'factor must be greater than 1')
+
+    def test_for_host(self):
+        pacer = pacing.for_host('192.168.100.1', max_rate=5)
+        self.assertIs(pacing.for_host('192.168.100.1'), pacer)
+        self.assertIsNot(pacing.for_host('192.168.100.1', 6607), pacer)
+        self.assertAlmostEqual(pacer.min_gap, 0.2)
+
+
+class TestResilience(unittest.TestCase):
+    def test_retry_delays(self):
+        retry = RetryPolicy(attempts=4, backoff=0.5, max_backoff=1.5, jitter=0)
+        self.assertEqual(list(retry.delays()), [0.5, 1.0, 1.5])
+        self.assertEqual(retry.retries, 3)
+        retry = RetryPolicy(attempts=3, backoff=1, jitter=0.5, seed=1)
+        for delay, bound in zip(retry.delays(), [1, 2]):
+            self.assertTrue(bound / 2 <= delay <= bound)
+        self.assertEqual(list(RetryPolicy(attempts=1).delays()), [])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError) as context:
+            RetryPolicy(attempts=0)
+        self.assertEqual(str(context.exception), 'attempts must be at least 1')
+        with self.assertRaises(ValueError) as context:
+            RetryPolicy(jitter=2)
+        self.assertEqual(str(context.exception), 'jitter must be between 0 and 1')
+        with self.assertRaises(ValueError) as context:
+            CircuitBreaker(threshold=0)
+        self.assertEqual(str(context.exception), 'threshold must be at least 1')
+
+    def test_circuit_breaker_release(self):
+        breaker = CircuitBreaker(threshold=1, recovery=10)
+        key = ('192.168.8.1', 502, 1)
+        breaker.record(key, False, now=0)
+        breaker.check(key, now=10)
+        with self.assertRaises(CircuitOpenError):
+            breaker.check(key, now=10)
+        breaker.release(key)
+        breaker.check(key, now=10)
+        self.assertEqual(breaker.state(key, now=10), resilience.HALF_OPEN)
+
+    def test_circuit_breaker(self):
+        breaker = CircuitBreaker(threshold=2, recovery=60)
+        key = ('192.168.8.1', 502, 1)
+        breaker.check(key, now=0)
+        breaker.record(key, False, now=0)
+        self.assertEqual(breaker.state(key, now=0), resilience.CLOSED)
+        breaker.record(key, False, now=1)
+        self.assertEqual(breaker.state(key, now=1), resilience.OPEN)
+        self.assertTrue(breaker.is_open(key, now=30))
+        with self.assertRaises(CircuitOpenError) as context:
+            breaker.check(key, now=30)
+        self.assertEqual(str(context.exception), 'Modbus Error: [Connection] Circuit of 192.168.8.1:502 device 1 is open')
+        self.assertEqual(breaker.rejected, 1)
+
+        self.assertEqual(breaker.state(key, now=61), resilience.HALF_OPEN)
+        self.assertFalse(breaker.is_open(key, now=61))
+        breaker.check(key, now=61)
+        self.assertTrue(breaker.is_open(key, now=62))
+        with self.assertRaises(CircuitOpenError):
+            breaker.check(key, now=62)
+        breaker.record(key, False, now=65)
+        self.assertEqual(breaker.state(key, now=100), resilience.OPEN)
+        self.assertEqual(breaker.open_circuits(now=100), [key])
+
+        breaker.check(key, now=125)
+        breaker.record(key, True, now=126)
+        self.assertEqual(breaker.state(key, now=126), resilience.CLOSED)
+        self.assertEqual(breaker.open_circuits(now=126), [])
+
+
+class TestCapabilities(unittest.TestCase):
+    def setUp(self) -> None:
+        self.capabilities = Capabilities(428, 4, 2, ['meter', '4g'])
+
+    def test_unsupported(self):
+        self.assertEqual(self.capabilities.unsupported_groups, ('4g', 'meter'))
+        self.assertTrue(self.capabilities.supports(InverterEquipmentRegister.PV4Current))
+        self.assertFalse(self.capabilities.supports(InverterEquipmentRegister.PV5Voltage))
+        self.assertFalse(self.capabilities.supports(InverterEquipmentRegister.IMEI4G))
+        self.assertFalse(self.capabilities.supports(MeterEquipmentRegister.ActivePower))
+        self.assertFalse(self.capabilities.supports(InverterEquipmentRegister.PowerMeterCollectionActivePower))
+        self.assertTrue(self.capabilities.supports(BatteryEquipmentRegister.SOC))
+        self.assertEqual(len(self.capabilities.prune(InverterEquipmentRegister)), len(InverterEquipmentRegister) - 40 - 8)
+        self.assertEqual(Capabilities(428).unsupported, frozenset())
+
+    def test_prune_plan(self):
+        read_plan = get_plan([InverterEquipmentRegister.PV1Voltage, InverterEquipmentRegister.PV5Voltage, InverterEquipmentRegister.InputPower,
+                              MeterEquipmentRegister.MeterStatus])
+        pruned, positions = self.capabilities.prune_plan(read_plan)
+        self.assertEqual(pruned.registers, (InverterEquipmentRegister.PV1Voltage, InverterEquipmentRegister.InputPower))
+        self.assertEqual(positions, ((0,), (2,)))
+        self.assertIs(self.capabilities.prune_plan(read_plan)[0], pruned)
+
+    def test_as_dict(self):
+        data = self.capabilities.as_dict()
+        self.assertEqual(data, {'model_id': 428, 'pv_strings': 4, 'mppt_trackers': 2, 'unsupported_groups': ['4g', 'meter']})
+        self.assertEqual(Capabilities.from_dict(data), self.capabilities)
+
+
+class TestMetadataStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'metadata.json')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_save_and_load(self):
+        store = MetadataStore(self.path)
+        self.assertEqual(len(store), 0)
+        values = {InverterEquipmentRegister.Model: 'SUN2000-10KTL-M1', InverterEquipmentRegister.RatedPower: 10000}
+        store.put(DeviceRecord('SN1', 'V100R001C00SPC100', values, Capabilities(428, 2, 2, ['meter']), updated=1700000000))
+        store.put(DeviceRecord('SN2', 'V100R001C00SPC100', {}))
+        store.save()
+
+        store = MetadataStore(self.path)
+        self.assertEqual(len(store), 2)
+        self.assertIsNone(store.get('SN1', 'V100R001C00SPC200'))
+        self.assertIsNone(store.get('SN3', 'V100R001C00SPC100'))
+        record = store.get('SN1', 'V100R001C00SPC100')
+        self.assertEqual(record.values, values)
+        self.assertEqual(record.capabilities, Capabilities(428, 2, 2, ['meter']))
+        self.assertEqual(record.updated, 1700000000)
+        self.assertIsNone(store.get('SN2', 'V100R001C00SPC100').capabilities)
+
+    def test_unreadable_file(self):
+        with open(self.path, 'w') as file:
+            file.write('{"version": 1, "devices": {"SN1": {}}}')
+        self.assertEqual(len(MetadataStore(self.path)), 0)
+        with open(self.path, 'w') as file:
+            file.write('{"version": 0, "devices": {}}')
+        self.assertEqual(len(MetadataStore(self.path)), 0)
+
+    def test_static_registers(self):
+        self.assertIn(InverterEquipmentRegister.Model, STATIC_REGISTERS)
+        self.assertIn(InverterEquipmentRegister.RatedPower, STATIC_REGISTERS)
+        self.assertNotIn(InverterEquipmentRegister.State1, STATIC_REGISTERS)
+
+
 class TestSun2000(unittest.TestCase):
     def setUp(self) -> None:
         self.test_inverter = Sun2000(host='192.168.8.1', port=123, timeout=3, wait=0, device_id=1)
@@ -109,6 +723,67 @@ class TestSun2000(unittest.TestCase):
         self.test_inverter.connect()
         self.assertFalse(self.test_inverter.isConnected())
 
+    @patch(
+        'sun2000_modbus.inverter.time.sleep'
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.read_holding_registers'
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', side_effect=[False, True, True, True, True]
+    )
+    def test_connect_with_probe(self, _, mock_read_holding_registers, mock_sleep):
+        mock_read_holding_registers.side_effect = [ModbusIOException('Requested device is not available'), ModbusIOException('Requested device is not available'), sun2000mock.MockedResponse(30070, 1)]
+        self.test_inverter.wait = 2
+        self.assertTrue(self.test_inverter.connect(probe=True))
+        self.assertEqual(mock_read_holding_registers.call_count, 3)
+        mock_read_holding_registers.assert_called_with(address=30070, count=1, device_id=1)
+        self.assertEqual(mock_sleep.call_args_list, [call(0.1), call(0.2)])
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.read_holding_registers', side_effect=sun2000mock.mock_read_holding_registers_ModbusIOException, autospec=True
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', side_effect=[False] + [True] * 10
+    )
+    def test_connect_with_probe_gives_up_after_wait(self, _, mock_read_holding_registers):
+        self.test_inverter.wait = 0.25
+        self.assertTrue(self.test_inverter.connect(probe=True))
+        self.assertIn(mock_read_holding_registers.call_count, [3, 4])
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.close'
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.read_holding_registers', sun2000mock.mock_read_holding_registers
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', sun2000mock.connect_success
+    )
+    def test_session(self, mock_close):
+        with self.test_inverter.session() as session:
+            self.assertEqual(session.read(InverterEquipmentRegister.ModelID), 429)
+            mock_close.assert_not_called()
+        mock_close.assert_called_once()
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_fail
+    )
+    def test_session_with_connection_failure(self):
+        with self.assertRaises(ConnectionException) as cm:
+            with self.test_inverter.session():
+                pass
+        self.assertEqual(str(cm.exception), 'Modbus Error: [Connection] Connection to inverter failed')
+
     @patch(
         'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_fail
     )
@@ -674,3 +1349,868 @@ class TestSun2000(unittest.TestCase):
         with self.assertRaises(ValueError) as cm:
             self.test_inverter.write(InverterEquipmentRegister.CosPhiPPnCharacteristicCurve, b'\x01\x02\x03')
         self.assertEqual(str(cm.exception), 'Multidata value length must be a multiple of 2')
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.write_registers'
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', sun2000mock.connect_success
+    )
+    def test_write_many(self, write_registers_mock):
+        self.test_inverter.connect()
+        self.test_inverter.write_many({
+            BatteryEquipmentRegister.MaximumChargingPower: 5000,
+            BatteryEquipmentRegister.MaximumDischargingPower: 4000,
+            BatteryEquipmentRegister.ChargingCutoffCapacity: 1000,
+            BatteryEquipmentRegister.DischargeCutoffCapacity: 100,
+            BatteryEquipmentRegister.BackupPowerSOC: 200,
+        })
+        self.assertEqual(write_registers_mock.call_args_list, [
+            call(address=47075, values=[0, 5000, 0, 4000], device_id=1),
+            call(address=47081, values=[1000, 100], device_id=1),
+            call(address=47102, values=[200], device_id=1),
+        ])
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.write_registers'
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', sun2000mock.connect_success
+    )
+    def test_write_many_validates_before_writing(self, write_registers_mock):
+        self.test_inverter.connect()
+        with self.assertRaises(ValueError) as cm:
+            self.test_inverter.write_many({BatteryEquipmentRegister.BackupPowerSOC: 200, BatteryEquipmentRegister.RunningStatus: 1})
+        self.assertEqual(str(cm.exception), 'Register is not writeable')
+        with self.assertRaises(ValueError) as cm:
+            self.test_inverter.write_many({InverterEquipmentRegister.CosPhiPPnCharacteristicCurve: b'\x01\x02'})
+        self.assertEqual(str(cm.exception), 'Value of CosPhiPPnCharacteristicCurve must be 42 bytes long')
+        write_registers_mock.assert_not_called()
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.write_registers'
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open'
+    )
+    def test_write_suppression(self, is_socket_open_mock, write_registers_mock):
+        is_socket_open_mock.return_value = True
+        self.test_inverter.suppressor = WriteSuppressor()
+        for value in [-10200, -10200, -9000, -9000]:
+            self.test_inverter.write(BatteryEquipmentRegister.MaximumFeedGridPowerInW, value)
+        self.assertEqual(write_registers_mock.call_count, 2)
+        self.assertEqual(self.test_inverter.suppressor.suppressed, 2)
+
+        write_registers_mock.side_effect = ModbusIOException()
+        with self.assertRaises(ModbusIOException):
+            self.test_inverter.write(BatteryEquipmentRegister.MaximumFeedGridPowerInW, -10200)
+        write_registers_mock.side_effect = None
+        self.test_inverter.write(BatteryEquipmentRegister.MaximumFeedGridPowerInW, -9000)
+        self.assertEqual(write_registers_mock.call_count, 4)
+        self.assertEqual(len(self.test_inverter.suppressor), 1)
+
+        with patch('pymodbus.client.ModbusTcpClient.read_holding_registers', side_effect=ConnectionException()):
+            with self.assertRaises(ConnectionException):
+                self.test_inverter.read(InverterEquipmentRegister.ActivePower)
+        self.assertEqual(len(self.test_inverter.suppressor), 0)
+        self.test_inverter.write(BatteryEquipmentRegister.MaximumFeedGridPowerInW, -9000)
+        self.assertEqual(write_registers_mock.call_count, 5)
+        is_socket_open_mock.return_value = False
+        self.test_inverter.connect()
+        self.assertEqual(len(self.test_inverter.suppressor), 0)
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.read_holding_registers', side_effect=sun2000mock.mock_read_holding_registers_block, autospec=True
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', sun2000mock.connect_success
+    )
+    def test_read_many(self, mock_read_holding_registers):
+        self.test_inverter.connect()
+        result = self.test_inverter.read_many([
+            InverterEquipmentRegister.RatedPower,
+            InverterEquipmentRegister.ModelID,
+            InverterEquipmentRegister.PV1Voltage,
+            InverterEquipmentRegister.PV1Current,
+            InverterEquipmentRegister.State1,
+        ], max_gap=20)
+        self.assertEqual(result, {
+            InverterEquipmentRegister.RatedPower: 10000.0,
+            InverterEquipmentRegister.ModelID: 429,
+            InverterEquipmentRegister.PV1Voltage: 350.5,
+            InverterEquipmentRegister.PV1Current: -1.5,
+            InverterEquipmentRegister.State1: '0000000000000110',
+        })
+        self.assertEqual(mock_read_holding_registers.call_count, 2)
+        self.assertEqual(mock_read_holding_registers.call_args_list[0].kwargs, {'address': 30070, 'count': 5, 'device_id': 1})
+        self.assertEqual(mock_read_holding_registers.call_args_list[1].kwargs, {'address': 32000, 'count': 18, 'device_id': 1})
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.read_holding_registers', side_effect=sun2000mock.mock_read_holding_registers_block, autospec=True
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', sun2000mock.connect_success
+    )
+    def test_read_many_with_max_gap_0(self, mock_read_holding_registers):
+        self.test_inverter.connect()
+        self.test_inverter.read_many([InverterEquipmentRegister.ModelID, InverterEquipmentRegister.RatedPower], max_gap=0, device_id=123)
+        self.assertEqual(mock_read_holding_registers.call_count, 2)
+        self.assertEqual(mock_read_holding_registers.call_args_list[1].kwargs, {'address': 30073, 'count': 2, 'device_id': 123})
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.read_holding_registers', side_effect=sun2000mock.mock_read_holding_registers_block, autospec=True
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', sun2000mock.connect_success
+    )
+    def test_read_many_with_plan(self, mock_read_holding_registers):
+        self.test_inverter.connect()
+        result = self.test_inverter.read_many(get_plan([MeterEquipmentRegister.ActivePower]))
+        self.assertEqual(result, {MeterEquipmentRegister.ActivePower: 1000.0})
+        mock_read_holding_registers.assert_called_once()
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.write_registers'
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.read_holding_registers', side_effect=sun2000mock.mock_read_holding_registers, autospec=True
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', sun2000mock.connect_success
+    )
+    def test_read_with_cache(self, mock_read_holding_registers, _):
+        self.test_inverter.cache = RegisterCache(default_ttl=60)
+        self.test_inverter.connect()
+        self.assertEqual(self.test_inverter.read(InverterEquipmentRegister.RatedPower), 10000.0)
+        self.assertEqual(self.test_inverter.read_formatted(InverterEquipmentRegister.RatedPower), '10000.0 W')
+        self.assertEqual(mock_read_holding_registers.call_count, 1)
+        self.test_inverter.read(InverterEquipmentRegister.RatedPower, device_id=2)
+        self.assertEqual(mock_read_holding_registers.call_count, 2)
+
+        unit = ('192.168.8.1', 123, 1)
+        self.test_inverter.cache.put(BatteryEquipmentRegister.BackupPowerSOC, unit, 20)
+        self.test_inverter.write(BatteryEquipmentRegister.BackupPowerSOC, 10)
+        self.assertEqual(self.test_inverter.cache.get(BatteryEquipmentRegister.BackupPowerSOC, unit), (False, None))
+
+        other_inverter = Sun2000(host='192.168.9.1', port=123, timeout=3, wait=0, device_id=1, cache=self.test_inverter.cache)
+        other_inverter.connect()
+        self.assertEqual(other_inverter.read(InverterEquipmentRegister.RatedPower), 10000.0)
+        self.assertEqual(mock_read_holding_registers.call_count, 3)
+        self.assertEqual(len(self.test_inverter.cache), 3)
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.read_holding_registers', autospec=True
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', sun2000mock.connect_success
+    )
+    def test_read_snapshot(self, mock_read_holding_registers):
+        def read_holding_registers(self, address, count, device_id):
+            if address == 32000:
+                return ModbusIOException('Requested device is not available')
+            return sun2000mock.MockedBlockResponse(address, count)
+
+        mock_read_holding_registers.side_effect = read_holding_registers
+        self.test_inverter.connect()
+        result = self.test_inverter.read_snapshot([InverterEquipmentRegister.ModelID, InverterEquipmentRegister.RatedPower, InverterEquipmentRegister.State1])
+        self.assertEqual(len(result), 3)
+        self.assertFalse(result.complete)
+        self.assertEqual(result[InverterEquipmentRegister.RatedPower], 10000.0)
+        self.assertTrue(result.is_valid(InverterEquipmentRegister.ModelID))
+        self.assertFalse(result.is_valid(InverterEquipmentRegister.State1))
+        self.assertEqual(result.get(InverterEquipmentRegister.State1, 'n/a'), 'n/a')
+        self.assertEqual(result.as_dict(), {InverterEquipmentRegister.ModelID: 429, InverterEquipmentRegister.RatedPower: 10000.0})
+        self.assertEqual(list(result), [InverterEquipmentRegister.ModelID, InverterEquipmentRegister.RatedPower, InverterEquipmentRegister.State1])
+
+        restored = pickle.loads(pickle.dumps(result))
+        self.assertIs(restored.plan, result.plan)
+        self.assertEqual(restored.as_dict(), result.as_dict())
+        self.assertEqual(restored.timestamp, result.timestamp)
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.read_holding_registers', sun2000mock.mock_read_holding_registers
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', sun2000mock.connect_success
+    )
+    def test_read_reuses_buffer(self):
+        self.test_inverter.connect()
+        self.assertEqual(self.test_inverter.read_raw_value(InverterEquipmentRegister.Model), 'SUN2000')
+        buffer = self.test_inverter._local.buffer
+        self.assertEqual(self.test_inverter.read_raw_value(InverterEquipmentRegister.RatedPower), 10000)
+        self.assertIs(self.test_inverter._local.buffer, buffer)
+        self.assertEqual(buffer[:4], b'\x00\x00\x27\x10')
+
+    def test_unpack_buffer_per_thread(self):
+        response = sun2000mock.MockedResponse(30073, 2)
+        views = []
+        thread = threading.Thread(target=lambda: views.append(self.test_inverter._unpack(response)))
+        thread.start()
+        thread.join()
+        views.append(self.test_inverter._unpack(response))
+        self.assertIsNot(views[0].obj, views[1].obj)
+        self.assertEqual(bytes(views[0]), bytes(views[1]))
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.read_holding_registers', sun2000mock.mock_read_holding_registers
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', sun2000mock.connect_success
+    )
+    def test_read_flags(self):
+        self.test_inverter.connect()
+        result = self.test_inverter.read_flags(InverterEquipmentRegister.State1)
+        self.assertIsInstance(result, bitfields.State1)
+        self.assertEqual(bitfields.active_flags(result), (bitfields.State1.GRID_CONNECTED, bitfields.State1.GRID_CONNECTED_NORMALLY))
+        with self.assertRaises(ValueError) as cm:
+            self.test_inverter.read_flags(InverterEquipmentRegister.ModelID)
+        self.assertEqual(str(cm.exception), 'Register is not a supported bitfield')
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.read_holding_registers', sun2000mock.mock_read_holding_registers_block
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', sun2000mock.connect_success
+    )
+    def test_stream(self):
+        self.test_inverter.connect()
+        clock = [100.0]
+
+        def sleep(delay):
+            clock[0] += delay
+
+        with patch('sun2000_modbus.sampling.time.monotonic', side_effect=lambda: clock[0]), patch('sun2000_modbus.sampling.time.sleep', side_effect=sleep):
+            samples = self.test_inverter.stream([MeterEquipmentRegister.ActivePower], 0.02)
+            first = next(samples)
+            second = next(samples)
+            third = next(samples)
+        self.assertEqual(first.snapshot[MeterEquipmentRegister.ActivePower], 1000.0)
+        self.assertAlmostEqual(second.scheduled - first.scheduled, 0.02)
+        self.assertAlmostEqual(third.scheduled - first.scheduled, 0.04)
+        self.assertEqual(third.missed, 0)
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_fail
+    )
+    def test_read_many_from_disconnected_unit(self):
+        self.test_inverter.connect()
+        with self.assertRaises(ValueError) as cm:
+            self.test_inverter.read_many([InverterEquipmentRegister.ModelID])
+        self.assertEqual(str(cm.exception), 'Inverter is not connected')
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.read_holding_registers', sun2000mock.mock_read_holding_registers_block
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', sun2000mock.connect_success
+    )
+    def test_hooks(self):
+        transactions = []
+        self.test_inverter.hooks.append(transactions.append)
+        self.test_inverter.connect()
+        self.test_inverter.read(InverterEquipmentRegister.RatedPower)
+        self.assertEqual(len(transactions), 1)
+        transaction = transactions[0]
+        self.assertEqual((transaction.kind, transaction.host, transaction.port, transaction.device_id), (instrumentation.READ, '192.168.8.1', 123, 1))
+        self.assertEqual((transaction.address, transaction.quantity, transaction.bytes), (30073, 2, 4))
+        self.assertEqual(transaction.outcome, instrumentation.OK)
+        self.assertGreaterEqual(transaction.duration, 0)
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.read_holding_registers', sun2000mock.mock_read_holding_registers_ModbusIOException
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.write_registers', sun2000mock.mock_write_registers_ConnectionException
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', sun2000mock.connect_success
+    )
+    def test_hooks_on_failure(self):
+        metrics = instrumentation.TransactionMetrics()
+        self.test_inverter.hooks.extend([MagicMock(side_effect=RuntimeError), metrics])
+        self.test_inverter.connect()
+        with self.assertRaises(ModbusIOException):
+            self.test_inverter.read(InverterEquipmentRegister.RatedPower, device_id=2)
+        with self.assertRaises(ConnectionException):
+            self.test_inverter.write(InverterEquipmentRegister.ActivePowerPercentageDerating, 1000)
+        self.assertEqual(metrics.devices[('192.168.8.1', 123, 2)].outcomes, {instrumentation.NO_RESPONSE: 1})
+        self.assertEqual(metrics.devices[('192.168.8.1', 123, 1)].outcomes, {instrumentation.CONNECTION_ERROR: 1})
+        self.assertEqual(metrics.devices[('192.168.8.1', 123, 1)].bytes, 0)
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.read_holding_registers', sun2000mock.mock_read_holding_registers
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.write_registers', sun2000mock.mock_write_registers_ModbusIOException
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', sun2000mock.connect_success
+    )
+    @patch('time.sleep')
+    def test_pacer(self, sleep):
+        self.test_inverter.pacer = Pacer(min_gap=0.5, step=0.1, factor=2)
+        self.test_inverter.connect()
+        sleep.reset_mock()
+        self.test_inverter.read(InverterEquipmentRegister.RatedPower)
+        self.test_inverter.read_range(30073, 2)
+        self.assertEqual(sleep.call_count, 1)
+        self.assertAlmostEqual(sleep.call_args.args[0], 0.5, places=2)
+        with self.assertRaises(ModbusIOException):
+            self.test_inverter.write(InverterEquipmentRegister.ActivePowerPercentageDerating, 1000)
+        self.assertEqual(self.test_inverter.pacer.requests, 3)
+        self.assertEqual(self.test_inverter.pacer.congestions, 1)
+        self.assertAlmostEqual(self.test_inverter.pacer.gap, 1.0)
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', sun2000mock.connect_success
+    )
+    @patch('pymodbus.client.ModbusTcpClient.read_holding_registers')
+    @patch('time.sleep')
+    def test_retry(self, sleep, mock_read_holding_registers):
+        mock_read_holding_registers.side_effect = [ModbusIOException(), ConnectionException(), sun2000mock.MockedResponse(30073, 2)]
+        self.test_inverter.retry = RetryPolicy(attempts=3, backoff=0.5, jitter=0)
+        self.test_inverter.connect()
+        sleep.reset_mock()
+        self.assertEqual(self.test_inverter.read(InverterEquipmentRegister.RatedPower), 10000.0)
+        self.assertEqual(sleep.call_args_list, [call(0.5), call(1.0)])
+
+        mock_read_holding_registers.side_effect = [ExceptionResponse(3, 2)]
+        with self.assertRaises(ExceptionResponseError):
+            self.test_inverter.read(InverterEquipmentRegister.RatedPower)
+        mock_read_holding_registers.side_effect = [ModbusIOException()] * 3
+        with self.assertRaises(ModbusIOException):
+            self.test_inverter.read(InverterEquipmentRegister.RatedPower)
+        self.assertEqual(mock_read_holding_registers.call_count, 7)
+
+    @patch(
+        'pymodbus.client.ModbusTcpClient.connect', sun2000mock.connect_success
+    )
+    @patch(
+        'pymodbus.client.ModbusTcpClient.is_socket_open', sun2000mock.connect_success
+    )
+    @patch('pymodbus.client.ModbusTcpClient.read_holding_registers')
+    def test_circuit_breaker(self, mock_read_holding_registers):
+        mock_read_holding_registers.return_value = ModbusIOException()
+        self.test_inverter.breaker = CircuitBreaker(threshold=2)
+        self.test_inverter.connect()
+        for _ in range(2):
+            with self.assertRaises(ModbusIOException):
+                self.test_inverter.read(InverterEquipmentRegister.RatedPower)
+        with self.assertRaises(CircuitOpenError):
+            self.test_inverter.read(InverterEquipmentRegister.RatedPower)
+        self.assertEqual(mock_read_holding_registers.call_count, 2)
+        mock_read_holding_registers.return_value = sun2000mock.MockedResponse(30073, 2)
+        self.assertEqual(self.test_inverter.read(InverterEquipmentRegister.RatedPower, device_id=2), 10000.0)
+
+
+class TestAsyncSun2000(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.test_inverter = AsyncSun2000(host='192.168.8.1', port=123, timeout=3, wait=0, device_id=1)
+
+    def test_init(self):
+        self.assertEqual(self.test_inverter.inverter.comm_params.host, '192.168.8.1')
+        self.assertEqual(self.test_inverter.inverter.comm_params.port, 123)
+        self.assertEqual(self.test_inverter.wait, 0)
+        self.assertEqual(self.test_inverter.device_id, 1)
+        self.assertEqual(self.test_inverter.isConnected(), False)
+
+    @patch('pymodbus.client.AsyncModbusTcpClient.close')
+    @patch('pymodbus.client.AsyncModbusTcpClient.read_holding_registers', new_callable=AsyncMock)
+    @patch('pymodbus.client.AsyncModbusTcpClient.connect', new_callable=AsyncMock, return_value=True)
+    async def test_session_with_probe(self, mock_connect, mock_read_holding_registers, mock_close):
+        mock_read_holding_registers.side_effect = lambda address, count, device_id: sun2000mock.MockedResponse(address, count)
+        with patch('pymodbus.client.AsyncModbusTcpClient.connected', new_callable=PropertyMock, side_effect=[False, True, True, True, True]):
+            async with self.test_inverter.session() as session:
+                self.assertIs(session, self.test_inverter)
+        mock_read_holding_registers.assert_called_once_with(address=30070, count=1, device_id=1)
+        mock_close.assert_called_once()
+
+    @patch('pymodbus.client.AsyncModbusTcpClient.connected', new_callable=PropertyMock, return_value=True)
+    @patch('pymodbus.client.AsyncModbusTcpClient.read_holding_registers', new_callable=AsyncMock)
+    async def test_stream(self, mock_read_holding_registers, _):
+        mock_read_holding_registers.side_effect = lambda address, count, device_id: sun2000mock.MockedBlockResponse(address, count)
+        clock = [100.0]
+
+        async def sleep(delay):
+            clock[0] += delay
+
+        samples = []
+        with patch('sun2000_modbus.sampling.time.monotonic', side_effect=lambda: clock[0]), patch('sun2000_modbus.sampling.asyncio.sleep', side_effect=sleep):
+            async for sample in self.test_inverter.stream([MeterEquipmentRegister.ActivePower], 0.02):
+                samples.append(sample)
+                if len(samples) == 2:
+                    clock[0] += 0.05
+                if len(samples) == 3:
+                    break
+        self.assertEqual(samples[0].snapshot[MeterEquipmentRegister.ActivePower], 1000.0)
+        self.assertEqual(samples[2].missed, 2)
+        self.assertAlmostEqual(samples[2].scheduled - samples[0].scheduled, 0.08)
+
+    async def test_read_from_disconnected_unit(self):
+        with self.assertRaises(ValueError) as cm:
+            await self.test_inverter.read(InverterEquipmentRegister.Model)
+        self.assertEqual(str(cm.exception), 'Inverter is not connected')
+
+    @patch('pymodbus.client.AsyncModbusTcpClient.connected', new_callable=PropertyMock, return_value=True)
+    @patch('pymodbus.client.AsyncModbusTcpClient.read_holding_registers', new_callable=AsyncMock)
+    async def test_read(self, mock_read_holding_registers, _):
+        mock_read_holding_registers.side_effect = lambda address, count, device_id: sun2000mock.MockedResponse(address, count)
+        self.assertEqual(await self.test_inverter.read_raw_value(InverterEquipmentRegister.Model), 'SUN2000')
+        self.assertEqual(await self.test_inverter.read(InverterEquipmentRegister.RatedPower), 10000.0)
+        self.assertEqual(await self.test_inverter.read_formatted(InverterEquipmentRegister.DeviceStatus), 'On-grid')
+        mock_read_holding_registers.assert_called_with(address=32089, count=1, device_id=1)
+
+    @patch('pymodbus.client.AsyncModbusTcpClient.connected', new_callable=PropertyMock, return_value=True)
+    @patch('pymodbus.client.AsyncModbusTcpClient.read_holding_registers', new_callable=AsyncMock)
+    async def test_read_many(self, mock_read_holding_registers, _):
+        mock_read_holding_registers.side_effect = lambda address, count, device_id: sun2000mock.MockedBlockResponse(address, count)
+        result = await self.test_inverter.read_many([InverterEquipmentRegister.ModelID, InverterEquipmentRegister.RatedPower], device_id=123)
+        self.assertEqual(result, {InverterEquipmentRegister.ModelID: 429, InverterEquipmentRegister.RatedPower: 10000.0})
+        mock_read_holding_registers.assert_called_once_with(address=30070, count=5, device_id=123)
+
+    @patch('pymodbus.client.AsyncModbusTcpClient.connected', new_callable=PropertyMock, return_value=True)
+    @patch('pymodbus.client.AsyncModbusTcpClient.read_holding_registers', new_callable=AsyncMock)
+    async def test_read_range(self, mock_read_holding_registers, _):
+        mock_read_holding_registers.side_effect = lambda address, count, device_id: sun2000mock.MockedResponse(address, count)
+        result = await self.test_inverter.read_range(30000, end_address=30034)
+        self.assertEqual(result[:16], b'SUN2000-10KTL-M1')
+
+    @patch('pymodbus.client.AsyncModbusTcpClient.connected', new_callable=PropertyMock, return_value=True)
+    @patch('pymodbus.client.AsyncModbusTcpClient.read_holding_registers', new_callable=AsyncMock)
+    async def test_read_from_unavailable_unit(self, mock_read_holding_registers, _):
+        mock_read_holding_registers.return_value = ModbusIOException('Requested device is not available')
+        with self.assertRaises(ModbusIOException):
+            await self.test_inverter.read(InverterEquipmentRegister.Model)
+
+    @patch('pymodbus.client.AsyncModbusTcpClient.connected', new_callable=PropertyMock, return_value=True)
+    @patch('pymodbus.client.AsyncModbusTcpClient.write_registers', new_callable=AsyncMock)
+    async def test_write(self, mock_write_registers, _):
+        await self.test_inverter.write(BatteryEquipmentRegister.MaximumFeedGridPowerInW, -10200)
+        mock_write_registers.assert_called_once_with(address=47416, values=[65535, 55336], device_id=1)
+
+    @patch('pymodbus.client.AsyncModbusTcpClient.connected', new_callable=PropertyMock, return_value=True)
+    async def test_write_to_read_only_register(self, _):
+        with self.assertRaises(ValueError) as cm:
+            await self.test_inverter.write(BatteryEquipmentRegister.RunningStatus, 1)
+        self.assertEqual(str(cm.exception), 'Register is not writeable')
+
+
+class TestFleetPoller(unittest.TestCase):
+    def setUp(self) -> None:
+        self.endpoints = [
+            Endpoint('192.168.8.1', device_id=1),
+            Endpoint('192.168.8.1', device_id=2),
+            Endpoint('192.168.8.2'),
+            Endpoint('192.168.9.1'),
+        ]
+
+    def test_endpoint_default_segment(self):
+        self.assertEqual(self.endpoints[0].segment, '192.168.8.0/24')
+        self.assertEqual(Endpoint('inverter.local').segment, 'inverter.local')
+        self.assertEqual(Endpoint('192.168.8.1', segment='roof').segment, 'roof')
+
+    def test_invalid_max_concurrency(self):
+        with self.assertRaises(ValueError) as cm:
+            FleetPoller(self.endpoints, [InverterEquipmentRegister.ModelID], max_concurrency=0)
+        self.assertEqual(str(cm.exception), 'max_concurrency must be at least 1')
+
+    @patch('pymodbus.client.AsyncModbusTcpClient.connected', new_callable=PropertyMock, return_value=True)
+    @patch('pymodbus.client.AsyncModbusTcpClient.connect', new_callable=AsyncMock, return_value=True)
+    @patch('pymodbus.client.AsyncModbusTcpClient.read_holding_registers', new_callable=AsyncMock)
+    def test_poll(self, mock_read_holding_registers, *_):
+        mock_read_holding_registers.side_effect = lambda address, count, device_id: sun2000mock.MockedBlockResponse(address, count)
+        poller = FleetPoller(self.endpoints, [InverterEquipmentRegister.ModelID, InverterEquipmentRegister.RatedPower], wait=0)
+        snapshots = poller.poll()
+        self.assertEqual([snapshot.endpoint for snapshot in snapshots], self.endpoints)
+        self.assertTrue(all(snapshot.ok for snapshot in snapshots))
+        self.assertEqual(snapshots[1].values, {InverterEquipmentRegister.ModelID: 429, InverterEquipmentRegister.RatedPower: 10000.0})
+        self.assertEqual(mock_read_holding_registers.call_count, 4)
+
+    @patch('pymodbus.client.AsyncModbusTcpClient.connected', new_callable=PropertyMock, return_value=True)
+    @patch('pymodbus.client.AsyncModbusTcpClient.connect', new_callable=AsyncMock, return_value=True)
+    @patch('pymodbus.client.AsyncModbusTcpClient.read_holding_registers', new_callable=AsyncMock)
+    def test_poll_isolates_failures(self, mock_read_holding_registers, *_):
+        async def read_holding_registers(address, count, device_id):
+            if device_id == 2:
+                return ModbusIOException('Requested device is not available')
+            if device_id == 0:
+                await asyncio.sleep(10)
+            return sun2000mock.MockedBlockResponse(address, count)
+
+        mock_read_holding_registers.side_effect = read_holding_registers
+        poller = FleetPoller(self.endpoints, [InverterEquipmentRegister.ModelID], deadline=0.1, wait=0)
+        snapshots = poller.poll()
+        self.assertTrue(snapshots[0].ok)
+        self.assertIsInstance(snapshots[1].error, ModbusIOException)
+        self.assertIsInstance(snapshots[2].error, asyncio.TimeoutError)
+        self.assertIsInstance(snapshots[3].error, asyncio.TimeoutError)
+        self.assertEqual(snapshots[2].values, {})
+
+    @patch('pymodbus.client.AsyncModbusTcpClient.connected', new_callable=PropertyMock, return_value=True)
+    @patch('pymodbus.client.AsyncModbusTcpClient.connect', new_callable=AsyncMock, return_value=True)
+    @patch('pymodbus.client.AsyncModbusTcpClient.read_holding_registers', new_callable=AsyncMock)
+    def test_poll_limits_concurrency_per_segment(self, mock_read_holding_registers, *_):
+        active = []
+        peak = []
+
+        async def read_holding_registers(address, count, device_id):
+            active.append(device_id)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.pop()
+            return sun2000mock.MockedBlockResponse(address, count)
+
+        mock_read_holding_registers.side_effect = read_holding_registers
+        endpoints = [Endpoint(f'192.168.8.{i}', segment='roof') for i in range(1, 7)]
+        FleetPoller(endpoints, [InverterEquipmentRegister.ModelID], max_concurrency=2, wait=0).poll()
+        self.assertEqual(max(peak), 2)
+
+    @patch('pymodbus.client.AsyncModbusTcpClient.connected', new_callable=PropertyMock, return_value=True)
+    @patch('pymodbus.client.AsyncModbusTcpClient.connect', new_callable=AsyncMock, return_value=True)
+    @patch('pymodbus.client.AsyncModbusTcpClient.read_holding_registers', new_callable=AsyncMock)
+    def test_poll_circuit_breaker(self, mock_read_holding_registers, *_):
+        def read_holding_registers(address, count, device_id):
+            if device_id == 2:
+                return ModbusIOException('Requested device is not available')
+            return sun2000mock.MockedBlockResponse(address, count)
+
+        mock_read_holding_registers.side_effect = read_holding_registers
+        breaker = CircuitBreaker(threshold=1)
+        breaker.record(('192.168.9.1', 502, 0), False)
+        poller = FleetPoller(self.endpoints, [InverterEquipmentRegister.ModelID], wait=0, probe=False, breaker=breaker)
+        poller.poll()
+        snapshots = poller.poll()
+        self.assertTrue(snapshots[0].ok)
+        self.assertIsInstance(snapshots[1].error, CircuitOpenError)
+        self.assertTrue(snapshots[2].ok)
+        self.assertIsInstance(snapshots[3].error, CircuitOpenError)
+        self.assertEqual(mock_read_holding_registers.call_count, 5)
+
+    @patch('pymodbus.client.AsyncModbusTcpClient.connected', new_callable=PropertyMock, return_value=True)
+    @patch('pymodbus.client.AsyncModbusTcpClient.connect', new_callable=AsyncMock, return_value=True)
+    @patch('pymodbus.client.AsyncModbusTcpClient.read_holding_registers', new_callable=AsyncMock)
+    def test_poll_discover(self, mock_read_holding_registers, *_):
+        mock_read_holding_registers.side_effect = lambda address, count, device_id: sun2000mock.MockedBlockResponse(address, count)
+        registers = [InverterEquipmentRegister.PV1Voltage, InverterEquipmentRegister.PV24Voltage]
+        poller = FleetPoller(self.endpoints[:1], registers, wait=0, probe=False, discover=True)
+        poller.poll()
+        self.assertEqual(poller.capabilities[('192.168.8.1', 502, 1)], Capabilities(429, 4, 2))
+        mock_read_holding_registers.reset_mock()
+        snapshots = poller.poll()
+        self.assertEqual(snapshots[0].values, {InverterEquipmentRegister.PV1Voltage: 350.5})
+        self.assertEqual(mock_read_holding_registers.call_count, 1)
+
+
+@unittest.skipIf(SERVER_SKIP_REASON, SERVER_SKIP_REASON)
+class TestSimulator(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.inverters = [SimulatedInverter(0), SimulatedInverter(1, strict=True, illegal_addresses=[32080])]
+        self.simulator = Simulator(self.inverters, port=0)
+        await self.simulator.start()
+        self.test_inverter = AsyncSun2000('127.0.0.1', self.simulator.port, timeout=1, wait=0)
+        await self.test_inverter.connect()
+
+    async def asyncTearDown(self) -> None:
+        self.test_inverter.disconnect()
+        await self.simulator.stop()
+
+    def test_requires_pymodbus_3_12(self):
+        for module in ('simulator', 'gateway'):
+            code = ('import pymodbus\n'
+                    'pymodbus.__version__ = "3.11.2"\n'
+                    f'import sun2000_modbus.{module}\n')
+            environment = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(registers_module.__file__))))
+            result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=environment)
+            self.assertNotEqual(result.returncode, 0)
+            self.assertIn(f'ImportError: sun2000_modbus.{module} requires pymodbus 3.12 or later, 3.11.2 is installed', result.stderr)
+
+    def test_encode_words(self):
+        self.assertEqual(encode_words(InverterEquipmentRegister.PV1Voltage, 350.5), (3505,))
+        self.assertEqual(encode_words(InverterEquipmentRegister.ActivePower, -2), (0xFFFF, 0xFFFE))
+        self.assertEqual(encode_words(InverterEquipmentRegister.ModelID, 1 << 20), (0xFFFF,))
+        self.assertEqual(encode_words(InverterEquipmentRegister.Model, 'SUN')[:2], (0x5355, 0x4E00))
+
+    def test_values_vary_over_time(self):
+        inverter = self.inverters[0]
+        now = inverter.started
+        energy = InverterEquipmentRegister.AccumulatedEnergyYield
+        self.assertGreater(inverter.value(energy, now + 3600), inverter.value(energy, now))
+        self.assertNotEqual(inverter.value(InverterEquipmentRegister.ActivePower, now + 10), inverter.value(InverterEquipmentRegister.ActivePower, now))
+        self.assertEqual(inverter.value(InverterEquipmentRegister.RatedPower, now + 10), 10000)
+
+    async def test_read_every_register(self):
+        registers = list(InverterEquipmentRegister) + list(BatteryEquipmentRegister) + list(MeterEquipmentRegister)
+        values = await self.test_inverter.read_many(registers)
+        self.assertEqual(len(values), len(registers))
+        self.assertEqual(values[InverterEquipmentRegister.Model], 'SUN2000-10KTL-M1')
+        self.assertEqual(await self.test_inverter.read_formatted(InverterEquipmentRegister.DeviceStatus), 'On-grid')
+
+    async def test_device_ids(self):
+        self.assertEqual(await self.test_inverter.read(InverterEquipmentRegister.SN), 'SIM000030015')
+        self.assertEqual(await self.test_inverter.read(InverterEquipmentRegister.SN, device_id=1), 'SIM000130015')
+
+    async def test_write(self):
+        await self.test_inverter.write(InverterEquipmentRegister.QUDispatchTriggerPower, 55)
+        self.assertEqual(await self.test_inverter.read(InverterEquipmentRegister.QUDispatchTriggerPower), 55)
+        self.assertEqual(await self.test_inverter.read(InverterEquipmentRegister.QUDispatchTriggerPower, device_id=1), 50)
+
+    def test_write_read_only_register(self):
+        self.assertEqual(self.inverters[0].write(InverterEquipmentRegister.ActivePower.value.address, [0, 1]), ExcCodes.ILLEGAL_ADDRESS)
+
+    async def test_illegal_address(self):
+        with self.assertRaises(ModbusIOException):
+            await self.test_inverter.read(InverterEquipmentRegister.ActivePower, device_id=1)
+        with self.assertRaises(ModbusIOException):
+            await self.test_inverter.read_range(InverterEquipmentRegister.State1.value.address, quantity=3, device_id=1)
+        self.assertEqual(await self.test_inverter.read(InverterEquipmentRegister.RatedPower, device_id=1), 10000)
+
+    async def test_discover(self):
+        self.inverters[0].illegal_addresses = frozenset([MeterEquipmentRegister.MeterStatus.value.address, InverterEquipmentRegister.ModuleStatus4G.value.address])
+        capabilities = await self.test_inverter.discover()
+        self.assertEqual(capabilities, Capabilities(428, 2, 2, ['4g', 'meter']))
+        self.assertIs(self.test_inverter.capabilities[0], capabilities)
+
+        registers = [InverterEquipmentRegister.PV1Voltage, InverterEquipmentRegister.PV3Voltage, MeterEquipmentRegister.MeterStatus]
+        requests = self.inverters[0].requests
+        self.assertEqual(list(await self.test_inverter.read_many(registers)), [InverterEquipmentRegister.PV1Voltage])
+        result = await self.test_inverter.read_snapshot(registers)
+        self.assertEqual(self.inverters[0].requests - requests, 2)
+        self.assertTrue(result.is_valid(InverterEquipmentRegister.PV1Voltage))
+        self.assertFalse(result.is_valid(InverterEquipmentRegister.PV3Voltage))
+        self.assertFalse(result.is_valid(MeterEquipmentRegister.MeterStatus))
+        self.assertEqual(len(await self.test_inverter.read_many(registers, device_id=1)), 3)
+
+    async def test_write_many(self):
+        values = {
+            BatteryEquipmentRegister.MaximumChargingPower: 5000,
+            BatteryEquipmentRegister.MaximumDischargingPower: 4000,
+            BatteryEquipmentRegister.ChargingCutoffCapacity: 1000,
+            BatteryEquipmentRegister.DischargeCutoffCapacity: 100,
+        }
+        requests = self.inverters[0].requests
+        await self.test_inverter.write_many(values, verify=True)
+        self.assertEqual(self.inverters[0].requests - requests, 4)
+        await self.test_inverter.write_many(values, verify=True, device_id=1)
+        self.assertEqual(await self.test_inverter.read(BatteryEquipmentRegister.ChargingCutoffCapacity), 100)
+
+        self.inverters[0].write = lambda address, words: None
+        with self.assertRaises(WriteVerificationError) as cm:
+            await self.test_inverter.write_many({BatteryEquipmentRegister.MaximumChargingPower: 6000, BatteryEquipmentRegister.BackupPowerSOC: 500}, verify=True)
+        self.assertEqual(cm.exception.mismatches, {BatteryEquipmentRegister.MaximumChargingPower: 5000})
+
+    async def test_identify(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'metadata.json')
+            record = await self.test_inverter.identify(MetadataStore(path))
+            self.assertEqual(record.sn, 'SIM000030015')
+            self.assertEqual(record.firmware, 'V100R001C00SPC100')
+            self.assertEqual(record.values[InverterEquipmentRegister.Model], 'SUN2000-10KTL-M1')
+            self.assertEqual(record.capabilities, Capabilities(428, 2, 2))
+
+            restarted_inverter = AsyncSun2000('127.0.0.1', self.simulator.port, timeout=1, wait=0, cache=RegisterCache())
+            await restarted_inverter.connect()
+            requests = self.inverters[0].requests
+            restarted_record = await restarted_inverter.identify(MetadataStore(path))
+            self.assertEqual(restarted_record.values, record.values)
+            self.assertEqual(restarted_inverter.capabilities[0], record.capabilities)
+            self.assertEqual(await restarted_inverter.read(InverterEquipmentRegister.RatedPower), 10000)
+            self.assertEqual(self.inverters[0].requests - requests, 2)
+
+            self.inverters[0]._written[InverterEquipmentRegister.MonitoringSoftwareVersion.value.address] = 0x5632
+            self.assertEqual((await restarted_inverter.identify(MetadataStore(path))).firmware, 'V200R001C00SPC100')
+            self.assertGreater(self.inverters[0].requests - requests, 4)
+            restarted_inverter.disconnect()
+
+    async def test_cancelled_probe_releases_circuit(self):
+        breaker = CircuitBreaker(threshold=1, recovery=0)
+        self.test_inverter.breaker = breaker
+        key = ('127.0.0.1', self.simulator.port, 0)
+        breaker.record(key, False)
+        self.assertEqual(breaker.state(key), resilience.HALF_OPEN)
+        self.inverters[0].latency = 0.5
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(self.test_inverter.read(InverterEquipmentRegister.RatedPower), 0.05)
+        self.assertFalse(breaker.is_open(key))
+        self.inverters[0].latency = 0
+        self.assertEqual(await self.test_inverter.read(InverterEquipmentRegister.RatedPower), 10000)
+        self.assertEqual(breaker.state(key), resilience.CLOSED)
+
+    async def test_latency_and_timeout(self):
+        self.inverters[0].latency = (0.05, 0.1)
+        started = asyncio.get_running_loop().time()
+        await self.test_inverter.read(InverterEquipmentRegister.ModelID)
+        self.assertGreaterEqual(asyncio.get_running_loop().time() - started, 0.05)
+
+        self.inverters[0].timeout_rate = 1
+        self.inverters[0].hang = 5
+        impatient_inverter = AsyncSun2000('127.0.0.1', self.simulator.port, timeout=0.1, wait=0)
+        await impatient_inverter.connect()
+        with self.assertRaises(ModbusIOException):
+            await impatient_inverter.read(InverterEquipmentRegister.ModelID)
+        impatient_inverter.disconnect()
+
+
+class TestExporter(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.endpoint = Endpoint('127.0.0.1', device_id=1)
+        self.exporter = Exporter([self.endpoint], ['meter'])
+
+    def test_metric_name(self):
+        self.assertEqual(metric_name('inverter', InverterEquipmentRegister.PV1Voltage), 'sun2000_inverter_pv1_voltage_volts')
+        self.assertEqual(metric_name('meter', MeterEquipmentRegister.APhaseActivePower), 'sun2000_meter_a_phase_active_power_watts')
+        self.assertEqual(metric_name('inverter', InverterEquipmentRegister.NumberOfPVStrings), 'sun2000_inverter_number_of_pv_strings')
+
+    def test_parse_endpoint(self):
+        endpoint = parse_endpoint('192.168.8.1:6607/2')
+        self.assertEqual((endpoint.host, endpoint.port, endpoint.device_id), ('192.168.8.1', 6607, 2))
+        endpoint = parse_endpoint('192.168.8.1')
+        self.assertEqual((endpoint.host, endpoint.port, endpoint.device_id), ('192.168.8.1', 502, 0))
+
+    def test_unknown_register_enum(self):
+        with self.assertRaises(ValueError) as cm:
+            Exporter([self.endpoint], ['grid'])
+        self.assertEqual(str(cm.exception), "Unknown register enum 'grid'")
+
+    def test_render(self):
+        snapshot = Snapshot(self.exporter.plan, 1700000000)
+        snapshot.set(MeterEquipmentRegister.ActivePower, 1000)
+        self.exporter.update(self.endpoint, snapshot, 1700000000, 0.5)
+        body = self.exporter.render().decode()
+        self.assertIn('# TYPE sun2000_meter_active_power_watts gauge\n', body)
+        self.assertIn('sun2000_meter_active_power_watts{host="127.0.0.1",port="502",device_id="1"} 1000\n', body)
+        self.assertIn('sun2000_up{host="127.0.0.1",port="502",device_id="1"} 1\n', body)
+        self.assertNotIn('sun2000_meter_grid_frequency_hertz{', body)
+        self.assertIs(self.exporter.render(), self.exporter.render())
+
+        self.exporter.update(self.endpoint, None, 1700000010, 5)
+        body = self.exporter.render().decode()
+        self.assertIn('sun2000_up{host="127.0.0.1",port="502",device_id="1"} 0\n', body)
+        self.assertNotIn('sun2000_meter_active_power_watts{', body)
+
+    @unittest.skipIf(SERVER_SKIP_REASON, SERVER_SKIP_REASON)
+    async def test_poll_host(self):
+        async with Simulator([SimulatedInverter(1)], port=0) as simulator:
+            endpoint = Endpoint('127.0.0.1', simulator.port, device_id=1)
+            unknown_endpoint = Endpoint('127.0.0.1', simulator.port, device_id=2)
+            exporter = Exporter([endpoint, unknown_endpoint], ['inverter'], timeout=0.5, wait=0)
+            await exporter.poll_host([endpoint, unknown_endpoint])
+        body = exporter.render().decode()
+        labels = f'{{host="127.0.0.1",port="{simulator.port}",device_id="1"}}'
+        self.assertIn(f'sun2000_up{labels} 1\n', body)
+        self.assertIn(f'sun2000_inverter_rated_power_watts{labels} 10000.0\n', body)
+        self.assertIn(f'sun2000_up{{host="127.0.0.1",port="{simulator.port}",device_id="2"}} 0\n', body)
+
+
+@unittest.skipIf(SERVER_SKIP_REASON, SERVER_SKIP_REASON)
+class TestGateway(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.simulator = Simulator([SimulatedInverter(1, latency=0.02, illegal_addresses=[32080])], port=0)
+        await self.simulator.start()
+        self.gateway = Gateway('127.0.0.1', self.simulator.port, wait=0, max_age=10, idle_timeout=0.2, device_ids=[1])
+        self.server = GatewayServer(self.gateway, '127.0.0.1', 0)
+        await self.server.start()
+        self.clients = [AsyncSun2000('127.0.0.1', self.server.port, timeout=1, wait=0, device_id=1) for _ in range(4)]
+        for client in self.clients:
+            await client.connect()
+
+    async def asyncTearDown(self) -> None:
+        for client in self.clients:
+            client.disconnect()
+        await self.server.stop()
+        await self.simulator.stop()
+
+    async def test_coalesce_reads(self):
+        registers = [InverterEquipmentRegister.PV1Voltage, InverterEquipmentRegister.PV2Voltage, InverterEquipmentRegister.PV1Current]
+        results = await asyncio.gather(*(client.read_many(registers) for client in self.clients))
+        self.assertEqual(self.gateway.upstream_requests, 1)
+        self.assertEqual(self.gateway.coalesced, 3)
+        self.assertTrue(all(result == results[0] for result in results))
+
+    async def test_queued_read_reuses_fresh_words(self):
+        results = await asyncio.gather(self.gateway.read(1, 32016, 5), self.gateway.read(1, 32021, 5), self.gateway.read(1, 32018, 6))
+        self.assertEqual(results[2], results[0][2:] + results[1][:3])
+        self.assertEqual(self.gateway.upstream_requests, 2)
+        self.assertEqual(self.gateway.cache_hits, 1)
+
+    async def test_cancelled_read_releases_coalesced_readers(self):
+        leader = asyncio.create_task(self.gateway.read(1, 32016, 10))
+        await asyncio.sleep(0.005)
+        follower = asyncio.create_task(self.gateway.read(1, 32016, 2))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with self.assertRaises(ConnectionException):
+            await asyncio.wait_for(follower, 1)
+        self.assertEqual(self.gateway.coalesced, 1)
+        self.assertEqual(len(await self.gateway.read(1, 32016, 2)), 2)
+
+    async def test_cache(self):
+        await self.clients[0].read_range(32016, quantity=10)
+        self.assertEqual(await self.clients[1].read(InverterEquipmentRegister.PV1Voltage), await self.clients[2].read(InverterEquipmentRegister.PV1Voltage))
+        self.assertEqual(self.gateway.upstream_requests, 1)
+        self.assertEqual(self.gateway.cache_hits, 2)
+
+    async def test_write(self):
+        self.assertEqual(await self.clients[0].read(InverterEquipmentRegister.QUDispatchTriggerPower), 50)
+        await self.clients[1].write(InverterEquipmentRegister.QUDispatchTriggerPower, 42)
+        self.assertEqual(await self.clients[0].read(InverterEquipmentRegister.QUDispatchTriggerPower), 42)
+        self.assertEqual(self.gateway.upstream_requests, 3)
+
+    async def test_errors(self):
+        with self.assertRaises(ExceptionResponseError) as cm:
+            await self.clients[0].read(InverterEquipmentRegister.ActivePower)
+        self.assertEqual(cm.exception.exception_code, 2)
+        with self.assertRaises(ExceptionResponseError) as cm:
+            await self.clients[0].read(InverterEquipmentRegister.ActivePower, device_id=2)
+        self.assertEqual(cm.exception.exception_code, 0x0A)
+
+    async def test_close_idle_connection(self):
+        await self.clients[0].read(InverterEquipmentRegister.RatedPower)
+        self.assertTrue(self.gateway.upstream.isConnected())
+        await asyncio.sleep(0.3)
+        self.assertFalse(self.gateway.upstream.isConnected())
+        self.assertEqual(await self.clients[0].read(InverterEquipmentRegister.ModelID), 428)